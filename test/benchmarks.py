@@ -0,0 +1,304 @@
+"""Benchmarks of unparse() and dump() on the Python standard library.
+
+Time of importing the package in a fresh interpreter is measured as well, and so is throughput
+of conversion between typed_ast.ast3 and ast trees, compared to a naive visitor copying nodes.
+Throughput is reported in nodes per second and in megabytes of output per second, for trees
+parsed by typed_ast.ast3 (typed), by built-in ast (untyped) and for modules mixing statements
+from both (mixed). Results can be stored as JSON and compared with results of a previous run:
+
+    python -m test.benchmarks --output new.json --compare old.json
+"""
+
+import argparse
+import ast
+import functools
+import json
+import platform
+import subprocess
+import sys
+import time
+import typing as t
+
+import typed_ast.ast3
+import typed_astunparse
+
+from .examples import PATHS
+
+KINDS = ('typed', 'untyped', 'mixed')
+
+OPERATIONS = {
+    'unparse': typed_astunparse.unparse,
+    'dump': typed_astunparse.dump,
+    'compact_dump': functools.partial(typed_astunparse.dump, compact=True)}
+
+_AST = (ast.AST, typed_ast.ast3.AST)
+
+
+class NaiveConverter(typed_ast.ast3.NodeVisitor):
+    """Hand-written converter of typed_ast.ast3 trees into ast trees, which copies every node."""
+
+    def generic_visit(self, node):
+        fields = {}
+        for name, value in typed_ast.ast3.iter_fields(node):
+            if isinstance(value, list):
+                value = [self.visit(_) if isinstance(_, typed_ast.ast3.AST) else _ for _ in value]
+            elif isinstance(value, typed_ast.ast3.AST):
+                value = self.visit(value)
+            fields[name] = value
+        if isinstance(node, typed_ast.ast3.arguments):
+            fields['posonlyargs'] = []
+        return ast.copy_location(getattr(ast, node.__class__.__name__)(**fields), node)
+
+    def _constant(self, node, value):
+        kind = 'u' if getattr(node, 'kind', None) == 'u' else None
+        return ast.copy_location(ast.Constant(value=value, kind=kind), node)
+
+    def visit_Num(self, node):
+        return self._constant(node, node.n)
+
+    def visit_Str(self, node):
+        return self._constant(node, node.s)
+
+    def visit_Bytes(self, node):
+        return self._constant(node, node.s)
+
+    def visit_NameConstant(self, node):
+        return self._constant(node, node.value)
+
+    def visit_Ellipsis(self, node):
+        return self._constant(node, Ellipsis)
+
+    def visit_Index(self, node):
+        return self.visit(node.value)
+
+    def visit_ExtSlice(self, node):
+        return ast.Tuple(elts=[self.visit(_) for _ in node.dims], ctx=ast.Load())
+
+
+# name of a conversion -> (function, kind of converted trees)
+CONVERSIONS = {
+    'to_ast': (typed_astunparse.to_ast, 'typed'),
+    'naive_to_ast': (NaiveConverter().visit, 'typed'),
+    'to_typed_ast': (typed_astunparse.to_typed_ast, 'untyped')}
+
+
+def count_nodes(tree) -> int:
+    """Count nodes in a tree, which may consist of both ast and typed_ast.ast3 nodes."""
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        for name in node._fields:
+            value = getattr(node, name, None)
+            if isinstance(value, _AST):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(_ for _ in value if isinstance(_, _AST))
+    return count
+
+
+def _parse(kind: str, code: str, path: str):
+    if kind == 'typed':
+        return typed_ast.ast3.parse(source=code, filename=path)
+    if kind == 'untyped':
+        return ast.parse(source=code, filename=path)
+    assert kind == 'mixed', kind
+    typed_tree = typed_ast.ast3.parse(source=code, filename=path)
+    untyped_tree = ast.parse(source=code, filename=path)
+    assert len(typed_tree.body) == len(untyped_tree.body), path
+    typed_tree.body = [
+        untyped if i % 2 else typed
+        for i, (typed, untyped) in enumerate(zip(typed_tree.body, untyped_tree.body))]
+    return typed_tree
+
+
+def load_corpus(kind: str, paths: t.Sequence[str] = PATHS) -> t.Tuple[list, t.List[str]]:
+    """Parse files into trees of given kind.
+
+    Files that cannot be parsed, unparsed or dumped in the current environment are skipped,
+    so that all operations are measured on the same trees. Return trees and skipped paths.
+    """
+    trees = []
+    skipped = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as py_file:
+            code = py_file.read()
+        try:
+            tree = _parse(kind, code, path)
+            for operation in OPERATIONS.values():
+                operation(tree)
+        except Exception:  # pylint: disable=broad-except
+            skipped.append(path)
+            continue
+        trees.append(tree)
+    return trees, skipped
+
+
+def measure(operation: t.Callable[[t.Any], str], trees: list, nodes: int,
+            repeat: int = 3) -> t.Dict[str, t.Any]:
+    """Measure throughput of the operation on all trees, taking the best of repeated runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [operation(tree) for tree in trees]
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    size = sum(len(result.encode('utf-8')) for result in results)
+    return {
+        'files': len(trees), 'nodes': nodes, 'bytes': size, 'seconds': best,
+        'nodes_per_second': nodes / best, 'mb_per_second': size / 1e6 / best}
+
+
+def measure_conversion(conversion: t.Callable[[t.Any], t.Any], trees: list, nodes: int,
+                       repeat: int = 3) -> t.Dict[str, t.Any]:
+    """Measure throughput of conversion of all trees, taking the best of repeated runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for tree in trees:
+            conversion(tree)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return {
+        'files': len(trees), 'nodes': nodes, 'seconds': best, 'nodes_per_second': nodes / best}
+
+
+_IMPORT_SCRIPT = """
+import sys, time
+modules = set(sys.modules)
+start = time.perf_counter()
+import typed_astunparse
+{}
+print(time.perf_counter() - start, len(set(sys.modules) - modules))
+"""
+
+IMPORT_SCENARIOS = {
+    'import': '',
+    'import_and_unparse':
+        'import typed_ast.ast3\ntyped_astunparse.unparse(typed_ast.ast3.parse("x = 1"))'}
+
+
+def measure_import(scenario: str, repeat: int = 3) -> t.Dict[str, t.Any]:
+    """Measure time of importing the package (and optionally using it) in a fresh interpreter."""
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', _IMPORT_SCRIPT.format(IMPORT_SCENARIOS[scenario])],
+            stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+        duration, modules = output.split()
+        if best is None or float(duration) < best:
+            best = float(duration)
+    return {'seconds': best, 'modules': int(modules)}
+
+
+def run(kinds: t.Sequence[str] = KINDS, operations: t.Sequence[str] = tuple(OPERATIONS),
+        paths: t.Sequence[str] = PATHS, repeat: int = 3,
+        conversions: t.Sequence[str] = tuple(CONVERSIONS)) -> t.Dict[str, t.Any]:
+    """Run benchmarks and return the results as a JSON-compatible dictionary."""
+    results = {}
+    skipped = {}
+    corpora = {}
+    for kind in set(kinds) | {CONVERSIONS[name][1] for name in conversions}:
+        corpora[kind], skipped[kind] = load_corpus(kind, paths)
+    for kind in kinds:
+        trees = corpora[kind]
+        nodes = sum(count_nodes(tree) for tree in trees)
+        results[kind] = {
+            name: measure(OPERATIONS[name], trees, nodes, repeat) for name in operations}
+    conversion_results = {}
+    for name in conversions:
+        conversion, kind = CONVERSIONS[name]
+        trees = []
+        for tree in corpora[kind]:
+            try:
+                conversion(tree)
+            except ValueError:  # syntax which the other kind of trees cannot represent
+                continue
+            trees.append(tree)
+        nodes = sum(count_nodes(tree) for tree in trees)
+        conversion_results[name] = measure_conversion(conversion, trees, nodes, repeat)
+    return {
+        'version': typed_astunparse.__version__,
+        'import': {scenario: measure_import(scenario, repeat) for scenario in IMPORT_SCENARIOS},
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'repeat': repeat,
+        'skipped': skipped,
+        'results': results,
+        'conversions': conversion_results}
+
+
+def compare(current: t.Dict[str, t.Any], previous: t.Dict[str, t.Any]) -> t.List[str]:
+    """Describe change of throughput between two runs, as lines of text."""
+    lines = []
+    for scenario, result in current['import'].items():
+        if scenario in previous.get('import', {}):
+            lines.append('{}: {:.2f}x time ({:.4f}s -> {:.4f}s)'.format(
+                scenario, result['seconds'] / previous['import'][scenario]['seconds'],
+                previous['import'][scenario]['seconds'], result['seconds']))
+    for kind, operations in current['results'].items():
+        for name, result in operations.items():
+            try:
+                previous_result = previous['results'][kind][name]
+            except KeyError:
+                continue
+            lines.append('{} {}: {:.2f}x nodes/sec ({:.0f} -> {:.0f})'.format(
+                kind, name, result['nodes_per_second'] / previous_result['nodes_per_second'],
+                previous_result['nodes_per_second'], result['nodes_per_second']))
+    for name, result in current['conversions'].items():
+        if name in previous.get('conversions', {}):
+            previous_result = previous['conversions'][name]
+            lines.append('{}: {:.2f}x nodes/sec ({:.0f} -> {:.0f})'.format(
+                name, result['nodes_per_second'] / previous_result['nodes_per_second'],
+                previous_result['nodes_per_second'], result['nodes_per_second']))
+    return lines
+
+
+def main(args: t.Optional[t.Sequence[str]] = None) -> None:
+    """Run benchmarks from the command line."""
+    parser = argparse.ArgumentParser(
+        prog='python -m test.benchmarks', description=__doc__.splitlines()[0])
+    parser.add_argument('--kind', choices=KINDS, action='append', help='default: all kinds')
+    parser.add_argument(
+        '--operation', choices=tuple(OPERATIONS), action='append', help='default: all operations')
+    parser.add_argument(
+        '--conversion', choices=tuple(CONVERSIONS), action='append',
+        help='default: all conversions')
+    parser.add_argument(
+        '--limit', type=int, default=None, help='use only this many files from the corpus')
+    parser.add_argument('--repeat', type=int, default=3, help='best of how many runs to report')
+    parser.add_argument('-o', '--output', help='store results in this JSON file')
+    parser.add_argument('--compare', help='compare results with ones stored in this JSON file')
+    parsed_args = parser.parse_args(args)
+
+    results = run(
+        parsed_args.kind or KINDS, parsed_args.operation or tuple(OPERATIONS),
+        PATHS[:parsed_args.limit], parsed_args.repeat,
+        parsed_args.conversion or tuple(CONVERSIONS))
+    for scenario, result in results['import'].items():
+        print('{}: {:.4f}s, {} modules loaded'.format(
+            scenario, result['seconds'], result['modules']))
+    for kind, operations in results['results'].items():
+        for name, result in operations.items():
+            print('{} {}: {} files, {:.0f} nodes/sec, {:.2f} MB/sec ({} skipped)'.format(
+                kind, name, result['files'], result['nodes_per_second'], result['mb_per_second'],
+                len(results['skipped'][kind])))
+    for name, result in results['conversions'].items():
+        print('{}: {} files, {:.0f} nodes/sec'.format(
+            name, result['files'], result['nodes_per_second']))
+    if parsed_args.output:
+        with open(parsed_args.output, 'w') as json_file:
+            json.dump(results, json_file, indent=2)
+    if parsed_args.compare:
+        with open(parsed_args.compare) as json_file:
+            previous = json.load(json_file)
+        for line in compare(results, previous):
+            print(line)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,122 @@
+"""Tested function: unparse_async."""
+
+import asyncio
+import subprocess
+import sys
+import unittest
+
+import typed_ast.ast3
+import typed_astunparse
+
+from .examples import PATHS
+
+_SCRIPT = """
+import ast
+import asyncio
+import sys
+sys.modules['typed_ast'] = None
+import typed_astunparse
+
+class Writer:
+    def write(self, data):
+        sys.stdout.write(data.decode())
+    async def drain(self):
+        pass
+
+tree = ast.parse('def spam(ham, /):\\n    return ham[1:2, 3]\\n')
+asyncio.new_event_loop().run_until_complete(typed_astunparse.unparse_async(tree, Writer()))
+"""
+
+
+class _Writer:
+
+    """Stream writer that records written data and calls of drain()."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.drains = 0
+
+    def write(self, data: bytes) -> None:
+        assert isinstance(data, bytes)
+        self.data += data
+
+    async def drain(self) -> None:
+        self.drains += 1
+
+
+class UnparseAsyncTests(unittest.TestCase):
+
+    """Unit tests for unparse_async() function."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.trees = []
+        for path in PATHS[:20]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                code = py_file.read()
+            try:
+                self.trees.append(typed_ast.ast3.parse(source=code, filename=path))
+            except SyntaxError:
+                continue
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_unparse_async(self):
+        for tree in self.trees[:10] + [typed_ast.ast3.parse('spam = "ą"')]:
+            code = typed_astunparse.unparse(tree)
+            for nodes_per_step in (1, 7, 1000):
+                with self.subTest(code=code[:40], nodes_per_step=nodes_per_step):
+                    writer = _Writer()
+                    self.loop.run_until_complete(
+                        typed_astunparse.unparse_async(tree, writer, nodes_per_step))
+                    self.assertEqual(bytes(writer.data), code.encode())
+        writer = _Writer()
+        self.loop.run_until_complete(
+            typed_astunparse.unparse_async(self.trees[0], writer, encoding='utf-16'))
+        self.assertEqual(
+            bytes(writer.data), typed_astunparse.unparse(self.trees[0]).encode('utf-16'))
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(
+                typed_astunparse.unparse_async(self.trees[0], _Writer(), nodes_per_step=0))
+
+    def test_concurrency(self):
+        """Let other tasks run while unparsing, and stop when cancelled."""
+        tree = max(self.trees, key=lambda tree: len(tree.body))
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(len(writer.data))
+                await asyncio.sleep(0)
+
+        async def unparse_with_ticks():
+            ticker = asyncio.ensure_future(tick())
+            await typed_astunparse.unparse_async(tree, writer, nodes_per_step=100)
+            ticker.cancel()
+
+        writer = _Writer()
+        self.loop.run_until_complete(unparse_with_ticks())
+        self.assertGreater(len(set(ticks)), 10)
+        self.assertGreater(writer.drains, 10)
+
+        writer = _Writer()
+        task = self.loop.create_task(typed_astunparse.unparse_async(tree, writer, 100))
+        for _ in range(5):
+            self.loop.run_until_complete(asyncio.sleep(0))
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(task)
+        code = typed_astunparse.unparse(tree).encode()
+        self.assertGreater(len(writer.data), 0)
+        self.assertLess(len(writer.data), len(code))
+        self.assertTrue(code.startswith(bytes(writer.data)))
+
+    def test_without_typed_ast(self):
+        """Unparse trees created by built-in ast one top-level statement at a time."""
+        if sys.version_info < (3, 9):
+            self.skipTest('tuples in subscripts are stored as such since Python 3.9')
+        output = subprocess.run(
+            [sys.executable, '-c', _SCRIPT], stdout=subprocess.PIPE, check=True,
+            universal_newlines=True).stdout
+        self.assertEqual(output, '\n\ndef spam(ham, /):\n    return ham[1:2, 3]\n')
@@ -0,0 +1,62 @@
+"""Tested module: benchmarks."""
+
+import ast
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import typed_ast.ast3
+import typed_astunparse
+
+from .benchmarks import (
+    KINDS, OPERATIONS, CONVERSIONS, IMPORT_SCENARIOS, NaiveConverter, count_nodes, run, compare,
+    main)
+from .examples import PATHS
+
+
+class BenchmarksTests(unittest.TestCase):
+
+    """Check that benchmarks run and their results can be compared."""
+
+    def test_count_nodes(self):
+        tree = typed_ast.ast3.parse('spam = ham(1)')
+        self.assertEqual(count_nodes(tree), len(list(typed_ast.ast3.walk(tree))))
+
+    def test_run(self):
+        results = run(paths=PATHS[:3], repeat=1)
+        self.assertEqual(set(results['results']), set(KINDS))
+        for kind in KINDS:
+            for name in OPERATIONS:
+                result = results['results'][kind][name]
+                self.assertEqual(result['files'] + len(results['skipped'][kind]), 3)
+                self.assertGreater(result['nodes_per_second'], 0)
+                self.assertGreater(result['mb_per_second'], 0)
+        for scenario in IMPORT_SCENARIOS:
+            self.assertGreater(results['import'][scenario]['seconds'], 0)
+            self.assertGreater(results['import'][scenario]['modules'], 0)
+        for name in CONVERSIONS:
+            self.assertGreater(results['conversions'][name]['nodes_per_second'], 0)
+        self.assertEqual(len(compare(results, json.loads(json.dumps(results)))),
+                         len(IMPORT_SCENARIOS) + len(KINDS) * len(OPERATIONS) + len(CONVERSIONS))
+
+    def test_naive_converter(self):
+        for path in PATHS[:3]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                tree = typed_ast.ast3.parse(py_file.read())
+            self.assertEqual(ast.dump(NaiveConverter().visit(tree), include_attributes=True),
+                             ast.dump(typed_astunparse.to_ast(tree), include_attributes=True))
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, 'results.json')
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                main(['--kind', 'typed', '--limit', '2', '--repeat', '1', '-o', output])
+                main(['--kind', 'typed', '--operation', 'dump', '--limit', '2', '--repeat', '1',
+                      '--compare', output])
+            with open(output) as json_file:
+                self.assertIn('typed', json.load(json_file)['results'])
+        self.assertRegex(stdout.getvalue(), r'typed dump: [0-9.]+x nodes/sec')
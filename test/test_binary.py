@@ -0,0 +1,89 @@
+"""Tested module: binary."""
+
+import ast
+import mmap
+import tempfile
+import unittest
+
+import typed_ast.ast3
+import typed_astunparse
+
+from .examples import MODES, EXAMPLES, PATHS
+
+
+class BinaryTests(unittest.TestCase):
+
+    """Unit tests for dump_binary() and load_binary() functions."""
+
+    def _assert_roundtrip(self, tree, include_attributes=True):
+        data = typed_astunparse.dump_binary(tree, include_attributes=include_attributes)
+        self.assertIsInstance(data, bytes)
+        loaded_tree = typed_astunparse.load_binary(data)
+        self.assertIs(type(loaded_tree), type(tree))
+        self.assertTrue(typed_astunparse.equal(loaded_tree, tree, include_attributes))
+        self.assertEqual(typed_astunparse.unparse(loaded_tree), typed_astunparse.unparse(tree))
+        return data
+
+    def test_examples(self):
+        for description, example in EXAMPLES.items():
+            for mode in MODES:
+                if example['trees'][mode] is None:
+                    continue
+                with self.subTest(description=description, mode=mode):
+                    self._assert_roundtrip(example['trees'][mode])
+
+    def test_files(self):
+        for path in PATHS[:20]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                code = py_file.read()
+            try:
+                tree = typed_ast.ast3.parse(source=code, filename=path)
+            except SyntaxError:
+                continue
+            with self.subTest(path=path):
+                data = self._assert_roundtrip(tree)
+                self.assertLess(
+                    len(self._assert_roundtrip(tree, include_attributes=False)), len(data))
+                self._assert_roundtrip(ast.parse(source=code, filename=path))
+
+    def test_values(self):
+        tree = typed_ast.ast3.parse(
+            "x = [0, 1, -1, 2 ** 100, -2 ** 100, 1.5, -0.0, 1e400, 2j, b'\\x00\\xff', ...,"
+            " None, True, False, '', 'sp\\u00e4m', '\\ud800']")
+        self._assert_roundtrip(tree)
+        tree = typed_ast.ast3.Num(-2 ** 100)
+        self.assertEqual(
+            typed_astunparse.load_binary(typed_astunparse.dump_binary(tree)).n, -2 ** 100)
+
+    def test_mixed_tree(self):
+        tree = typed_ast.ast3.parse('spam(ham)  # type: ignore')
+        tree.body[0].value.args = [ast.Name('eggs', ast.Load())]
+        loaded_tree = typed_astunparse.load_binary(typed_astunparse.dump_binary(tree))
+        self.assertIsInstance(loaded_tree.body[0], typed_ast.ast3.Expr)
+        self.assertIsInstance(loaded_tree.body[0].value.args[0], ast.Name)
+        self.assertEqual(typed_astunparse.unparse(loaded_tree), typed_astunparse.unparse(tree))
+
+    def test_missing_fields(self):
+        tree = typed_ast.ast3.Name('spam')
+        loaded_tree = typed_astunparse.load_binary(typed_astunparse.dump_binary(tree))
+        self.assertEqual(loaded_tree.id, 'spam')
+        self.assertFalse(hasattr(loaded_tree, 'ctx'))
+
+    def test_mmap(self):
+        tree = typed_ast.ast3.parse('def spam(ham: int) -> None:\n    return eggs[ham]\n')
+        with tempfile.TemporaryFile() as binary_file:
+            binary_file.write(typed_astunparse.dump_binary(tree))
+            binary_file.flush()
+            with mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                loaded_tree = typed_astunparse.load_binary(mapped)
+        self.assertEqual(typed_astunparse.unparse(loaded_tree), typed_astunparse.unparse(tree))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            typed_astunparse.load_binary(b'spam')
+        data = bytearray(typed_astunparse.dump_binary(typed_ast.ast3.Name('spam')))
+        data[5] = 99
+        with self.assertRaises(ValueError):
+            typed_astunparse.load_binary(data)
+        with self.assertRaises(TypeError):
+            typed_astunparse.dump_binary(typed_ast.ast3.Num(object()))
@@ -0,0 +1,80 @@
+"""Tested module: comparison."""
+
+import ast
+import math
+import unittest
+
+import typed_ast.ast3
+import typed_astunparse
+
+from .examples import PATHS
+
+
+class ComparisonTests(unittest.TestCase):
+
+    """Unit tests for equal() and find_difference()."""
+
+    def test_equal_files(self):
+        for path in PATHS[:20]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                code = py_file.read()
+            try:
+                tree = typed_ast.ast3.parse(source=code, filename=path)
+            except SyntaxError:
+                continue
+            with self.subTest(path=path):
+                roundtrip_tree = typed_ast.ast3.parse(typed_astunparse.unparse(tree))
+                for attributes in (False, True):
+                    self.assertEqual(
+                        typed_astunparse.equal(tree, roundtrip_tree, include_attributes=attributes),
+                        typed_ast.ast3.dump(tree, include_attributes=attributes)
+                        == typed_ast.ast3.dump(roundtrip_tree, include_attributes=attributes))
+
+    def test_find_difference(self):
+        tree = typed_ast.ast3.parse('spam(1, ham=2.0)\nx = eggs.bacon')
+        self.assertIsNone(typed_astunparse.find_difference(tree, tree))
+        for code, path in [
+                ('spam(1, ham=2.0)\nx = eggs.ham', 'tree.body[1].value.attr'),
+                ('spam(1, ham=2)\nx = eggs.bacon', 'tree.body[0].value.keywords[0].value.n'),
+                ('spam(1, ham=-0.0)\nx = eggs.bacon', 'tree.body[0].value.keywords[0].value'),
+                ('spam(1, 2, ham=2.0)\nx = eggs.bacon', 'tree.body[0].value.args'),
+                ('spam(1, ham=2.0)\nx = eggs', 'tree.body[1].value')]:
+            with self.subTest(code=code):
+                other_tree = typed_ast.ast3.parse(code)
+                self.assertEqual(typed_astunparse.find_difference(tree, other_tree), path)
+                self.assertFalse(typed_astunparse.equal(tree, other_tree))
+        self.assertEqual(typed_astunparse.find_difference(tree, tree.body[0]), 'tree')
+
+    def test_attributes(self):
+        tree = typed_ast.ast3.parse('spam\nham')
+        other_tree = typed_ast.ast3.parse('spam\n\nham')
+        self.assertTrue(typed_astunparse.equal(tree, other_tree))
+        self.assertEqual(
+            typed_astunparse.find_difference(tree, other_tree, include_attributes=True),
+            'tree.body[1].value.lineno')
+
+    def test_mixed_trees(self):
+        typed_tree = typed_ast.ast3.parse('spam.ham(eggs)')
+        untyped_tree = ast.parse('spam.ham(eggs)')
+        self.assertTrue(typed_astunparse.equal(typed_tree, untyped_tree))
+        mixed_tree = typed_ast.ast3.parse('spam.ham(eggs)')
+        mixed_tree.body[0].value.args = untyped_tree.body[0].value.args
+        self.assertTrue(typed_astunparse.equal(typed_tree, mixed_tree))
+        self.assertTrue(typed_astunparse.equal(mixed_tree, untyped_tree))
+        mixed_tree.body[0].value.args = [ast.Name('bacon', ast.Load())]
+        self.assertEqual(typed_astunparse.find_difference(typed_tree, mixed_tree),
+                         'tree.body[0].value.args[0].id')
+
+    def test_special_values(self):
+        nan = typed_ast.ast3.Num(math.nan)
+        self.assertTrue(typed_astunparse.equal(nan, typed_ast.ast3.Num(math.nan)))
+        self.assertFalse(typed_astunparse.equal(typed_ast.ast3.Num(1), typed_ast.ast3.Num(True)))
+        self.assertFalse(typed_astunparse.equal(typed_ast.ast3.Num(1), typed_ast.ast3.Num()))
+
+    def test_deep_trees(self):
+        tree = typed_ast.ast3.parse('1' + ' + 1' * 100000, mode='eval')
+        other_tree = typed_ast.ast3.parse('1' + ' + 1' * 100000, mode='eval')
+        self.assertTrue(typed_astunparse.equal(tree, other_tree))
+        other_tree.body.left.left.right.n = 2
+        self.assertEqual(typed_astunparse.find_difference(tree, other_tree),
+                         'tree.body.left.left.right.n')
@@ -0,0 +1,78 @@
+"""Tested module: conversion."""
+
+import ast
+import re
+import sys
+import unittest
+
+import typed_ast.ast3
+import typed_astunparse
+
+from .examples import PATHS
+
+# kinds of strings other than 'u' are not stored by ast
+_KIND = re.compile(r", kind='(?!u')\w*'")
+
+
+@unittest.skipIf(sys.version_info < (3, 9), 'conversion is compared with ast of Python >= 3.9')
+class ConversionTests(unittest.TestCase):
+
+    """Unit tests for to_ast() and to_typed_ast()."""
+
+    def test_files(self):
+        for path in PATHS[:40]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                code = py_file.read()
+            try:
+                typed_tree = typed_ast.ast3.parse(source=code, filename=path)
+            except SyntaxError:
+                continue
+            untyped_tree = ast.parse(source=code, filename=path, type_comments=True)
+            typed_dump = typed_ast.ast3.dump(typed_tree, include_attributes=True)
+            untyped_dump = ast.dump(untyped_tree, include_attributes=True)
+            with self.subTest(path=path):
+                self.assertEqual(ast.dump(typed_astunparse.to_ast(typed_tree)),
+                                 ast.dump(untyped_tree))
+                self.assertEqual(
+                    _KIND.sub('', typed_ast.ast3.dump(typed_astunparse.to_typed_ast(untyped_tree))),
+                    _KIND.sub('', typed_ast.ast3.dump(typed_tree)))
+                # original trees are unchanged
+                self.assertEqual(typed_ast.ast3.dump(typed_tree, include_attributes=True),
+                                 typed_dump)
+                self.assertEqual(ast.dump(untyped_tree, include_attributes=True), untyped_dump)
+
+    def test_sharing(self):
+        tree = typed_ast.ast3.parse('global spam, ham\nx[1:2, ::3] = f"{eggs!r}", 4')
+        converted = typed_astunparse.to_ast(tree)
+        self.assertIsInstance(converted, ast.Module)
+        self.assertIs(converted.body[0].names, tree.body[0].names)
+        self.assertIsNot(converted.body, tree.body)
+        self.assertEqual(converted.body[1].lineno, 2)
+        self.assertEqual(converted.body[1].value.elts[1].col_offset, 27)
+        self.assertEqual(
+            ast.unparse(converted), 'global spam, ham\nx[1:2, ::3] = (f\'{eggs!r}\', 4)')
+        self.assertEqual(typed_astunparse.unparse(typed_astunparse.to_typed_ast(converted)),
+                         typed_astunparse.unparse(tree))
+
+    def test_mixed(self):
+        tree = typed_ast.ast3.parse('spam = 1')
+        tree.body.append(ast.parse('ham = eggs[0]').body[0])
+        self.assertEqual(ast.unparse(typed_astunparse.to_ast(tree)), 'spam = 1\nham = eggs[0]')
+        converted = typed_astunparse.to_typed_ast(tree)
+        self.assertTrue(all(isinstance(_, typed_ast.ast3.AST)
+                            for _ in typed_ast.ast3.walk(converted)))
+        self.assertEqual(typed_astunparse.unparse(converted), typed_astunparse.unparse(tree))
+
+    def test_deep_tree(self):
+        tree = typed_ast.ast3.Num(1)
+        for _ in range(100000):
+            tree = typed_ast.ast3.UnaryOp(typed_ast.ast3.USub(), tree)
+        converted = typed_astunparse.to_ast(tree)
+        self.assertIsInstance(converted, ast.UnaryOp)
+        self.assertIs(converted.op, converted.operand.op)
+
+    def test_unsupported_syntax(self):
+        for code in ('(spam := 1)', 'def spam(ham, /): pass'):
+            with self.subTest(code=code):
+                with self.assertRaises(ValueError):
+                    typed_astunparse.to_typed_ast(ast.parse(code))
@@ -0,0 +1,98 @@
+"""Tested module: disk_cache."""
+
+import concurrent.futures
+import os
+import pathlib
+import tempfile
+import time
+import unittest
+
+import typed_ast.ast3
+import typed_astunparse
+
+from .examples import PATHS
+
+
+def _unparse_with_shared_cache(directory: str, path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as py_file:
+        tree = typed_ast.ast3.parse(py_file.read())
+    return typed_astunparse.unparse(
+        tree, disk_cache=typed_astunparse.DiskUnparseCache(directory, max_size=256 * 1024))
+
+
+class DiskCacheTests(unittest.TestCase):
+
+    """Unit tests for DiskUnparseCache."""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.directory = pathlib.Path(self._tmpdir.name, 'cache')
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_unparse_with_disk_cache(self):
+        cache = typed_astunparse.DiskUnparseCache(self.directory)
+        trees = [typed_ast.ast3.parse(code) for code in (
+            'spam = 1  # type: int\n', "spam = r'\\d'\n", "spam = '\\\\d'\n", 'spam = 1.0\n')]
+        codes = [typed_astunparse.unparse(tree) for tree in trees]
+        for _ in range(2):
+            self.assertEqual(
+                [typed_astunparse.unparse(tree, disk_cache=cache) for tree in trees], codes)
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+        self.assertEqual(len(cache), 4)
+        self.assertEqual(len({cache.key(tree) for tree in trees}), 4)
+
+        # cache persists between instances, and entries can be stored under custom keys
+        cache = typed_astunparse.DiskUnparseCache(self.directory)
+        self.assertEqual(typed_astunparse.unparse(trees[0], disk_cache=cache), codes[0])
+        self.assertEqual(cache.hits, 1)
+        self.assertIsNone(cache.get('0123abcd'))
+        cache.put('0123abcd', 'spam\udc80\n')
+        self.assertEqual(cache.get('0123abcd'), 'spam\udc80\n')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+    def test_deep_tree(self):
+        cache = typed_astunparse.DiskUnparseCache(self.directory)
+        tree = typed_ast.ast3.Num(1)
+        for _ in range(10000):
+            tree = typed_ast.ast3.UnaryOp(typed_ast.ast3.USub(), tree)
+        self.assertEqual(typed_astunparse.unparse(tree, iterative=True, disk_cache=cache),
+                         typed_astunparse.unparse(tree, iterative=True))
+        self.assertEqual(len(cache), 0)
+
+    def test_eviction(self):
+        cache = typed_astunparse.DiskUnparseCache(self.directory, max_size=1000)
+        now = time.time()
+        for i in range(10):
+            cache.put('{:040x}'.format(i), str(i) * 200)
+            os.utime(str(cache._path('{:040x}'.format(i))), (now - 100 + i, now - 100 + i))
+        self.assertEqual(len(cache), 4)
+        self.assertIsNotNone(cache.get('{:040x}'.format(6)))
+        cache.put('{:040x}'.format(10), 'a' * 200)
+        cache.put('{:040x}'.format(11), 'b' * 200)
+        self.assertEqual(len(cache), 4)
+        self.assertIsNotNone(cache.get('{:040x}'.format(6)))
+        self.assertIsNone(cache.get('{:040x}'.format(7)))
+        self.assertIsNone(cache.get('{:040x}'.format(0)))
+        with self.assertRaises(ValueError):
+            typed_astunparse.DiskUnparseCache(self.directory, max_size=0)
+
+    def test_shared_cache(self):
+        paths = []
+        for path in PATHS[:12]:
+            try:
+                with open(path, 'r', encoding='utf-8') as py_file:
+                    typed_ast.ast3.parse(py_file.read())
+            except SyntaxError:
+                continue
+            paths.append(path)
+        paths *= 3
+        with concurrent.futures.ProcessPoolExecutor(2) as executor:
+            codes = list(executor.map(
+                _unparse_with_shared_cache, [str(self.directory)] * len(paths), paths))
+        for path, code in zip(paths, codes):
+            self.assertEqual(code, _unparse_with_shared_cache(str(self.directory), path))
+        self.assertEqual(list(self.directory.rglob('.tmp*')), [])
@@ -78,6 +78,38 @@ class DumpTests(unittest.TestCase):
                     self.assertNotEqual(typed_dump, bad_typed_dump)
                     self.assertEqual(typed_dump, tested_typed_dump)
 
+    def test_compact_dump(self):
+        """Print the same data as default dump(), in one line."""
+        for description, example in EXAMPLES.items():
+            for mode in MODES:
+                if example['trees'][mode] is None:
+                    continue
+                dump = typed_astunparse.dump(example['trees'][mode], compact=True)
+                self.assertNotIn('\n', dump)
+                self.assertEqual(
+                    dump, _postprocess_dump(typed_astunparse.dump(example['trees'][mode])),
+                    msg=(description, mode))
+                self.assertEqual(
+                    dump, typed_ast.ast3.dump(example['trees'][mode]), msg=(description, mode))
+
+        for path in PATHS[:20]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                code = py_file.read()
+            for parse in (ast.parse, typed_ast.ast3.parse):
+                try:
+                    tree = parse(source=code, filename=path)
+                except SyntaxError:
+                    continue
+                for annotate_fields in [True, False]:
+                    for include_attributes in [False, True]:
+                        with self.subTest(path=path, parse=parse, annotate_fields=annotate_fields,
+                                          include_attributes=include_attributes):
+                            self.assertEqual(
+                                typed_astunparse.dump(
+                                    tree, annotate_fields, include_attributes, compact=True),
+                                _postprocess_dump(typed_astunparse.dump(
+                                    tree, annotate_fields, include_attributes)))
+
     def test_many_dump_roundtrips(self):
         """Preserve ASTs after unparse(parse(...unparse(parse(dump(tree)))...))."""
         for description, example in EXAMPLES.items():
@@ -92,6 +124,7 @@ class DumpTests(unittest.TestCase):
                     _LOG.debug('%s', dump)
                     clean_dump = dump.replace('\n', '').replace(' ', '')
                     self.assertEqual(clean_dump, example['dumps'][mode], msg=(description, mode))
-                # TODO: use tree equality comparison below
-                # tree = typed_ast.ast3.parse(source=dump, mode=mode)
-                # self.assertTrue(typed_astunparse.equal(tree, example['trees'][mode]))
+                tree = typed_ast.ast3.parse(source=dump, mode=mode)
+                dump_tree = typed_ast.ast3.parse(
+                    source=typed_astunparse.dump(example['trees'][mode]), mode=mode)
+                self.assertTrue(typed_astunparse.equal(tree, dump_tree), msg=(description, mode))
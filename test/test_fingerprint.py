@@ -0,0 +1,77 @@
+"""Tested module: fingerprint."""
+
+import ast
+import re
+import unittest
+
+import typed_ast.ast3
+import typed_astunparse
+
+from .examples import EXAMPLES, MODES, PATHS
+
+
+class FingerprintTests(unittest.TestCase):
+
+    """Unit tests for fingerprint() function."""
+
+    def test_examples(self):
+        fingerprints = {}
+        for description, example in EXAMPLES.items():
+            for mode in MODES:
+                tree = example['trees'][mode]
+                if tree is None:
+                    continue
+                with self.subTest(description=description, mode=mode):
+                    fingerprint = typed_astunparse.fingerprint(tree)
+                    self.assertRegex(fingerprint, r'^[0-9a-f]{40}$')
+                    dump = re.sub(r",kind='[^u']'", '', example['dumps'][mode])  # e.g. r'' or R''
+                    self.assertEqual(fingerprints.setdefault(fingerprint, dump), dump)
+                    code = typed_astunparse.unparse(tree)
+                    self.assertEqual(
+                        typed_astunparse.fingerprint(typed_ast.ast3.parse(code, mode=mode)),
+                        fingerprint)
+
+    def test_typed_and_untyped(self):
+        for code in ['spam[1]', 'spam[1:2, ham]', 'spam[...]', "b'spam' + u'ham' + f'{eggs}'",
+                     'spam(None, True, 1.5j)', 'def spam(ham, *, eggs): pass']:
+            with self.subTest(code=code):
+                self.assertEqual(typed_astunparse.fingerprint(typed_ast.ast3.parse(code)),
+                                 typed_astunparse.fingerprint(ast.parse(code)))
+        for path in PATHS[:20]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                code = py_file.read()
+            try:
+                typed_tree = typed_ast.ast3.parse(source=code, filename=path)
+            except SyntaxError:
+                continue
+            untyped_tree = ast.parse(source=code, filename=path)
+            with self.subTest(path=path):
+                self.assertEqual(
+                    typed_astunparse.fingerprint(typed_tree, include_type_comments=False),
+                    typed_astunparse.fingerprint(untyped_tree))
+
+    def test_differences(self):
+        fingerprint = typed_astunparse.fingerprint(typed_ast.ast3.parse('spam[1]'))
+        for code in ['spam[1.0]', 'spam[True]', "spam['1']", 'spam[1,]', 'spam[(1)][0]', 'ham[1]']:
+            with self.subTest(code=code):
+                self.assertNotEqual(
+                    typed_astunparse.fingerprint(typed_ast.ast3.parse(code)), fingerprint)
+
+    def test_options(self):
+        tree = typed_ast.ast3.parse('spam = 1  # type: int')
+        moved_tree = typed_ast.ast3.parse('\nspam = 1  # type: int')
+        untyped_tree = ast.parse('spam = 1')
+        self.assertEqual(typed_astunparse.fingerprint(tree),
+                         typed_astunparse.fingerprint(moved_tree))
+        self.assertNotEqual(typed_astunparse.fingerprint(tree, include_attributes=True),
+                            typed_astunparse.fingerprint(moved_tree, include_attributes=True))
+        self.assertNotEqual(typed_astunparse.fingerprint(tree),
+                            typed_astunparse.fingerprint(untyped_tree))
+        self.assertEqual(typed_astunparse.fingerprint(tree, include_type_comments=False),
+                         typed_astunparse.fingerprint(untyped_tree))
+
+    def test_deep_tree(self):
+        tree = typed_ast.ast3.parse('1' + ' + 1' * 100000, mode='eval')
+        self.assertEqual(
+            typed_astunparse.fingerprint(tree),
+            typed_astunparse.fingerprint(typed_ast.ast3.parse('1' + ' + 1' * 100000, mode='eval')))
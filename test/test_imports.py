@@ -0,0 +1,41 @@
+"""Tested module: __init__."""
+
+import subprocess
+import sys
+import unittest
+
+import typed_astunparse
+
+_SCRIPT = """
+import sys
+import typed_astunparse
+print(' '.join(sorted(sys.modules)))
+import typed_ast.ast3
+typed_astunparse.unparse(typed_ast.ast3.parse('x = 1'))
+print(' '.join(sorted(sys.modules)))
+"""
+
+
+class ImportsTests(unittest.TestCase):
+
+    """Check that submodules and dependencies are imported only when needed."""
+
+    def test_lazy_imports(self):
+        output = subprocess.run(
+            [sys.executable, '-c', _SCRIPT], stdout=subprocess.PIPE, check=True,
+            universal_newlines=True).stdout
+        after_import, after_unparse = [set(line.split()) for line in output.splitlines()]
+        for name in ('typed_ast', 'astunparse', 'six', 'version_query', 'multiprocessing',
+                     'typed_astunparse.unparser', 'typed_astunparse.printer'):
+            self.assertNotIn(name, after_import)
+        self.assertIn('typed_astunparse.unparser', after_unparse)
+        for name in ('version_query', 'multiprocessing', 'typed_astunparse.printer',
+                     'typed_astunparse.batch'):
+            self.assertNotIn(name, after_unparse)
+
+    def test_public_names(self):
+        for name in typed_astunparse.__all__:
+            self.assertTrue(hasattr(typed_astunparse, name), msg=name)
+        self.assertTrue(set(typed_astunparse.__all__).issubset(dir(typed_astunparse)))
+        with self.assertRaises(AttributeError):
+            typed_astunparse.no_such_name  # pylint: disable=pointless-statement
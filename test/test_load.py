@@ -0,0 +1,79 @@
+"""Tested function: load."""
+
+import ast
+import unittest
+
+import typed_ast.ast3
+import typed_astunparse
+
+from .examples import MODES, EXAMPLES, PATHS
+
+
+class LoadTests(unittest.TestCase):
+
+    """Unit tests for load() function."""
+
+    def test_load_examples(self):
+        for description, example in EXAMPLES.items():
+            for mode in MODES:
+                tree = example['trees'][mode]
+                if tree is None:
+                    continue
+                with self.subTest(description=description, mode=mode):
+                    loaded_tree = typed_astunparse.load(typed_astunparse.dump(tree))
+                    self.assertTrue(typed_astunparse.equal(loaded_tree, tree))
+                    self.assertEqual(
+                        typed_astunparse.unparse(loaded_tree), typed_astunparse.unparse(tree))
+
+    def test_load_files(self):
+        for path in PATHS[:10]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                code = py_file.read()
+            try:
+                tree = typed_ast.ast3.parse(source=code, filename=path)
+            except SyntaxError:
+                continue
+            for annotate_fields in [True, False]:
+                for include_attributes in [False, True]:
+                    for compact in [False, True]:
+                        with self.subTest(path=path, annotate_fields=annotate_fields,
+                                          include_attributes=include_attributes, compact=compact):
+                            dump = typed_astunparse.dump(
+                                tree, annotate_fields, include_attributes, compact)
+                            self.assertTrue(typed_astunparse.equal(
+                                typed_astunparse.load(dump), tree, include_attributes))
+
+    def test_load_values(self):
+        code = "x = [0, -1, 2 ** 100, 1.5, -0.0, 1e400, -1e400, 2.5e-08, 2j, -1 - 0j, b'\\x00'," \
+            " ..., None, True, '', \"it's\", 'sp\\u00e4m\\n']"
+        tree = typed_ast.ast3.parse(typed_astunparse.unparse(typed_ast.ast3.parse(code)))
+        for compact in [False, True]:
+            dump = typed_astunparse.dump(tree, compact=compact)
+            with self.subTest(dump=dump):
+                self.assertTrue(typed_astunparse.equal(typed_astunparse.load(dump), tree))
+        loaded_tree = typed_astunparse.load("Num(n=nan)")
+        self.assertNotEqual(loaded_tree.n, loaded_tree.n)
+
+    def test_load_shared_strings(self):
+        tree = typed_astunparse.load(typed_astunparse.dump(typed_ast.ast3.parse('spam = spam')))
+        self.assertIs(tree.body[0].targets[0].id, tree.body[0].value.id)
+
+    def test_load_untyped(self):
+        tree = ast.parse('spam(ham)')
+        loaded_tree = typed_astunparse.load(typed_astunparse.dump(tree), module=ast)
+        self.assertIsInstance(loaded_tree.body[0].value, ast.Call)
+        self.assertTrue(typed_astunparse.equal(loaded_tree, tree))
+
+    def test_load_deep(self):
+        tree = typed_ast.ast3.parse('1' + ' + 1' * 100000, mode='eval')
+        dump = 'Expression(body=' + 'BinOp(left=' * 100000 + 'Num(n=1)' \
+            + ', op=Add(), right=Num(n=1))' * 100000 + ')'
+        self.assertTrue(typed_astunparse.equal(typed_astunparse.load(dump), tree))
+
+    def test_load_invalid(self):
+        for dump in ["__import__('os')", "Name(id='spam'", "Name(id='spam'))", "Name(id=spam)",
+                     "[Load()", "Load()]", "Load() Store()", "", "Name(id='spam' + 'ham')",
+                     "Num(1, 2, 3, 4, 5)", "[x=1]", "AST.__subclasses__()"]:
+            with self.subTest(dump=dump):
+                with self.assertRaises(ValueError):
+                    typed_astunparse.load(dump)
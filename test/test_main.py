@@ -0,0 +1,117 @@
+"""Tested module: __main__."""
+
+import contextlib
+import io
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import typed_ast.ast3
+import typed_astunparse
+from typed_astunparse.__main__ import main
+
+EXAMPLE_CODE = {
+    'spam.py': "def negation(arg):\n    # type: (bool) -> bool\n    return (not arg)\n",
+    'eggs/ham.py': "my_string = None  # type: str\n",
+    'eggs/bad.py': "def\n"}
+
+
+class MainTests(unittest.TestCase):
+
+    """Unit tests for command-line interface."""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self._tmpdir.name, 'input')
+        for name, code in EXAMPLE_CODE.items():
+            path = self.root.joinpath(name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(code)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _expected(self, name):
+        return typed_astunparse.unparse(typed_ast.ast3.parse(EXAMPLE_CODE[name]))
+
+    def test_output_dir(self):
+        output_dir = pathlib.Path(self._tmpdir.name, 'output')
+        for jobs in ('1', '2'):
+            with self.subTest(jobs=jobs):
+                stdout, stderr = io.StringIO(), io.StringIO()
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    returncode = main([
+                        str(self.root), '-o', str(output_dir), '-j', jobs, '--chunksize', '1'])
+                self.assertEqual(returncode, 1)
+                self.assertIn('bad.py: failed: SyntaxError', stderr.getvalue())
+                self.assertIn('ham.py: parse', stdout.getvalue())
+                self.assertIn('3 files (1 failed)', stdout.getvalue())
+                for name in ('spam.py', 'eggs/ham.py'):
+                    self.assertEqual(
+                        output_dir.joinpath(name).read_text(), self._expected(name))
+                    self.assertEqual(self.root.joinpath(name).read_text(), EXAMPLE_CODE[name])
+                self.assertFalse(output_dir.joinpath('eggs', 'bad.py').exists())
+
+    def test_in_place(self):
+        path = self.root.joinpath('spam.py')
+        returncode = main([str(path), '--quiet'])
+        self.assertEqual(returncode, 0)
+        self.assertEqual(path.read_text(), self._expected('spam.py'))
+
+    def test_encoding(self):
+        path = self.root.joinpath('latin.py')
+        path.write_bytes("# -*- coding: latin-1 -*-\nspam = 'ñandú'\n".encode('latin-1'))
+        returncode = main([str(path), '--quiet'])
+        self.assertEqual(returncode, 0)
+        code = path.read_bytes().decode('utf-8')
+        self.assertEqual(code, "\nspam = 'ñandú'\n")
+
+    def test_unwritable_output(self):
+        output_dir = pathlib.Path(self._tmpdir.name, 'output')
+        output_dir.joinpath('eggs').parent.mkdir()
+        output_dir.joinpath('eggs').write_text('not a directory')
+        for jobs in ('1', '2'):
+            with self.subTest(jobs=jobs):
+                stderr = io.StringIO()
+                with contextlib.redirect_stdout(io.StringIO()), \
+                        contextlib.redirect_stderr(stderr):
+                    returncode = main([
+                        str(self.root), '-o', str(output_dir), '-j', jobs, '--chunksize', '1'])
+                self.assertEqual(returncode, 1)
+                self.assertIn('ham.py: failed: FileExistsError', stderr.getvalue())
+                self.assertEqual(
+                    output_dir.joinpath('spam.py').read_text(), self._expected('spam.py'))
+
+    def test_run_module(self):
+        process = subprocess.run(
+            [sys.executable, '-m', 'typed_astunparse', str(self.root.joinpath('eggs', 'ham.py'))],
+            stdout=subprocess.PIPE, universal_newlines=True, check=True)
+        self.assertIn('1 files (0 failed)', process.stdout)
+
+    def test_verify(self):
+        cache = pathlib.Path(self._tmpdir.name, 'cache.sqlite')
+        report = pathlib.Path(self._tmpdir.name, 'report.json')
+        for jobs, cached in (('1', 0), ('2', 3)):
+            with self.subTest(jobs=jobs):
+                stdout, stderr = io.StringIO(), io.StringIO()
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    returncode = main([
+                        str(self.root), '--verify', '--cache', str(cache), '--report',
+                        str(report), '-j', jobs, '--chunksize', '1'])
+                self.assertEqual(returncode, 1)
+                self.assertIn('bad.py: error: SyntaxError', stderr.getvalue())
+                self.assertIn('3 files (0 failed, 1 not parsed, {} cached)'.format(cached),
+                              stdout.getvalue())
+                with report.open() as report_file:
+                    results = json.load(report_file)
+                keys = ('files', 'passed', 'failed', 'errors', 'cached')
+                self.assertEqual(
+                    {key: results[key] for key in keys},
+                    {'files': 3, 'passed': 2, 'failed': 0, 'errors': 1, 'cached': cached})
+                self.assertEqual([failure['path'] for failure in results['failures']],
+                                 [str(self.root.joinpath('eggs', 'bad.py'))])
+        for name, code in EXAMPLE_CODE.items():
+            self.assertEqual(self.root.joinpath(name).read_text(), code)
@@ -0,0 +1,59 @@
+"""Tested module: profiling."""
+
+import io
+import logging
+import unittest
+
+import typed_ast.ast3
+import typed_astunparse
+
+_CODE = "def negation(arg: bool) -> bool:\n    return (not arg)\n" \
+    "x = negation(y='spam')  # type: bool\n"
+
+
+class ProfilingTests(unittest.TestCase):
+
+    """Unit tests for ProfilingUnparser and ProfilingPrinter."""
+
+    def test_unparser(self):
+        tree = typed_ast.ast3.parse(_CODE)
+        stream = io.StringIO()
+        unparser = typed_astunparse.ProfilingUnparser(tree, file=stream)
+        self.assertEqual(stream.getvalue(), typed_astunparse.unparse(tree))
+        profile = unparser.profile.as_dict()
+        self.assertEqual(profile['node_types']['Name']['calls'], 5)
+        self.assertEqual(profile['node_types']['Module']['calls'], 1)
+        self.assertEqual(profile['handlers']['_arguments']['calls'], 1)
+        self.assertEqual(profile['handlers']['_Name']['calls'], 5)
+        self.assertEqual(profile['handlers']['_write_string_or_dispatch']['calls'], 1)
+        self.assertIn('write', profile['handlers'])
+        module = profile['node_types']['Module']
+        self.assertGreaterEqual(
+            module['time'], sum(stats['self_time'] for stats in profile['node_types'].values()))
+        self.assertLessEqual(module['self_time'], module['time'])
+
+        typed_astunparse.ProfilingUnparser(tree, file=io.StringIO(), profile=unparser.profile)
+        self.assertEqual(unparser.profile.node_types['Module'][0], 2)
+        unparser.profile.clear()
+        self.assertEqual(unparser.profile.as_dict(), {'node_types': {}, 'handlers': {}})
+        self.assertNotIn('profile', vars(typed_astunparse.Unparser))
+
+    def test_printer(self):
+        tree = typed_ast.ast3.parse(_CODE)
+        stream = io.StringIO()
+        printer = typed_astunparse.ProfilingPrinter(file=stream)
+        printer.visit(tree)
+        self.assertEqual(stream.getvalue(), typed_astunparse.dump(tree))
+        profile = printer.profile.as_dict()
+        self.assertEqual(profile['node_types']['Name']['calls'], 5)
+        generic_visit = profile['handlers']['generic_visit']
+        self.assertLessEqual(generic_visit['time'], profile['node_types']['Module']['time'])
+        self.assertIn('_prepare_for_print', profile['handlers'])
+
+    def test_log(self):
+        tree = typed_ast.ast3.parse(_CODE)
+        unparser = typed_astunparse.ProfilingUnparser(tree, file=io.StringIO())
+        with self.assertLogs('typed_astunparse.profiling', level=logging.INFO) as logs:
+            unparser.profile.log(limit=2)
+        self.assertEqual(len(logs.output), 4)
+        self.assertRegex(logs.output[0], r'node type \w+: \d+ calls')
@@ -1,9 +1,12 @@
 """Tested function: unparse."""
 
+import array
 import ast
+import io
 import itertools
 import logging
 import pathlib
+import subprocess
 import unittest
 import sys
 
@@ -102,3 +105,510 @@ class UnparseTests(unittest.TestCase):
                 tree_dump = ast.dump(tree, include_attributes=False)
                 roundtrip_tree_dump = ast.dump(roundtrip_tree, include_attributes=False)
                 self.assertEqual(tree_dump, roundtrip_tree_dump, msg=path)
+
+    def test_dispatch_table(self):
+        """Resolve handlers once per node class, also in subclasses of Unparser."""
+
+        class UppercaseNamesUnparser(typed_astunparse.Unparser):
+
+            def _Name(self, t):
+                self.write(t.id.upper())
+
+        for tree in (typed_ast.ast3.parse('spam(ham)'), ast.parse('spam(ham)')):
+            stream = io.StringIO()
+            UppercaseNamesUnparser(tree, file=stream)
+            self.assertEqual(stream.getvalue().strip(), 'SPAM(HAM)')
+            self.assertEqual(typed_astunparse.unparse(tree).strip(), 'spam(ham)')
+            self.assertIn(
+                type(tree.body[0].value.func),
+                typed_astunparse.Unparser._dispatch_tables[UppercaseNamesUnparser])
+
+    def test_iterative_unparse(self):
+        """Unparse examples and Python stdlib exactly the same way using IterativeUnparser."""
+        for description, example in itertools.chain(EXAMPLES.items(), UNVERIFIED_EXAMPLES.items()):
+            for mode in MODES:
+                if example['trees'][mode] is None:
+                    continue
+                with self.subTest(description=description, mode=mode):
+                    tree = example['trees'][mode]
+                    self.assertEqual(
+                        typed_astunparse.unparse(tree, iterative=True),
+                        typed_astunparse.unparse(tree))
+        for path in PATHS:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                original_code = py_file.read()
+            for parse in (typed_ast.ast3.parse, ast.parse):
+                try:
+                    tree = parse(source=original_code, filename=path)
+                except SyntaxError:
+                    continue
+                with self.subTest(path=path, parse=parse.__module__):
+                    self.assertEqual(
+                        typed_astunparse.unparse(tree, iterative=True),
+                        typed_astunparse.unparse(tree))
+        if sys.version_info >= (3, 9):
+            tree = ast.parse('def f(a, /, b): return x[1:2, 3]')
+            self.assertEqual(typed_astunparse.unparse(tree, iterative=True),
+                             '\n\ndef f(a, /, b):\n    return x[1:2, 3]\n')
+
+    def test_minimal_parentheses(self):
+        """Unparse examples and Python stdlib with only the necessary parentheses."""
+        for description, example in itertools.chain(EXAMPLES.items(), UNVERIFIED_EXAMPLES.items()):
+            for mode in MODES:
+                tree = example['trees'][mode]
+                if tree is None:
+                    continue
+                with self.subTest(description=description, mode=mode):
+                    code = typed_astunparse.unparse(tree, minimal_parentheses=True)
+                    self.assertLessEqual(len(code), len(typed_astunparse.unparse(tree)))
+                    self.assertTrue(typed_astunparse.equal(
+                        typed_ast.ast3.parse(code, mode=mode),
+                        typed_ast.ast3.parse(typed_astunparse.unparse(tree), mode=mode)))
+        for path in PATHS[:40]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                original_code = py_file.read()
+            try:
+                tree = typed_ast.ast3.parse(source=original_code, filename=path)
+            except SyntaxError:
+                continue
+            with self.subTest(path=path):
+                code = typed_astunparse.unparse(tree, minimal_parentheses=True)
+                roundtrip_tree = typed_ast.ast3.parse(typed_astunparse.unparse(tree))
+                self.assertIsNone(
+                    typed_astunparse.find_difference(typed_ast.ast3.parse(code), roundtrip_tree))
+
+        for code in (
+                'a + b * c', '(a + b) * c', 'a - (b - c)', 'a ** b ** c', '(a ** b) ** c',
+                '- a ** b', '(- a) ** b', 'a ** - b', 'not a == b', 'a == (not b)', 'not not a',
+                'a and (b or c)', 'a or b and c', '(a and b) and c', 'a < (b < c)', '(a < b) < c',
+                'a < b < c', '(a if b else c) if d else e', 'a if b else c if d else e',
+                '(lambda : 1)()', 'f(a)(b)[c].d', '(a + b).c', 'f(*(a or b), **c or d)',
+                '[x for x in (lambda : y) if (a if b else c)]', '{**(a or b), (lambda : 1): 2}',
+                'x[(lambda : 1):2]', 'x = ()', 'a, = b', '(a, b)', 'x = (a, b)', 'x = yield y',
+                'print((yield))', 'for a, *b in c:\n    pass', '1 .real', '- 1',
+                'async def f():\n    await (a + b)\n    await f(x)\n    return - await x'):
+            tree = typed_ast.ast3.parse(code)
+            with self.subTest(code=code):
+                self.assertEqual(
+                    typed_astunparse.unparse(tree, minimal_parentheses=True).strip(),
+                    code.replace('{**(a or b), (lambda : 1): 2}',
+                                 '{\n    **(a or b),\n    (lambda : 1): 2,\n}'))
+
+        tree = typed_ast.ast3.parse('a.b ** c')
+        tree.body[0].value.left.value = typed_ast.ast3.Num(-1)
+        tree.body[0].value.right = typed_ast.ast3.Num(-2.0)
+        self.assertEqual(typed_astunparse.unparse(tree, minimal_parentheses=True).strip(),
+                         '(-1) .b ** -2.0')
+        # the same node object at positions that require different precedence
+        shared = typed_ast.ast3.parse('b - c', mode='eval').body
+        tree = typed_ast.ast3.Expression(typed_ast.ast3.BinOp(shared, typed_ast.ast3.Sub(), shared))
+        code = typed_astunparse.unparse(tree, minimal_parentheses=True)
+        self.assertEqual(code.strip(), 'b - c - (b - c)')
+        self.assertTrue(typed_astunparse.equal(typed_ast.ast3.parse(code, mode='eval'), tree))
+        with self.assertRaises(ValueError):
+            typed_astunparse.unparse(tree, iterative=True, minimal_parentheses=True)
+        with self.assertRaises(ValueError):
+            typed_astunparse.unparse(
+                tree, cache=typed_astunparse.UnparseCache(), minimal_parentheses=True)
+
+    def test_compact(self):
+        """Unparse examples and Python stdlib into the shortest code."""
+        for description, example in itertools.chain(EXAMPLES.items(), UNVERIFIED_EXAMPLES.items()):
+            for mode in MODES:
+                tree = example['trees'][mode]
+                if tree is None:
+                    continue
+                with self.subTest(description=description, mode=mode):
+                    code = typed_astunparse.unparse(tree, compact=True)
+                    self.assertLessEqual(len(code), len(typed_astunparse.unparse(tree)))
+                    self.assertTrue(typed_astunparse.equal(
+                        typed_ast.ast3.parse(code, mode=mode),
+                        typed_ast.ast3.parse(typed_astunparse.unparse(tree), mode=mode)))
+        for path in PATHS[:40]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                original_code = py_file.read()
+            try:
+                tree = typed_ast.ast3.parse(source=original_code, filename=path)
+            except SyntaxError:
+                continue
+            with self.subTest(path=path):
+                code = typed_astunparse.unparse(tree, compact=True)
+                roundtrip_tree = typed_ast.ast3.parse(typed_astunparse.unparse(tree))
+                self.assertIsNone(
+                    typed_astunparse.find_difference(typed_ast.ast3.parse(code), roundtrip_tree))
+
+        code = 'import os, sys\nx = 1  # type: int\ny = {1: 2, **z}\n' \
+            'if a and not b:\n    a += -1; b = a ** -2 - c\n    del a, b\n' \
+            '@dec(1, k=2)\nclass A(B, metaclass=M):\n\n' \
+            '    def f(self, a: int=1, *args, b, **kw) -> int:\n' \
+            '        return lambda x, y=2: x[1:2, ::3]\n\n' \
+            '    def g(a,  # type: int\n          b):\n        # type: (...) -> None\n' \
+            '        for i in range(3):  # type: int\n' \
+            "            print(r'a, b', ', ')\n            yield\n"
+        self.assertEqual(
+            typed_astunparse.unparse(typed_ast.ast3.parse(code), compact=True),
+            '\nimport os,sys;x=1# type: int\ny={1:2,**z}\n'
+            'if a and not b:\n a+=-1;b=a**-2-c;del a,b\n'
+            '@dec(1,k=2)\nclass A(B,metaclass=M):\n'
+            ' def f(self,a:int=1,*args,b,**kw)->int:\n  return lambda x,y=2:x[1:2,::3]\n'
+            ' def g(a,# type: int\n b):\n  # type: (...) -> None\n'
+            "  for i in range(3):# type: int\n   print(r'a, b',', ');yield\n")
+        with self.assertRaises(ValueError):
+            typed_astunparse.unparse(typed_ast.ast3.parse(code), iterative=True, compact=True)
+
+        shared = typed_ast.ast3.parse('b - c', mode='eval').body
+        function = typed_ast.ast3.parse('lambda: 1', mode='eval').body
+        tree = typed_ast.ast3.Expression(typed_ast.ast3.Dict(
+            [function], [typed_ast.ast3.BinOp(shared, typed_ast.ast3.Sub(), shared)]))
+        code = typed_astunparse.unparse(tree, compact=True)
+        self.assertEqual(code.strip(), '{(lambda :1):b-c-(b-c)}')
+        self.assertTrue(typed_astunparse.equal(typed_ast.ast3.parse(code, mode='eval'), tree))
+        tree.body.values[0] = function
+        code = typed_astunparse.unparse(tree, compact=True)
+        self.assertEqual(code.strip(), '{(lambda :1):lambda :1}')
+        self.assertTrue(typed_astunparse.equal(typed_ast.ast3.parse(code, mode='eval'), tree))
+
+    def test_iterative_unparse_deep_trees(self):
+        """Unparse trees that are too deep for the recursive Unparser."""
+        depth = 100000
+        expression = typed_ast.ast3.Name('spam', typed_ast.ast3.Load())
+        for _ in range(depth):
+            expression = typed_ast.ast3.BinOp(
+                expression, typed_ast.ast3.Add(), typed_ast.ast3.Num(1))
+        tree = typed_ast.ast3.Module([typed_ast.ast3.Expr(expression)], [])
+        with self.assertRaises(RecursionError):
+            typed_astunparse.unparse(tree)
+        code = typed_astunparse.unparse(tree, iterative=True)
+        self.assertEqual(code, '\n' + '(' * depth + 'spam' + ' + 1)' * depth + '\n')
+        unparser = typed_astunparse.IncrementalUnparser(iterative=True)
+        self.assertEqual(unparser.unparse(tree), code)
+        self.assertEqual(unparser.unparse(tree), code)
+        self.assertEqual((unparser.rendered, unparser.reused), (0, 1))
+
+        depth = 2000
+        statement = typed_ast.ast3.Pass()
+        for _ in range(depth):
+            statement = typed_ast.ast3.If(
+                typed_ast.ast3.Name('ham', typed_ast.ast3.Load()), [statement], [])
+        tree = typed_ast.ast3.Module([statement], [])
+        with self.assertRaises(RecursionError):
+            typed_astunparse.unparse(tree)
+        code = typed_astunparse.unparse(tree, iterative=True)
+        self.assertEqual(code.count('if ham:'), depth)
+        self.assertTrue(code.endswith(' ' * 4 * depth + 'pass\n'))
+
+    def test_unparse_iter(self):
+        """Unparse examples and Python stdlib chunk by chunk."""
+        for description, example in itertools.chain(EXAMPLES.items(), UNVERIFIED_EXAMPLES.items()):
+            for mode in MODES:
+                tree = example['trees'][mode]
+                if tree is None:
+                    continue
+                with self.subTest(description=description, mode=mode):
+                    code = typed_astunparse.unparse(tree)
+                    self.assertEqual(''.join(typed_astunparse.unparse_iter(tree)), code)
+                    stream = io.StringIO()
+                    typed_astunparse.unparse_to(tree, stream)
+                    self.assertEqual(stream.getvalue(), code)
+        for path in PATHS[:20]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                original_code = py_file.read()
+            try:
+                tree = typed_ast.ast3.parse(source=original_code, filename=path)
+            except SyntaxError:
+                continue
+            with self.subTest(path=path):
+                chunks = list(typed_astunparse.unparse_iter(tree, iterative=True))
+                self.assertEqual(len(chunks), len(tree.body) + 1)
+                self.assertEqual(''.join(chunks), typed_astunparse.unparse(tree))
+
+    def test_unparse_bytes(self):
+        """Unparse examples and Python stdlib into encoded code."""
+        for description, example in itertools.chain(EXAMPLES.items(), UNVERIFIED_EXAMPLES.items()):
+            for mode in MODES:
+                tree = example['trees'][mode]
+                if tree is None:
+                    continue
+                with self.subTest(description=description, mode=mode):
+                    code = typed_astunparse.unparse(tree)
+                    self.assertEqual(typed_astunparse.unparse_bytes(tree), code.encode())
+                    stream = io.BytesIO()
+                    self.assertIsNone(typed_astunparse.unparse_bytes(tree, stream))
+                    self.assertEqual(stream.getvalue(), code.encode())
+                    self.assertEqual(typed_astunparse.unparse_bytes(tree, encoding='utf-16'),
+                                     code.encode('utf-16'))
+
+        class PartialWriter:
+            """Unbuffered file that writes at most 1000 bytes at a time."""
+
+            def __init__(self):
+                self.data = bytearray()
+                self.writes = []
+
+            def write(self, data):
+                self.writes.append(len(data))
+                self.data += data[:1000]
+                return min(len(data), 1000)
+
+        for path in PATHS[:20]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                original_code = py_file.read()
+            try:
+                tree = typed_ast.ast3.parse(source=original_code, filename=path)
+            except SyntaxError:
+                continue
+            with self.subTest(path=path):
+                code = typed_astunparse.unparse(tree).encode()
+                self.assertEqual(typed_astunparse.unparse_bytes(tree, iterative=True), code)
+                writer = PartialWriter()
+                typed_astunparse.unparse_bytes(tree, writer)
+                self.assertEqual(bytes(writer.data), code)
+                # one bulk write per 64 KiB of code, then the rest is written 1000 bytes at a time
+                self.assertGreaterEqual(len(writer.writes), (len(code) + 999) // 1000)
+                self.assertLessEqual(len(writer.writes), (len(code) + 999) // 1000
+                                     + len(code) // (64 * 1024) + 1)
+
+        class NonBlockingWriter(PartialWriter):
+            """Non-blocking file that accepts 1000 bytes, and then is not ready for writing."""
+
+            def write(self, data):
+                if self.data:
+                    return None
+                return super().write(data)
+
+        with self.assertRaises(BlockingIOError) as raised:
+            typed_astunparse.unparse_bytes(
+                typed_ast.ast3.parse('spam = 1\n' * 1000), NonBlockingWriter())
+        self.assertEqual(raised.exception.characters_written, 1000)
+        with self.assertRaises(UnicodeEncodeError):
+            typed_astunparse.unparse_bytes(typed_ast.ast3.parse('spam = "é"'), encoding='ascii')
+
+    def test_output_buffer(self):
+        """Write the same code into OutputBuffer as into StringIO."""
+        for description, example in itertools.chain(EXAMPLES.items(), UNVERIFIED_EXAMPLES.items()):
+            for mode in MODES:
+                tree = example['trees'][mode]
+                if tree is None:
+                    continue
+                with self.subTest(description=description, mode=mode):
+                    for unparser_class in (typed_astunparse.Unparser,
+                                           typed_astunparse.IterativeUnparser):
+                        stream = io.StringIO()
+                        unparser_class(tree, file=stream)
+                        buffer = typed_astunparse.OutputBuffer()
+                        unparser = unparser_class(tree, file=buffer)
+                        self.assertEqual(buffer.getvalue(), stream.getvalue())
+                        self.assertIs(unparser.f, buffer)
+                    stream = io.StringIO()
+                    typed_astunparse.Printer(file=stream).visit(tree)
+                    self.assertEqual(typed_astunparse.dump(tree), stream.getvalue())
+
+        buffer = typed_astunparse.OutputBuffer()
+        self.assertEqual(buffer.getvalue(), '')
+        buffer.write('spam')
+        buffer.writelines([' = ', 'ham'])
+        self.assertEqual(buffer.getvalue(), 'spam = ham')
+        buffer.write('\n')
+        self.assertEqual(buffer.getvalue(), 'spam = ham\n')
+        buffer.clear()
+        print('eggs', file=buffer)
+        self.assertEqual(buffer.getvalue(), 'eggs\n')
+
+    def test_unparse_many(self):
+        """Unparse many trees in a pool of processes, preserving order of inputs."""
+        trees = []
+        for path in PATHS[:30]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                original_code = py_file.read()
+            try:
+                trees.append((path, typed_ast.ast3.parse(source=original_code, filename=path)))
+            except SyntaxError:
+                continue
+        codes = [typed_astunparse.unparse(tree) for _, tree in trees]
+        for workers, chunksize in [(1, 16), (2, 1), (3, 4)]:
+            with self.subTest(workers=workers, chunksize=chunksize):
+                results = typed_astunparse.unparse_many(
+                    trees, workers=workers, chunksize=chunksize)
+                self.assertEqual(results, list(zip([path for path, _ in trees], codes)))
+                results = typed_astunparse.unparse_many(
+                    [tree for _, tree in trees], workers=workers, chunksize=chunksize,
+                    iterative=True)
+                self.assertEqual(results, codes)
+        with self.assertRaises(ValueError):
+            typed_astunparse.unparse_many([], workers=0)
+
+    def test_unparse_with_cache(self):
+        """Unparse the same way when reusing code of identical expressions from cache."""
+        cache = typed_astunparse.UnparseCache(maxsize=64)
+        for description, example in itertools.chain(EXAMPLES.items(), UNVERIFIED_EXAMPLES.items()):
+            for mode in MODES:
+                tree = example['trees'][mode]
+                if tree is None:
+                    continue
+                with self.subTest(description=description, mode=mode):
+                    self.assertEqual(
+                        typed_astunparse.unparse(tree, cache=cache),
+                        typed_astunparse.unparse(tree))
+        self.assertLessEqual(len(cache), 64)
+        self.assertGreater(cache.hits, 0)
+
+        code = 'def spam(a: List[int]={1: 2.0}, b: List[int]={1: 2}) -> List[int]:\n' \
+            '    ham = {1: 2.0}\n    return (-0.0, 0.0, [1, True, 1.0])\n' \
+            'eggs: List[int] = {1: 2.0}\n'
+        tree = typed_ast.ast3.parse(code)
+        cache.clear()
+        self.assertEqual(
+            typed_astunparse.unparse(tree, cache=cache), typed_astunparse.unparse(tree))
+        self.assertEqual(cache.hits, 3)
+        self.assertEqual(cache.misses, 6)
+        with self.assertRaises(ValueError):
+            typed_astunparse.unparse(tree, iterative=True, cache=cache)
+        with self.assertRaises(ValueError):
+            typed_astunparse.UnparseCache(maxsize=0)
+
+    def test_incremental_unparse(self):
+        """Re-render only changed top-level statements and match complete unparse() results."""
+        code = 'import spam\n\ndef ham(eggs):\n    return eggs\n\nclass Bacon:\n    pass\n' \
+            'ham(spam.eggs)\n'
+        tree = typed_ast.ast3.parse(code)
+        unparser = typed_astunparse.IncrementalUnparser()
+        self.assertEqual(unparser.unparse(tree), typed_astunparse.unparse(tree))
+        self.assertEqual((unparser.rendered, unparser.reused), (4, 0))
+        for statement, (start, end) in zip(tree.body, unparser.spans):
+            self.assertEqual(unparser.code[start:end], typed_astunparse.unparse(statement)[:-1])
+
+        self.assertEqual(unparser.unparse(tree), typed_astunparse.unparse(tree))
+        self.assertEqual((unparser.rendered, unparser.reused), (0, 4))
+
+        tree.body[0] = typed_ast.ast3.parse('import eggs').body[0]  # replaced
+        tree.body[2].name = 'Spam'  # modified in place
+        tree.body[1].body[0].value.id = 'spam'  # modified in place, deeper
+        self.assertEqual(unparser.unparse(tree), typed_astunparse.unparse(tree))
+        self.assertEqual((unparser.rendered, unparser.reused), (3, 1))
+        tree.body[1].body[0].value.id = 'eggs'
+        self.assertEqual(unparser.unparse(tree, changed=[tree.body[1]]),
+                         typed_astunparse.unparse(tree))
+        self.assertEqual((unparser.rendered, unparser.reused), (1, 3))
+        self.assertEqual(unparser.unparse(tree, changed=[]), typed_astunparse.unparse(tree))
+        self.assertEqual((unparser.rendered, unparser.reused), (0, 4))
+
+        del tree.body[3]
+        tree.body.insert(0, typed_ast.ast3.parse('from __future__ import annotations').body[0])
+        self.assertEqual(unparser.unparse(tree), typed_astunparse.unparse(tree))
+        # key of ham() was not calculated when it was listed as changed
+        self.assertEqual((unparser.rendered, unparser.reused), (2, 2))
+        self.assertEqual(unparser.unparse(tree), typed_astunparse.unparse(tree))
+        self.assertEqual((unparser.rendered, unparser.reused), (0, 4))
+
+        for path in PATHS[:20]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                original_code = py_file.read()
+            try:
+                tree = typed_ast.ast3.parse(source=original_code, filename=path)
+            except SyntaxError:
+                continue
+            with self.subTest(path=path):
+                unparser = typed_astunparse.IncrementalUnparser(iterative=True)
+                unparser.unparse(tree)
+                tree.body.reverse()
+                self.assertEqual(unparser.unparse(tree), typed_astunparse.unparse(tree))
+                self.assertEqual(unparser.rendered, 0)
+        with self.assertRaises(TypeError):
+            unparser.unparse(tree.body[0])
+
+    def test_unparse_with_source_map(self):
+        """Map each unparsed node to the range of code created from it."""
+        code = 'def ham(eggs: int = 1):\n    return eggs + spam(bacon, [1, 2])\nx = {1: 2}\n'
+        tree = typed_ast.ast3.parse(code)
+        result, source_map = typed_astunparse.unparse_with_source_map(tree)
+        self.assertEqual(result, typed_astunparse.unparse(tree))
+        self.assertIsInstance(source_map.start, array.array)
+        self.assertIs(source_map.nodes[0], tree)
+        self.assertEqual(len(source_map), len(list(typed_ast.ast3.walk(tree))) - 7)
+        lines = result.splitlines(keepends=True)
+        for entry in source_map:
+            start = sum(len(line) for line in lines[:entry.start_line - 1]) + entry.start_col
+            end = sum(len(line) for line in lines[:entry.end_line - 1]) + entry.end_col
+            self.assertEqual((start, end), (entry.start, entry.end))
+        call = tree.body[0].body[0].value.right
+        entry = source_map.entry(call)
+        self.assertEqual(result[entry.start:entry.end], 'spam(bacon, [1, 2])')
+        self.assertEqual((entry.start_line, entry.start_col, entry.end_line, entry.end_col),
+                         (4, 19, 4, 38))
+        self.assertIs(source_map.node_at(4, 24), call.args[0])
+        self.assertIs(source_map.node_at(4, 19), call.func)
+        entry = source_map.entry(tree.body[1].value)
+        self.assertEqual(result[entry.start:entry.end], '{\n    1: 2,\n}')
+        self.assertIsNone(source_map.node_at(1, 0))
+
+        extra = typed_ast.ast3.parse('spam = 1').body[0]
+        typed_astunparse.SourceMapUnparser(extra, file=io.StringIO(), source_map=source_map)
+        self.assertIs(source_map.entry(extra).node, extra)
+        self.assertIs(source_map.entry(call).node, call)
+
+        for path in PATHS[:20]:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                original_code = py_file.read()
+            try:
+                tree = typed_ast.ast3.parse(source=original_code, filename=path)
+            except SyntaxError:
+                continue
+            with self.subTest(path=path):
+                result, source_map = typed_astunparse.unparse_with_source_map(tree)
+                self.assertEqual(result, typed_astunparse.unparse(tree))
+                for entry in source_map:
+                    if isinstance(entry.node, typed_ast.ast3.stmt):
+                        self.assertFalse(result[entry.start].isspace())
+
+    @unittest.skipIf(sys.version_info < (3, 8), 'type comments in ast require Python >= 3.8')
+    def test_native_unparser(self):
+        """Unparse trees created by built-in ast, including type comments, without typed_ast."""
+        code = ('def spam(ham, eggs=1, /, bacon=2, *, sausage):  # type: (...) -> None\n'
+                '    for x in ham:  # type: int\n'
+                '        if (y := x[1:2, 3]) or ham[x,]:\n'
+                '            print(u"spam", 1 .real)\n')
+        stream = io.StringIO()
+        typed_astunparse.NativeUnparser(ast.parse(code, type_comments=True), file=stream)
+        self.assertEqual(stream.getvalue(), '\n\n'
+                         'def spam(ham, eggs=1, /, bacon=2, *, sausage):\n'
+                         '    # type: (...) -> None\n'
+                         '    for x in ham:  # type: int\n'
+                         "        if ((y := x[1:2, 3]) or ham[x,]):\n"
+                         "            print(u'spam', 1 .real)\n")
+
+        for path in PATHS:
+            with open(path, 'r', encoding='utf-8') as py_file:
+                original_code = py_file.read()
+            try:
+                tree = ast.parse(source=original_code, filename=path, type_comments=True)
+            except SyntaxError:
+                continue
+            stream = io.StringIO()
+            typed_astunparse.NativeUnparser(tree, file=stream)
+            with self.subTest(path=path):
+                roundtrip_tree = ast.parse(source=stream.getvalue(), type_comments=True)
+                tree.type_ignores = []  # "# type: ignore" comments are not unparsed
+                self.assertEqual(ast.dump(tree), ast.dump(roundtrip_tree), msg=path)
+
+    def test_native_unparser_attributes(self):
+        """Separate attributes from integer literals on every version of built-in ast."""
+        for code, expected in (('(3).real', '3 .real'), ('(3.0).real', '3.0.real'),
+                               ('spam.ham', 'spam.ham')):
+            with self.subTest(code=code):
+                stream = io.StringIO()
+                typed_astunparse.NativeUnparser(ast.parse(code), file=stream)
+                self.assertEqual(stream.getvalue().strip(), expected)
+                ast.parse(stream.getvalue())
+
+    def test_unparse_without_typed_ast(self):
+        """Fall back to NativeUnparser if typed_ast is not installed."""
+        script = ('import ast, sys\n'
+                  'sys.modules["typed_ast"] = None\n'
+                  'import typed_astunparse\n'
+                  'print(typed_astunparse.unparse(ast.parse("spam = [ham]")).strip())\n'
+                  'print("".join(typed_astunparse.unparse_iter(ast.parse("eggs"))).strip())\n'
+                  'print("typed_astunparse.unparser" in sys.modules)\n')
+        output = subprocess.run(
+            [sys.executable, '-c', script], stdout=subprocess.PIPE, check=True,
+            universal_newlines=True).stdout
+        self.assertEqual(output.splitlines(), ['spam = [ham]', 'eggs', 'False'])
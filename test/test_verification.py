@@ -0,0 +1,75 @@
+"""Tested module: verification."""
+
+import pathlib
+import tempfile
+import unittest
+import unittest.mock
+
+import typed_astunparse
+from typed_astunparse import verification
+
+from .examples import PATHS
+
+
+class VerificationTests(unittest.TestCase):
+
+    """Unit tests for verify_code() and verify_files()."""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self._tmpdir.name)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_verify_code(self):
+        self.assertEqual(typed_astunparse.verify_code(b'spam = ham  # type: int\n'),
+                         ('passed', None))
+        self.assertEqual(
+            typed_astunparse.verify_code('# coding: latin-1\nx = "\xe9"\n'.encode('latin-1')),
+            ('passed', None))
+        status, message = typed_astunparse.verify_code(b'def\n')
+        self.assertEqual(status, 'error')
+        self.assertTrue(message.startswith('SyntaxError: '), msg=message)
+
+    def test_verify_code_failure(self):
+        with unittest.mock.patch.object(
+                typed_astunparse, 'unparse', lambda tree, iterative: 'SPAM(1)\n'):
+            self.assertEqual(typed_astunparse.verify_code(b'spam(1)\n'),
+                             ('failed', 'tree changed at tree.body[0].value.func.id'))
+        with unittest.mock.patch.object(
+                typed_astunparse, 'unparse', lambda tree, iterative: 'spam(1'):
+            self.assertEqual(typed_astunparse.verify_code(b'spam(1)\n')[0], 'failed')
+
+    def test_verify_files(self):
+        paths = [pathlib.Path(path) for path in PATHS[:12]] + [self.root.joinpath('missing.py')]
+        cache = self.root.joinpath('cache.sqlite')
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = list(typed_astunparse.verify_files(paths, workers, 2, cache=cache))
+                self.assertEqual([result[0] for result in results], paths)
+                self.assertEqual(results[-1][1], 'error')
+                self.assertFalse(any(cached for _, _, _, cached in results))
+                cache.unlink()
+        results = list(typed_astunparse.verify_files(paths, 1, cache=cache))
+        with unittest.mock.patch.object(verification, 'verify_code') as verify_code:
+            cached_results = list(typed_astunparse.verify_files(paths, 1, cache=cache))
+            verify_code.assert_not_called()
+        self.assertEqual([result[:3] for result in cached_results],
+                         [result[:3] for result in results])
+        self.assertEqual([result[3] for result in cached_results], [True] * 12 + [False])
+
+    def test_cache_keyed_by_contents(self):
+        path = self.root.joinpath('spam.py')
+        cache = self.root.joinpath('cache.sqlite')
+        path.write_text('spam = 1\n')
+        self.assertEqual(list(typed_astunparse.verify_files([path], cache=cache)),
+                         [(path, 'passed', None, False)])
+        self.assertTrue(list(typed_astunparse.verify_files([path], cache=cache))[0][3])
+        path.write_text('spam =\n')
+        self.assertEqual(list(typed_astunparse.verify_files([path], cache=cache))[0][1:4:2],
+                         ('error', False))
+        self.assertEqual(list(typed_astunparse.verify_files([path], cache=cache))[0][1:4:2],
+                         ('error', True))
+        self.assertFalse(list(typed_astunparse.verify_files(
+            [path], cache=cache, iterative=True))[0][3])
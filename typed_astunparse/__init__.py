@@ -1,41 +1,271 @@
 """This is "__init__.py" file for "typed_astunparse" package.
 
-functions: unparse, dump
+functions: unparse, unparse_iter, unparse_to, unparse_bytes, unparse_async, unparse_many,
+    unparse_with_source_map, dump, load, dump_binary, load_binary, equal, find_difference,
+    fingerprint, to_ast, to_typed_ast, verify_code, verify_files
+classes: Unparser, NativeUnparser, IterativeUnparser, CachingUnparser, UnparseCache,
+    DiskUnparseCache, IncrementalUnparser, SourceMap, SourceMapUnparser, Printer, Profile,
+    ProfilingUnparser, ProfilingPrinter, OutputBuffer, PrecedenceUnparser, CompactUnparser
+
+Submodules, and dependencies like typed_ast, astunparse and version_query, are imported
+only when needed, i.e. when one of the classes or functions defined in them is first used.
+If typed_ast is not installed, unparsing falls back to NativeUnparser, which handles trees
+created by built-in ast module.
 """
 
-import ast
+import errno
+import importlib
+import sys
 import typing as t
 
-import typed_ast.ast3
-from six.moves import cStringIO
+if t.TYPE_CHECKING:
+    import ast  # noqa: F401
+    import typed_ast.ast3  # noqa: F401
+    from .cache import UnparseCache  # noqa: F401
+    from .disk_cache import DiskUnparseCache  # noqa: F401
+
+# unparse_bytes() writes to the file only when at least this many bytes are encoded
+_WRITE_SIZE = 64 * 1024
+
+# name of an attribute of the package -> (module containing it, name in that module)
+_LAZY_ATTRIBUTES = {
+    'Unparser': ('.unparser', 'Unparser'),
+    'NativeUnparser': ('.native_unparser', 'NativeUnparser'),
+    'IterativeUnparser': ('.iterative_unparser', 'IterativeUnparser'),
+    'UnparseCache': ('.cache', 'UnparseCache'),
+    'CachingUnparser': ('.cache', 'CachingUnparser'),
+    'DiskUnparseCache': ('.disk_cache', 'DiskUnparseCache'),
+    'IncrementalUnparser': ('.incremental', 'IncrementalUnparser'),
+    'SourceMap': ('.source_map', 'SourceMap'),
+    'SourceMapUnparser': ('.source_map', 'SourceMapUnparser'),
+    'unparse_with_source_map': ('.source_map', 'unparse_with_source_map'),
+    'Printer': ('.printer', 'Printer'),
+    'Profile': ('.profiling', 'Profile'),
+    'ProfilingUnparser': ('.profiling', 'ProfilingUnparser'),
+    'ProfilingPrinter': ('.profiling', 'ProfilingPrinter'),
+    'OutputBuffer': ('.output', 'OutputBuffer'),
+    'PrecedenceUnparser': ('.precedence', 'PrecedenceUnparser'),
+    'CompactUnparser': ('.compact', 'CompactUnparser'),
+    'unparse_many': ('.batch', 'unparse_many'),
+    'unparse_async': ('.asynchronous', 'unparse_async'),
+    'dump_binary': ('.binary', 'dump_binary'),
+    'load_binary': ('.binary', 'load_binary'),
+    'load': ('.loader', 'load'),
+    'equal': ('.comparison', 'equal'),
+    'find_difference': ('.comparison', 'find_difference'),
+    'fingerprint': ('.fingerprint', 'fingerprint'),
+    'to_ast': ('.conversion', 'to_ast'),
+    'to_typed_ast': ('.conversion', 'to_typed_ast'),
+    'verify_code': ('.verification', 'verify_code'),
+    'verify_files': ('.verification', 'verify_files'),
+    'VERSION': ('._version', 'VERSION'),
+    '__version__': ('._version', 'VERSION')}
+
 
-from .unparser import Unparser
-from .printer import Printer
-from ._version import VERSION
+def __getattr__(name: str):
+    """Import the submodule defining the requested attribute, and remember the attribute."""
+    try:
+        module_name, attribute_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError('module {} has no attribute {}'.format(repr(__name__), repr(name)))
+    value = getattr(importlib.import_module(module_name, __name__), attribute_name)
+    globals()[name] = value
+    return value
 
-__version__ = VERSION
 
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
-def unparse(tree: t.Union[ast.AST, typed_ast.ast3.AST]) -> str:
+
+def _default_unparser() -> type:
+    """Return Unparser, or NativeUnparser if typed_ast is not installed."""
+    try:
+        from .unparser import Unparser
+    except ImportError as err:
+        if not err.name or err.name.partition('.')[0] != 'typed_ast':
+            raise
+        from .native_unparser import NativeUnparser
+        return NativeUnparser
+    return Unparser
+
+
+def unparse(
+        tree: 't.Union[ast.AST, typed_ast.ast3.AST]', iterative: bool = False,
+        cache: 't.Optional[UnparseCache]' = None,
+        disk_cache: 't.Optional[DiskUnparseCache]' = None,
+        minimal_parentheses: bool = False, compact: bool = False) -> str:
     """Unparse the abstract syntax tree into a str.
 
     Behave just like astunparse.unparse(tree), but handle trees which are typed, untyped, or mixed.
     In other words, a mixture of ast.AST-based and typed_ast.ast3-based nodes will be unparsed.
+
+    If iterative is True, use IterativeUnparser, which gives the same result but is not limited
+    by the recursion limit, and therefore can handle arbitrarily deep trees.
+
+    If cache is given, use CachingUnparser to reuse code of structurally identical expressions.
+
+    If disk_cache is given, look up code of the whole tree in it first, and store it there
+    after unparsing. Trees too deep to compute their key are unparsed without the disk cache.
+
+    If minimal_parentheses is True, use PrecedenceUnparser, which writes only parentheses
+    required by operator precedence. It cannot be combined with iterative or cache.
+
+    If compact is True, use CompactUnparser, which additionally minimizes indentation
+    and whitespace, and joins simple statements using ";". It cannot be combined with
+    iterative or cache either.
     """
-    stream = cStringIO()
-    Unparser(tree, file=stream)
+    if disk_cache is not None:
+        options = 'compact' if compact else 'minimal_parentheses' if minimal_parentheses else ''
+        try:
+            key = disk_cache.key(tree, options)
+        except RecursionError:
+            return unparse(tree, iterative, cache, None, minimal_parentheses, compact)
+        code = disk_cache.get(key)
+        if code is None:
+            code = unparse(tree, iterative, cache, None, minimal_parentheses, compact)
+            disk_cache.put(key, code)
+        return code
+    from .output import OutputBuffer
+    stream = OutputBuffer()
+    if minimal_parentheses or compact:
+        if iterative or cache is not None:
+            raise ValueError('minimal parentheses and compact mode cannot be used together'
+                             ' with iterative unparsing or cache')
+        if compact:
+            from .compact import CompactUnparser
+            CompactUnparser(tree, file=stream)
+        else:
+            from .precedence import PrecedenceUnparser
+            PrecedenceUnparser(tree, file=stream)
+    elif cache is not None:
+        if iterative:
+            raise ValueError('cache cannot be used together with iterative unparsing')
+        from .cache import CachingUnparser
+        CachingUnparser(tree, file=stream, cache=cache)
+    elif iterative:
+        from .iterative_unparser import IterativeUnparser
+        IterativeUnparser(tree, file=stream)
+    else:
+        _default_unparser()(tree, file=stream)
     return stream.getvalue()
 
 
+def unparse_iter(
+        tree: 't.Union[ast.AST, typed_ast.ast3.AST]', iterative: bool = False) -> t.Iterator[str]:
+    """Unparse the abstract syntax tree into a sequence of str chunks.
+
+    Concatenation of all chunks is equal to unparse(tree). If the tree is a module, there is
+    one chunk per top-level statement, therefore the whole output is never held in memory at once.
+    """
+    import ast
+    from .output import OutputBuffer
+    typed_ast3 = sys.modules.get('typed_ast.ast3')  # if not imported, there are no such nodes
+    if isinstance(tree, (ast.Module, ast.Interactive)) or typed_ast3 is not None \
+            and isinstance(tree, (typed_ast3.Module, typed_ast3.Interactive)):
+        trees = tree.body
+    else:
+        trees = [tree]
+    stream = OutputBuffer()
+    if iterative:
+        from .iterative_unparser import IterativeUnparser as unparser_class
+    else:
+        unparser_class = _default_unparser()
+    unparser = unparser_class([], file=stream)
+    stream.clear()
+    for tree_ in trees:
+        unparser.dispatch(tree_)
+        yield stream.getvalue()
+        stream.clear()
+    yield '\n'
+
+
+def unparse_to(
+        tree: 't.Union[ast.AST, typed_ast.ast3.AST]', file: t.TextIO,
+        iterative: bool = False) -> None:
+    """Unparse the abstract syntax tree, writing the code to a file chunk by chunk.
+
+    See unparse_iter() for details.
+    """
+    for chunk in unparse_iter(tree, iterative=iterative):
+        file.write(chunk)
+
+
+def unparse_bytes(
+        tree: 't.Union[ast.AST, typed_ast.ast3.AST]', file: t.Optional[t.BinaryIO] = None,
+        iterative: bool = False, encoding: str = 'utf-8',
+        errors: str = 'strict') -> t.Optional[bytes]:
+    """Unparse the abstract syntax tree into encoded code.
+
+    The code is encoded chunk by chunk, as it is unparsed (see unparse_iter()), therefore
+    the whole code is never held in memory as a str. If file is given, the encoded code is
+    written to it in writes of at least 64 KiB (except the last one), which is efficient also
+    for unbuffered files and pipes, and None is returned. Otherwise, the code is returned.
+
+    The file must be blocking: write() is expected to return the number of bytes written.
+    """
+    import codecs
+    encode = codecs.getincrementalencoder(encoding)(errors).encode
+    pending = []  # type: t.List[bytes]
+    pending_size = 0
+    for chunk in unparse_iter(tree, iterative=iterative):
+        data = encode(chunk)
+        pending.append(data)
+        pending_size += len(data)
+        if file is not None and pending_size >= _WRITE_SIZE:
+            _write_all(file, b''.join(pending))
+            pending.clear()
+            pending_size = 0
+    pending.append(encode('', True))
+    if file is None:
+        return b''.join(pending)
+    _write_all(file, b''.join(pending))
+    return None
+
+
+def _write_all(file: t.BinaryIO, data: bytes) -> None:
+    """Write all data, even if the file is unbuffered and writes only a part at a time.
+
+    Raise BlockingIOError if the file is non-blocking and not ready, i.e. if write() returns None.
+    """
+    view = memoryview(data)
+    written = 0
+    while written < len(view):
+        count = file.write(view[written:])
+        if count is None:
+            raise BlockingIOError(
+                errno.EAGAIN, 'file is not ready for writing, {} of {} bytes written'.format(
+                    written, len(view)), written)
+        written += count
+
+
 def dump(
-        tree: t.Union[ast.AST, typed_ast.ast3.AST], annotate_fields: bool = True,
-        include_attributes: bool = False) -> str:
-    """Behave just like astunparse.dump(tree), but handle typed_ast.ast3-based trees."""
-    stream = cStringIO()
+        tree: 't.Union[ast.AST, typed_ast.ast3.AST]', annotate_fields: bool = True,
+        include_attributes: bool = False, compact: bool = False) -> str:
+    """Behave just like astunparse.dump(tree), but handle typed_ast.ast3-based trees.
+
+    If compact is True, print the tree in one line without indentation, like ast.dump(tree)
+    -- this is several times faster.
+    """
+    from .printer import Printer, compact_dump
+    if compact:
+        return compact_dump(tree, annotate_fields, include_attributes)
+    from .output import OutputBuffer
+    stream = OutputBuffer()
     Printer(
         file=stream, annotate_fields=annotate_fields,
         include_attributes=include_attributes).visit(tree)
     return stream.getvalue()
 
 
-__all__ = ['unparse', 'dump']
+__all__ = [
+    'Unparser', 'NativeUnparser', 'IterativeUnparser', 'CachingUnparser', 'UnparseCache',
+    'DiskUnparseCache', 'IncrementalUnparser', 'SourceMap', 'SourceMapUnparser', 'Printer',
+    'Profile', 'ProfilingUnparser', 'ProfilingPrinter', 'OutputBuffer', 'PrecedenceUnparser',
+    'CompactUnparser',
+    'unparse', 'unparse_iter', 'unparse_to', 'unparse_bytes', 'unparse_async', 'unparse_many',
+    'unparse_with_source_map', 'dump', 'load', 'dump_binary', 'load_binary', 'equal',
+    'find_difference', 'fingerprint', 'to_ast', 'to_typed_ast', 'verify_code', 'verify_files']
+
+if sys.version_info < (3, 7):  # module __getattr__ is not supported, so import everything now
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
@@ -0,0 +1,126 @@
+"""Command-line interface of typed_astunparse: roundtrip Python files through typed_ast.ast3."""
+
+import argparse
+import json
+import os
+import pathlib
+import sys
+import time
+import typing as t
+
+from .batch import roundtrip_files
+from .verification import verify_files
+
+
+def _collect_paths(
+        paths: t.Sequence[pathlib.Path],
+        output_dir: t.Optional[pathlib.Path]) -> t.List[t.Tuple[pathlib.Path, pathlib.Path]]:
+    """Find Python files and decide where to write each of them.
+
+    Files in given directories are found recursively, and their path relative to the given
+    directory is preserved in the output directory.
+    """
+    pairs = []
+    for path in paths:
+        if path.is_dir():
+            for file_path in sorted(path.rglob('*.py')):
+                output_path = file_path if output_dir is None \
+                    else output_dir.joinpath(file_path.relative_to(path))
+                pairs.append((file_path, output_path))
+        else:
+            output_path = path if output_dir is None else output_dir.joinpath(path.name)
+            pairs.append((path, output_path))
+    return pairs
+
+
+def _verify(paths: t.List[pathlib.Path], parsed_args: argparse.Namespace) -> int:
+    """Verify the roundtrip of given files, report the results and return the exit code."""
+    counts = {'passed': 0, 'failed': 0, 'error': 0}
+    cached_count = 0
+    failures = []
+    start = time.perf_counter()
+    for path, status, message, cached in verify_files(
+            paths, parsed_args.jobs, parsed_args.chunksize, parsed_args.iterative,
+            parsed_args.cache):
+        counts[status] += 1
+        cached_count += cached
+        if status != 'passed':
+            failures.append({'path': str(path), 'status': status, 'message': message})
+            print('{}: {}: {}'.format(path, status, message), file=sys.stderr)
+        elif not parsed_args.quiet:
+            print('{}: passed{}'.format(path, ' (cached)' if cached else ''))
+    duration = time.perf_counter() - start
+    if parsed_args.report is not None:
+        from ._version import VERSION
+        with parsed_args.report.open('w') as report_file:
+            json.dump({
+                'version': VERSION, 'files': len(paths), 'passed': counts['passed'],
+                'failed': counts['failed'], 'errors': counts['error'], 'cached': cached_count,
+                'seconds': duration, 'failures': failures}, report_file, indent=2)
+    if not parsed_args.quiet:
+        print('{} files ({} failed, {} not parsed, {} cached) in {:.4f}s using {} jobs'.format(
+            len(paths), counts['failed'], counts['error'], cached_count, duration,
+            parsed_args.jobs))
+    return 1 if failures else 0
+
+
+def main(args: t.Optional[t.Sequence[str]] = None) -> int:
+    """Parse and unparse given files and directories in parallel."""
+    parser = argparse.ArgumentParser(
+        prog='python -m typed_astunparse',
+        description='Normalize Python files by parsing them using typed_ast.ast3 and unparsing'
+        ' them using typed_astunparse, in parallel on all CPU cores, or verify that such'
+        ' roundtrip preserves their syntax trees.')
+    parser.add_argument(
+        'paths', metavar='path', type=pathlib.Path, nargs='+',
+        help='Python file, or directory that will be searched recursively for *.py files')
+    parser.add_argument(
+        '-o', '--output-dir', type=pathlib.Path, default=None,
+        help='write results to this directory instead of overwriting the input files')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count() or 1,
+        help='number of worker processes (default: number of CPU cores, %(default)s)')
+    parser.add_argument(
+        '--chunksize', type=int, default=4, help='number of files sent to a worker at once')
+    parser.add_argument(
+        '--iterative', action='store_true', help='use IterativeUnparser to handle very deep code')
+    parser.add_argument(
+        '--verify', action='store_true',
+        help='instead of writing files, check that parsing the unparsed code gives the same tree')
+    parser.add_argument(
+        '--cache', type=pathlib.Path, default=None,
+        help='with --verify, store results in this database file and reuse them for files'
+        ' with unchanged contents')
+    parser.add_argument(
+        '--report', type=pathlib.Path, default=None,
+        help='with --verify, write a JSON report of the results, listing all failures')
+    parser.add_argument(
+        '-q', '--quiet', action='store_true', help='do not report per-file timing')
+    parsed_args = parser.parse_args(args)
+    if parsed_args.jobs < 1 or parsed_args.chunksize < 1:
+        parser.error('number of jobs and chunk size must be positive')
+    if parsed_args.verify and parsed_args.output_dir is not None:
+        parser.error('output directory cannot be used with --verify')
+    if not parsed_args.verify and (parsed_args.cache or parsed_args.report):
+        parser.error('cache and report can be used only with --verify')
+
+    paths = _collect_paths(parsed_args.paths, parsed_args.output_dir)
+    if parsed_args.verify:
+        return _verify([path for path, _ in paths], parsed_args)
+    failures = 0
+    start = time.perf_counter()
+    for path, error, parse_time, unparse_time in roundtrip_files(
+            paths, parsed_args.jobs, parsed_args.chunksize, parsed_args.iterative):
+        if error is not None:
+            failures += 1
+            print('{}: failed: {}'.format(path, error), file=sys.stderr)
+        elif not parsed_args.quiet:
+            print('{}: parse {:.4f}s, unparse {:.4f}s'.format(path, parse_time, unparse_time))
+    if not parsed_args.quiet:
+        print('{} files ({} failed) in {:.4f}s using {} jobs'.format(
+            len(paths), failures, time.perf_counter() - start, parsed_args.jobs))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Function: unparse_async."""
+
+import asyncio
+import codecs
+import typing as t
+
+if t.TYPE_CHECKING:
+    import ast  # noqa: F401
+    import typed_ast.ast3  # noqa: F401
+
+
+def _iterative_chunks(unparser_class: type, tree, nodes_per_step: int) -> t.Iterator[str]:
+    """Unparse the tree using IterativeUnparser, yielding code created in each step."""
+    from .output import OutputBuffer
+    stream = OutputBuffer()
+    unparser = unparser_class([], file=stream)
+    stream.clear()
+    for _ in unparser._dispatch_steps(tree, nodes_per_step):
+        yield stream.getvalue()
+        stream.clear()
+    stream.write('\n')
+    yield stream.getvalue()
+
+
+async def unparse_async(
+        tree: 't.Union[ast.AST, typed_ast.ast3.AST]', writer: t.Any, nodes_per_step: int = 1000,
+        encoding: str = 'utf-8') -> None:
+    """Unparse the abstract syntax tree into an asyncio stream writer, without blocking the loop.
+
+    The tree is unparsed by IterativeUnparser in steps of nodes_per_step nodes. After each step,
+    the code created so far is encoded and written to the writer, writer.drain() is awaited
+    to respect flow control, and control is given back to the event loop. The encoded code is
+    the same as unparse(tree).encode(encoding).
+
+    If typed_ast is not installed, the tree is unparsed by NativeUnparser, and steps are
+    top-level statements, like in unparse_iter().
+
+    The writer can be asyncio.StreamWriter or any object with write(bytes) and drain() methods.
+    If the task is cancelled, unparsing stops at the next step, and the writer is left
+    with the code written until then.
+    """
+    if nodes_per_step < 1:
+        raise ValueError('nodes_per_step={} must be positive'.format(nodes_per_step))
+    try:
+        from .iterative_unparser import IterativeUnparser
+    except ImportError as err:
+        if not err.name or err.name.partition('.')[0] != 'typed_ast':
+            raise
+        from . import unparse_iter
+        chunks = unparse_iter(tree)
+    else:
+        chunks = _iterative_chunks(IterativeUnparser, tree, nodes_per_step)
+    encode = codecs.getincrementalencoder(encoding)().encode
+    for code in chunks:
+        if code:
+            writer.write(encode(code))
+            await writer.drain()
+        await asyncio.sleep(0)  # drain() returns without suspending unless the buffer is full
+    data = encode('', True)
+    if data:
+        writer.write(data)
+        await writer.drain()
@@ -0,0 +1,139 @@
+"""Functions: unparse_many, roundtrip_files."""
+
+import ast
+import concurrent.futures
+import itertools
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+import tokenize
+import typing as t
+
+import typed_ast.ast3
+
+Tree = t.Union[ast.AST, typed_ast.ast3.AST]
+
+_SHARED_BATCHES = {}  # type: t.Dict[int, t.List[Tree]]
+
+_BATCH_IDS = itertools.count()
+
+# forking a process that used system frameworks is unsafe on macOS
+_CAN_FORK = 'fork' in multiprocessing.get_all_start_methods() and sys.platform != 'darwin'
+
+
+def _unparse_trees(trees: t.Sequence[Tree], iterative: bool) -> t.List[str]:
+    from . import unparse
+    return [unparse(tree, iterative=iterative) for tree in trees]
+
+
+def _unparse_shared_trees(batch_id: int, start: int, stop: int, iterative: bool) -> t.List[str]:
+    """Unparse a range of trees inherited from the parent process when it was forked."""
+    return _unparse_trees(_SHARED_BATCHES[batch_id][start:stop], iterative)
+
+
+def unparse_many(
+        trees: t.Iterable[t.Union[Tree, t.Tuple[t.Any, Tree]]], workers: t.Optional[int] = None,
+        chunksize: int = 16, iterative: bool = False) -> t.List[t.Union[str, t.Tuple[t.Any, str]]]:
+    """Unparse many independent trees using a pool of processes.
+
+    Each item can be either a tree, or a (path, tree) pair. Results are returned in input order,
+    either as code, or as (path, code) pairs, respectively.
+
+    By default, as many workers as there are CPU cores are used. Trees are sent to workers in
+    chunks of given size. If there is only one worker, or only one chunk, unparsing happens
+    in the current process.
+
+    Pickling typed_ast.ast3 trees is several times slower than unparsing them, therefore
+    on platforms where the "fork" start method is safe the trees are not pickled at all:
+    the workers are forked after the trees are stored, and only ranges of indices are sent
+    to them. Elsewhere, including macOS, trees are pickled in chunks.
+    """
+    items = list(trees)
+    keys = [item[0] if isinstance(item, tuple) else None for item in items]
+    trees_ = [item[1] if isinstance(item, tuple) else item for item in items]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or chunksize < 1:
+        raise ValueError('workers={} and chunksize={} must be positive'.format(workers, chunksize))
+
+    if workers == 1 or len(trees_) <= chunksize:
+        codes = _unparse_trees(trees_, iterative)
+    elif _CAN_FORK:
+        batch_id = next(_BATCH_IDS)
+        _SHARED_BATCHES[batch_id] = trees_
+        try:
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                chunks = pool.starmap(
+                    _unparse_shared_trees,
+                    [(batch_id, start, start + chunksize, iterative)
+                     for start in range(0, len(trees_), chunksize)])
+            codes = list(itertools.chain.from_iterable(chunks))
+        finally:
+            del _SHARED_BATCHES[batch_id]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            chunks = executor.map(
+                _unparse_trees,
+                [trees_[start:start + chunksize] for start in range(0, len(trees_), chunksize)],
+                itertools.repeat(iterative))
+            codes = list(itertools.chain.from_iterable(chunks))
+
+    return [(key, code) if isinstance(item, tuple) else code
+            for item, key, code in zip(items, keys, codes)]
+
+
+def _roundtrip_file(
+        path: pathlib.Path, output_path: pathlib.Path,
+        iterative: bool) -> t.Tuple[pathlib.Path, t.Optional[str], float, float]:
+    """Parse and unparse one file.
+
+    The file is read in its declared encoding, but written in UTF-8, because unparsing drops
+    comments, including the encoding declaration.
+
+    Return path, error message (or None), parsing time and unparsing time.
+    """
+    from . import unparse
+    try:
+        with path.open('rb') as py_file:
+            encoding, _ = tokenize.detect_encoding(py_file.readline)
+        code = path.read_text(encoding=encoding)
+        start = time.perf_counter()
+        tree = typed_ast.ast3.parse(source=code, filename=str(path))
+        parsed = time.perf_counter()
+        code = unparse(tree, iterative=iterative)
+        unparsed = time.perf_counter()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(code, encoding='utf-8')
+    except (OSError, SyntaxError, UnicodeDecodeError, RecursionError) as err:
+        return path, '{}: {}'.format(type(err).__name__, err), 0.0, 0.0
+    return path, None, parsed - start, unparsed - parsed
+
+
+def roundtrip_files(
+        paths: t.Iterable[t.Tuple[pathlib.Path, pathlib.Path]], workers: t.Optional[int] = None,
+        chunksize: int = 4, iterative: bool = False
+        ) -> t.Iterator[t.Tuple[pathlib.Path, t.Optional[str], float, float]]:
+    """Parse, unparse and write many files using a pool of processes.
+
+    Each item of paths is an (input path, output path) pair, and they may be the same path.
+    Each file is handled in one worker from start to end, so only paths and timings are sent
+    between processes.
+
+    Yield (path, error, parsing time, unparsing time) tuples in input order, as they are ready.
+    Error is None if the file was processed successfully.
+    """
+    paths = list(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or chunksize < 1:
+        raise ValueError('workers={} and chunksize={} must be positive'.format(workers, chunksize))
+    if workers == 1 or len(paths) <= chunksize:
+        for path, output_path in paths:
+            yield _roundtrip_file(path, output_path, iterative)
+        return
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(
+            _roundtrip_file, [path for path, _ in paths], [path for _, path in paths],
+            itertools.repeat(iterative), chunksize=chunksize)
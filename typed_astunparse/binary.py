@@ -0,0 +1,258 @@
+"""Functions: dump_binary, load_binary.
+
+Binary format of a tree, all integers being unsigned LEB128 varints unless noted:
+
+- magic bytes b'TASTB' and format version byte
+- string table: number of strings, then each string as length and UTF-8 bytes
+- node type table: number of node types, then for each: module (0 for typed_ast.ast3,
+  1 for ast), class name, number of fields and names of fields (as indices in string table)
+- the tree, as a tagged value
+
+Tagged value is a tag byte followed by: nothing for None, False, True, Ellipsis and a missing
+field; zigzag-encoded varint for int; IEEE 754 little-endian double for float, and two for
+complex; string table index for str; length and raw bytes for bytes; length and tagged values
+for list; node type index and tagged values of all fields for node.
+"""
+
+import ast
+import struct
+import typing as t
+
+import typed_ast.ast3
+
+_MAGIC = b'TASTB'
+
+_VERSION = 1
+
+_MODULES = (typed_ast.ast3, ast)
+
+(_NONE, _FALSE, _TRUE, _INT, _FLOAT, _COMPLEX, _STR, _BYTES, _LIST, _NODE, _ELLIPSIS,
+ _MISSING_FIELD) = range(12)
+
+_MISSING = object()
+
+_DOUBLE = struct.Struct('<d')
+
+_COMPLEX_STRUCT = struct.Struct('<dd')
+
+
+def _write_varint(output: bytearray, number: int) -> None:
+    while number > 0x7f:
+        output.append(number & 0x7f | 0x80)
+        number >>= 7
+    output.append(number)
+
+
+def dump_binary(
+        tree: t.Union[ast.AST, typed_ast.ast3.AST], include_attributes: bool = True) -> bytes:
+    """Serialize the tree into a compact binary form, which can be loaded with load_binary().
+
+    Node types and strings are stored once in tables and referred to by indices.
+    Attributes like lineno are stored only if include_attributes is True.
+    """
+    # tables are kept in lists, because order of dicts is arbitrary before Python 3.7
+    strings = {}  # type: t.Dict[str, int]
+    strings_list = []  # type: t.List[str]
+    node_types = {}  # type: t.Dict[type, t.Tuple[int, t.Tuple[str, ...]]]
+    node_types_list = []  # type: t.List[type]
+    body = bytearray()
+    append = body.append
+
+    def intern(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings_list)
+            strings_list.append(text)
+        return index
+
+    def node_type(class_: type) -> t.Tuple[int, t.Tuple[str, ...]]:
+        fields = class_._fields + (class_._attributes if include_attributes else ())
+        node_types[class_] = len(node_types_list), fields
+        node_types_list.append(class_)
+        intern(class_.__name__)
+        for field in fields:
+            intern(field)
+        return node_types[class_]
+
+    def write(value) -> None:
+        class_ = value.__class__
+        if class_ is str:
+            append(_STR)
+            index = strings.get(value)
+            if index is None:
+                index = strings[value] = len(strings_list)
+                strings_list.append(value)
+            _write_varint(body, index)
+        elif class_ is list:
+            append(_LIST)
+            _write_varint(body, len(value))
+            for item in value:
+                write(item)
+        elif value is None:
+            append(_NONE)
+        elif class_ is bool:
+            append(_TRUE if value else _FALSE)
+        elif class_ is int:
+            append(_INT)
+            _write_varint(body, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif class_ is float:
+            append(_FLOAT)
+            body.extend(_DOUBLE.pack(value))
+        elif class_ is complex:
+            append(_COMPLEX)
+            body.extend(_COMPLEX_STRUCT.pack(value.real, value.imag))
+        elif class_ is bytes:
+            append(_BYTES)
+            _write_varint(body, len(value))
+            body.extend(value)
+        elif value is Ellipsis:
+            append(_ELLIPSIS)
+        elif isinstance(value, (ast.AST, typed_ast.ast3.AST)):
+            index, fields = node_types.get(class_) or node_type(class_)
+            append(_NODE)
+            _write_varint(body, index)
+            for field in fields:
+                field_value = getattr(value, field, _MISSING)
+                if field_value is _MISSING:
+                    append(_MISSING_FIELD)
+                else:
+                    write(field_value)
+        else:
+            raise TypeError('cannot serialize {} of type {}'.format(repr(value), class_.__name__))
+
+    write(tree)
+
+    output = bytearray(_MAGIC)
+    output.append(_VERSION)
+    _write_varint(output, len(strings_list))
+    for text in strings_list:
+        encoded = text.encode('utf-8', 'surrogatepass')
+        _write_varint(output, len(encoded))
+        output.extend(encoded)
+    _write_varint(output, len(node_types_list))
+    for class_ in node_types_list:
+        _, fields = node_types[class_]
+        output.append(0 if issubclass(class_, typed_ast.ast3.AST) else 1)
+        _write_varint(output, strings[class_.__name__])
+        _write_varint(output, len(fields))
+        for field in fields:
+            _write_varint(output, strings[field])
+    output.extend(body)
+    return bytes(output)
+
+
+def load_binary(data) -> t.Union[ast.AST, typed_ast.ast3.AST]:
+    """Deserialize a tree created by dump_binary().
+
+    The data can be any bytes-like object, for example bytes or a memory-mapped file (mmap).
+    It is read in place, without copying it as a whole.
+    """
+    with memoryview(data) as view:
+        return _load(view)
+
+
+def _load(view: memoryview):
+    if bytes(view[:len(_MAGIC)]) != _MAGIC:
+        raise ValueError('not a binary dump of a tree')
+    if view[len(_MAGIC)] != _VERSION:
+        raise ValueError('unsupported binary dump version {}'.format(view[len(_MAGIC)]))
+    position = len(_MAGIC) + 1
+
+    def read_varint() -> int:
+        nonlocal position
+        byte = view[position]
+        position += 1
+        if byte < 0x80:
+            return byte
+        number = byte & 0x7f
+        shift = 7
+        while True:
+            byte = view[position]
+            position += 1
+            number |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return number
+            shift += 7
+
+    strings = []
+    for _ in range(read_varint()):
+        length = read_varint()
+        strings.append(str(view[position:position + length], 'utf-8', 'surrogatepass'))
+        position += length
+    # node class, whether the fields are in order expected by the constructor, their number,
+    # and names of all stored fields
+    node_types = []  # type: t.List[t.Tuple[type, bool, int, t.Tuple[str, ...]]]
+    for _ in range(read_varint()):
+        module = _MODULES[view[position]]
+        position += 1
+        class_ = getattr(module, strings[read_varint()])
+        fields = tuple(strings[read_varint()] for _ in range(read_varint()))
+        fields_count = len(class_._fields)
+        node_types.append((
+            class_, fields[:fields_count] == class_._fields, fields_count, fields))
+
+    def read_node():
+        class_, in_order, fields_count, fields = node_types[read_varint()]
+        values = read_values(len(fields))
+        if in_order and _MISSING not in values:
+            node = class_(*values[:fields_count])
+            for field, value in zip(fields[fields_count:], values[fields_count:]):
+                setattr(node, field, value)
+            return node
+        node = class_()
+        for field, value in zip(fields, values):
+            if value is not _MISSING:
+                setattr(node, field, value)
+        return node
+
+    def read_values(count: int) -> list:
+        """Read given number of tagged values."""
+        nonlocal position
+        values = []
+        append = values.append
+        for _ in range(count):
+            tag = view[position]
+            position += 1
+            if tag == _NODE:
+                append(read_node())
+            elif tag == _STR:
+                index = view[position]
+                if index < 0x80:
+                    position += 1
+                else:
+                    index = read_varint()
+                append(strings[index])
+            elif tag == _INT:
+                number = view[position]
+                if number < 0x80:
+                    position += 1
+                else:
+                    number = read_varint()
+                append(-((number + 1) >> 1) if number & 1 else number >> 1)
+            elif tag == _NONE:
+                append(None)
+            elif tag == _LIST:
+                append(read_values(read_varint()))
+            elif tag == _FALSE:
+                append(False)
+            elif tag == _TRUE:
+                append(True)
+            elif tag == _FLOAT:
+                append(_DOUBLE.unpack_from(view, position)[0])
+                position += 8
+            elif tag == _COMPLEX:
+                append(complex(*_COMPLEX_STRUCT.unpack_from(view, position)))
+                position += 16
+            elif tag == _BYTES:
+                length = read_varint()
+                append(bytes(view[position:position + length]))
+                position += length
+            elif tag == _ELLIPSIS:
+                append(Ellipsis)
+            elif tag == _MISSING_FIELD:
+                append(_MISSING)
+            else:
+                raise ValueError('invalid tag {} at offset {}'.format(tag, position - 1))
+        return values
+
+    return read_values(1)[0]
@@ -0,0 +1,161 @@
+"""Classes: UnparseCache, CachingUnparser."""
+
+import ast
+import collections
+import sys
+import typing as t
+
+import typed_ast.ast3
+
+from .output import OutputBuffer
+from .unparser import Unparser
+
+_AST = (ast.AST, typed_ast.ast3.AST)
+
+_EXPR = (ast.expr, typed_ast.ast3.expr)
+
+# expressions that are written in one step, and therefore are never worth caching
+_LEAVES = frozenset(
+    getattr(module, name) for module in (ast, typed_ast.ast3)
+    for name in ('Name', 'Num', 'Str', 'Bytes', 'NameConstant', 'Ellipsis', 'Constant')
+    if hasattr(module, name))
+
+# placeholder of a child node in structural keys
+_CHILD = object()
+
+# classes of nodes without fields, like Load() or Add()
+_EMPTY_NODES = frozenset(
+    class_ for module in (ast, typed_ast.ast3) for class_ in vars(module).values()
+    if isinstance(class_, type) and issubclass(class_, _AST) and not class_._fields)
+
+
+def structural_key(tree) -> tuple:
+    """Create a hashable key that is equal for structurally equal trees.
+
+    Node positions (lineno, col_offset, etc.) are disregarded. Classes of nodes and values
+    are taken into account, so that for example Num(n=1) and Num(n=1.0) have different keys.
+
+    The key is a flat tuple: for each node, its class and its fields, where child nodes
+    are replaced with a marker and their own parts follow later. Nodes are visited using
+    an explicit stack, so that the key of a tree of any depth can be created.
+    """
+    parts = []  # type: t.List[t.Any]
+    append = parts.append
+    stack = [tree]  # type: t.List[t.Any]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node = pop()
+        append(node.__class__)
+        for name in node._fields:
+            value = getattr(node, name, None)
+            class_ = value.__class__
+            if class_ is str:
+                append(value)
+            elif class_ in _EMPTY_NODES:
+                append(class_)
+            elif isinstance(value, _AST):
+                append(_CHILD)
+                push(value)
+            elif class_ is list:
+                append((list, len(value)))
+                for item in value:
+                    if isinstance(item, _AST):
+                        append(_CHILD)
+                        push(item)
+                    else:
+                        append((item.__class__, item))
+            elif class_ is float or class_ is complex:
+                append((class_, repr(value)))  # to distinguish 0.0 from -0.0
+            else:
+                append((class_, value))
+    return tuple(parts)
+
+
+class UnparseCache:
+    """Least-recently-used cache of code of subtrees, keyed by their structure.
+
+    Code that spans several lines depends on the indentation level at which it was created,
+    and therefore it is reused only at the same indentation level.
+
+    Counters of hits and misses are available as attributes.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """Initialize empty cache that will hold at most maxsize entries."""
+        if maxsize < 1:
+            raise ValueError('maxsize={} must be positive'.format(maxsize))
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # key -> (code, indentation level or None if code is just one line)
+        self._entries = collections.OrderedDict()  # type: collections.OrderedDict
+
+    def get(self, key: t.Hashable, indent: int) -> t.Optional[str]:
+        """Get code cached for given key and indentation level, or None if not available."""
+        entry = self._entries.get(key)
+        if entry is None or entry[1] is not None and entry[1] != indent:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: t.Hashable, indent: int, code: str) -> None:
+        """Store code created at given indentation level, evicting least-recently-used entries."""
+        self._entries[key] = (code, indent if '\n' in code else None)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '{}(maxsize={}, size={}, hits={}, misses={})'.format(
+            type(self).__name__, self.maxsize, len(self), self.hits, self.misses)
+
+
+class CachingUnparser(Unparser):
+    """Unparser that reuses code of structurally identical expressions via an UnparseCache.
+
+    Only whole expressions are looked up in the cache (i.e. ones that are not a part of a larger
+    expression), for example a complete type annotation, decorator or default argument value.
+
+    Building the key visits the whole expression, which costs about as much as unparsing
+    a simple expression. Therefore the cache pays off only if most lookups are hits and
+    the expressions are expensive to unparse, like f-strings or long string literals.
+    The hit and miss counters of the cache help to decide if it's worth using.
+    """
+
+    def __init__(self, tree, file=sys.stdout, cache: t.Optional[UnparseCache] = None):
+        """Unparse the tree into the file, using given cache or a new one."""
+        self.cache = UnparseCache() if cache is None else cache
+        self._caching = True
+        super().__init__(tree, file=file)
+
+    def dispatch(self, tree):
+        """Write cached code of the tree if available, otherwise unparse it and cache the code."""
+        if not self._caching or tree.__class__ in _LEAVES or not isinstance(tree, _EXPR):
+            super().dispatch(tree)
+            return
+        key = (type(self), structural_key(tree))
+        code = self.cache.get(key, self._indent)
+        if code is None:
+            file = self.f
+            self.f = OutputBuffer()
+            self._caching = False
+            try:
+                super().dispatch(tree)
+                code = self.f.getvalue()
+            finally:
+                self.f = file
+                self._caching = True
+            self.cache.put(key, self._indent, code)
+        self.f.write(code)
@@ -0,0 +1,89 @@
+"""Class: CompactUnparser."""
+
+import sys
+
+from astunparse.unparser import interleave
+
+from .precedence import PrecedenceUnparser
+
+# statements that can be joined with ";" on one line
+_SIMPLE_STATEMENTS = frozenset({
+    'Expr', 'Assign', 'AugAssign', 'AnnAssign', 'Return', 'Pass', 'Break', 'Continue', 'Delete',
+    'Assert', 'Global', 'Nonlocal', 'Import', 'ImportFrom', 'Raise'})
+
+# whitespace around symbols, as written by Unparser -> shortest equivalent
+_COMPACT_TOKENS = {
+    ', ': ',', ' = ': '=', ': ': ':', ' -> ': '->', ' := ': ':=', '  # type: ': '# type: ',
+    '- ': '-', '+ ': '+', '~ ': '~',
+    '\n': ''}  # blank line before definitions of functions and classes
+_COMPACT_TOKENS.update(
+    (' {} '.format(symbol), symbol) for symbol in (
+        '+', '-', '*', '@', '/', '//', '%', '**', '<<', '>>', '|', '^', '&',
+        '==', '!=', '<', '<=', '>', '>='))
+_COMPACT_TOKENS.update(
+    (' {}= '.format(symbol), '{}='.format(symbol)) for symbol in (
+        '+', '-', '*', '@', '/', '//', '%', '**', '<<', '>>', '|', '^', '&'))
+
+
+class CompactUnparser(PrecedenceUnparser):
+    """Unparser that creates the shortest code it can, for example to ship generated code.
+
+    Compared to PrecedenceUnparser, blocks are indented by one space, consecutive simple
+    statements in one block are joined with ";", dictionaries are written in one line,
+    and there is no optional whitespace around symbols, nor blank lines before definitions.
+    Whitespace around keywords like "and", "in" or "lambda" is kept.
+
+    Type comments are kept. A statement with a type comment ends its line.
+    """
+
+    def __init__(self, tree, file=sys.stdout):
+        """Unparse the tree into the file."""
+        self._join = False
+        self._filling = False
+        super().__init__(tree, file=file)
+
+    def write(self, text):
+        """Append a piece of text to the current line, without optional whitespace."""
+        text = text if text.__class__ is str else str(text)
+        compact = _COMPACT_TOKENS.get(text, text)
+        if not compact and self._filling:
+            compact = text  # line break before a top-level statement, not a blank line
+        self._write(compact)
+
+    def fill(self, text=""):
+        """Start a new line with one space per indentation level, or join it using ";"."""
+        if self._join:
+            self._join = False
+            self.write(';' + text)
+        else:
+            self._filling = True
+            self.write("\n" + " " * self._indent + text)
+            self._filling = False
+
+    def _write_arguments_separator(self, latest_comment):
+        self.write(',')
+        if latest_comment is not None:
+            self._write_type_comment(latest_comment)
+            self.fill()
+
+    def _Module(self, tree):
+        self.dispatch(tree.body)
+
+    def _Interactive(self, tree):
+        self.dispatch(tree.body)
+
+    def _dispatch_list(self, trees):
+        join = False
+        for tree in trees:
+            simple = tree.__class__.__name__ in _SIMPLE_STATEMENTS
+            self._join = join and simple
+            self.dispatch(tree)
+            # type comment must be the last thing on its line
+            join = simple and getattr(tree, 'type_comment', None) is None
+        self._join = False
+
+    def _Dict(self, t):
+        self.write("{")
+        interleave(lambda: self.write(','), lambda pair: self._write_dict_item(*pair, ':'),
+                   zip(t.keys, t.values))
+        self.write("}")
@@ -0,0 +1,75 @@
+"""Functions: equal, find_difference."""
+
+import ast
+import typing as t
+
+import typed_ast.ast3
+
+_AST = (ast.AST, typed_ast.ast3.AST)
+
+_MISSING = object()
+
+
+def _format_path(path) -> str:
+    steps = []
+    while path is not None:
+        path, step = path
+        steps.append(step)
+    return 'tree' + ''.join(reversed(steps))
+
+
+def find_difference(
+        tree_a: t.Union[ast.AST, typed_ast.ast3.AST], tree_b: t.Union[ast.AST, typed_ast.ast3.AST],
+        include_attributes: bool = False) -> t.Optional[str]:
+    """Find the first difference between two trees, and return the path to it, or None.
+
+    The path looks like "tree.body[2].value.args[0]". Trees are compared like their dumps
+    would be: nodes must have the same class name and fields, so ast-based, typed_ast.ast3-based
+    and mixed trees can be compared with each other, and other values must have the same type
+    and representation. Attributes like lineno are compared only if include_attributes is True.
+
+    Comparison is iterative, so there is no limit on the depth of the trees.
+    """
+    # (value from tree_a, value from tree_b, path as nested (parent path, step) pairs)
+    stack = [(tree_a, tree_b, None)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        value_a, value_b, path = pop()
+        class_a = value_a.__class__
+        class_b = value_b.__class__
+        if class_a is list:
+            if class_b is not list or len(value_a) != len(value_b):
+                return _format_path(path)
+            for i in range(len(value_a) - 1, -1, -1):
+                push((value_a[i], value_b[i], (path, '[{}]'.format(i))))
+        elif isinstance(value_a, _AST):
+            if class_a.__name__ != class_b.__name__ or not isinstance(value_b, _AST) \
+                    or value_a._fields != value_b._fields:
+                return _format_path(path)
+            names = value_a._fields
+            if include_attributes:
+                if value_a._attributes != value_b._attributes:
+                    return _format_path(path)
+                names += value_a._attributes
+            for name in reversed(names):
+                field_a = getattr(value_a, name, _MISSING)
+                field_b = getattr(value_b, name, _MISSING)
+                if field_a is not field_b:
+                    push((field_a, field_b, (path, '.' + name)))
+        elif class_a is not class_b or value_a != value_b \
+                and repr(value_a) != repr(value_b):  # NaN is not equal to itself
+            return _format_path(path)
+        elif (class_a is float or class_a is complex) and repr(value_a) != repr(value_b):
+            return _format_path(path)  # 0.0 is equal to -0.0
+    return None
+
+
+def equal(
+        tree_a: t.Union[ast.AST, typed_ast.ast3.AST], tree_b: t.Union[ast.AST, typed_ast.ast3.AST],
+        include_attributes: bool = False) -> bool:
+    """Check if two trees are the same, without creating their dumps.
+
+    Use find_difference() to find out where the trees differ.
+    """
+    return find_difference(tree_a, tree_b, include_attributes) is None
@@ -0,0 +1,217 @@
+"""Functions: to_ast, to_typed_ast."""
+
+import ast
+import sys
+import typing as t
+
+import typed_ast.ast3
+
+_AST = (ast.AST, typed_ast.ast3.AST)
+
+# fields absent in some of the source nodes, which are lists in the target nodes
+_LIST_FIELDS = frozenset(('posonlyargs', 'type_params'))
+
+_CONSTANT_CLASSES = frozenset(('Num', 'Str', 'Bytes', 'NameConstant', 'Ellipsis', 'Constant'))
+
+_CONSTANT_FIELDS = {'Num': 'n', 'Str': 's', 'Bytes': 's', 'NameConstant': 'value'}
+
+# since Python 3.8, ast.parse() creates Constant for all constants
+_NATIVE_CONSTANTS = sys.version_info >= (3, 8)
+
+# since Python 3.9, ast.parse() creates neither Index nor ExtSlice
+_NATIVE_SLICES = sys.version_info >= (3, 9)
+
+# classes of slices which are stored as they are in typed_ast.ast3.Subscript
+_SLICE_CLASSES = frozenset(('Slice', 'Index', 'ExtSlice'))
+
+
+def _layout(class_: type, module) -> tuple:
+    """Prepare conversion of nodes of given class: (target class, fields, extra, missing).
+
+    Fields are names of fields that may hold nodes, extra are names of fields and attributes
+    absent in the target class, and missing are names of fields absent in the source class.
+    """
+    name = class_.__name__
+    target = getattr(module, name, None)
+    if not isinstance(target, type) or not issubclass(target, module.AST):
+        raise ValueError('{} cannot be converted to {} node'.format(name, module.__name__))
+    names = class_._fields + class_._attributes
+    target_names = target._fields + target._attributes
+    extra = tuple(_ for _ in names if _ not in target_names)
+    missing = tuple(_ for _ in target._fields if _ not in class_._fields)
+    return target, class_._fields, extra, missing
+
+
+def _convert(tree, module, special: t.Callable):
+    """Convert the tree in one pass, using an explicit stack.
+
+    Each node is recreated as an instance of the class with the same name from the given module,
+    sharing values of the fields, unless special(node, container, key, push) converts it.
+    Lists are copied only if they contain nodes.
+    """
+    layouts = {}  # type: t.Dict[type, tuple]
+    singletons = {}  # type: t.Dict[type, t.Any]
+    result = [tree]
+    # source values and where their converted counterparts are stored: (value, container, key)
+    stack = [(tree, result, 0)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        value, container, key = pop()
+        class_ = value.__class__
+        if class_ is list:
+            converted = value
+            for i, item in enumerate(value):
+                if item.__class__ is list or isinstance(item, _AST):
+                    if converted is value:
+                        converted = list(value)
+                    push((item, converted, i))
+            if converted is value:
+                continue
+        else:
+            converted = special(value, container, key, push)
+            if converted is None:
+                continue
+            if converted is value:
+                try:
+                    target, fields, extra, missing = layouts[class_]
+                except KeyError:
+                    target, fields, extra, missing = layouts[class_] = _layout(class_, module)
+                if not fields and not value.__dict__:
+                    converted = singletons.get(target)
+                    if converted is None:
+                        converted = singletons[target] = target()
+                else:
+                    converted = target.__new__(target)
+                    attributes = converted.__dict__
+                    attributes.update(value.__dict__)
+                    for name in extra:
+                        if attributes.pop(name, None) and name in fields:
+                            raise ValueError('{}.{} cannot be represented in {}'.format(
+                                class_.__name__, name, module.__name__))
+                    for name in missing:
+                        attributes[name] = [] if name in _LIST_FIELDS else None
+                    for name in fields:
+                        field = attributes.get(name)
+                        if field.__class__ is list and field or isinstance(field, _AST):
+                            push((field, converted, name))
+        if container.__class__ is list:
+            container[key] = converted
+        else:
+            setattr(container, key, converted)
+    return result[0]
+
+
+def _to_ast_special(node, container, key, push):
+    name = node.__class__.__name__
+    if name in _CONSTANT_CLASSES and _NATIVE_CONSTANTS:
+        if name == 'Ellipsis':
+            value = Ellipsis
+        else:
+            value = getattr(node, _CONSTANT_FIELDS.get(name, 'value'))
+        kind = 'u' if getattr(node, 'kind', None) == 'u' else None
+        converted = ast.Constant(value, kind)
+        for attribute in node._attributes:
+            if hasattr(node, attribute):
+                setattr(converted, attribute, getattr(node, attribute))
+        return converted
+    if name == 'Index' and _NATIVE_SLICES:
+        push((node.value, container, key))
+        return None
+    if name == 'ExtSlice' and _NATIVE_SLICES:
+        converted = ast.Tuple(node.dims, ast.Load())
+        push((node.dims, converted, 'elts'))
+        return converted
+    return node
+
+
+def to_ast(tree: t.Union[ast.AST, typed_ast.ast3.AST]) -> ast.AST:
+    """Convert a typed_ast.ast3-based (or mixed) tree into a tree of built-in ast nodes.
+
+    Num, Str, Bytes, NameConstant and Ellipsis become Constant (since Python 3.8), Index
+    is replaced by the value it holds and ExtSlice by Tuple (since Python 3.9), like in trees
+    created by ast.parse().
+
+    The conversion is iterative. Values of fields, like identifiers, constants and lists
+    of non-nodes, are shared with the original tree, which remains unchanged.
+    """
+    return _convert(tree, ast, _to_ast_special)
+
+
+def _to_typed_constant(node, kind: t.Optional[str] = None):
+    value = node.value
+    class_ = value.__class__
+    if class_ is str:
+        converted = typed_ast.ast3.Str(
+            value, ('u' if getattr(node, 'kind', None) == 'u' else '') if kind is None else kind)
+    elif class_ is bytes:
+        converted = typed_ast.ast3.Bytes(value, 'b')
+    elif value is None or class_ is bool:
+        converted = typed_ast.ast3.NameConstant(value)
+    elif value is Ellipsis:
+        converted = typed_ast.ast3.Ellipsis()
+    elif class_ is int or class_ is float or class_ is complex:
+        converted = typed_ast.ast3.Num(value)
+    else:
+        converted = typed_ast.ast3.Constant(value)
+    for attribute in converted._attributes:
+        if hasattr(node, attribute):
+            setattr(converted, attribute, getattr(node, attribute))
+    return converted
+
+
+def _to_typed_ast_special(node, container, key, push):
+    name = node.__class__.__name__
+    if name == 'Constant':
+        return _to_typed_constant(node)
+    if name == 'JoinedStr':
+        values = []
+        converted = typed_ast.ast3.JoinedStr(values)
+        for attribute in converted._attributes:
+            if hasattr(node, attribute):
+                setattr(converted, attribute, getattr(node, attribute))
+        for i, value in enumerate(node.values):
+            if value.__class__.__name__ == 'Constant':
+                values.append(_to_typed_constant(value, 'f'))
+            else:
+                values.append(value)
+                push((value, values, i))
+        return converted
+    if name == 'Subscript' and node.slice.__class__.__name__ not in _SLICE_CLASSES:
+        # since Python 3.9, slice of Subscript is an expression, or a Tuple containing slices
+        slice_ = node.slice
+        converted = typed_ast.ast3.Subscript(node.value, None, node.ctx)
+        for attribute in converted._attributes:
+            if hasattr(node, attribute):
+                setattr(converted, attribute, getattr(node, attribute))
+        push((node.value, converted, 'value'))
+        push((node.ctx, converted, 'ctx'))
+        if slice_.__class__.__name__ == 'Tuple' \
+                and any(_.__class__.__name__ == 'Slice' for _ in slice_.elts):
+            dims = []
+            converted.slice = typed_ast.ast3.ExtSlice(dims)
+            for i, dim in enumerate(slice_.elts):
+                if dim.__class__.__name__ == 'Slice':
+                    dims.append(dim)
+                    push((dim, dims, i))
+                else:
+                    dims.append(typed_ast.ast3.Index(dim))
+                    push((dim, dims[i], 'value'))
+        else:
+            converted.slice = typed_ast.ast3.Index(slice_)
+            push((slice_, converted.slice, 'value'))
+        return converted
+    return node
+
+
+def to_typed_ast(tree: t.Union[ast.AST, typed_ast.ast3.AST]) -> typed_ast.ast3.AST:
+    """Convert a built-in ast-based (or mixed) tree into a tree of typed_ast.ast3 nodes.
+
+    Constant becomes Num, Str, Bytes, NameConstant or Ellipsis, and subscripts get Index
+    or ExtSlice, like in trees created by typed_ast.ast3.parse(). Syntax which typed_ast.ast3
+    cannot represent, e.g. assignment expressions, raises ValueError.
+
+    The conversion is iterative. Values of fields, like identifiers, constants and lists
+    of non-nodes, are shared with the original tree, which remains unchanged.
+    """
+    return _convert(tree, typed_ast.ast3, _to_typed_ast_special)
@@ -0,0 +1,140 @@
+"""Class: DiskUnparseCache."""
+
+import ast
+import hashlib
+import os
+import pathlib
+import tempfile
+import typing as t
+
+if t.TYPE_CHECKING:
+    import typed_ast.ast3  # noqa: F401
+
+# part of the size limit to which the cache is shrunk when it exceeds the limit,
+# so that eviction does not happen on every write once the cache is full
+_EVICTION_RATIO = 0.8
+
+
+class DiskUnparseCache:
+    """Persistent cache of unparsed code, stored as files in a directory.
+
+    Each entry is a file named by its key, in a subdirectory named by the first two characters
+    of the key. By default, the key is a hash of the exact structure of the tree (as printed by
+    dump() in compact form) and of versions of typed_astunparse and astunparse.
+
+    Computing the structural key visits the whole tree, which costs about as much as unparsing
+    it. Therefore, if possible, pass a cheaper key to get() and put(), e.g. a hash of the source
+    file and of the version, from which the tree was created.
+
+    Entries are written to temporary files and then atomically renamed, so that several
+    processes can share the cache. When the total size of entries exceeds max_size (in bytes),
+    least-recently-used entries are removed. Counters of hits and misses are available
+    as attributes.
+    """
+
+    def __init__(self, directory: t.Union[str, pathlib.Path], max_size: int = 256 * 1024 ** 2):
+        """Use given directory, creating it if necessary, to store at most max_size bytes."""
+        if max_size < 1:
+            raise ValueError('max_size={} must be positive'.format(max_size))
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._version = None  # type: t.Optional[str]
+        # size of all entries, as seen during the last scan plus size of entries written since
+        self._size = None  # type: t.Optional[int]
+
+    def key(self, tree: 't.Union[ast.AST, typed_ast.ast3.AST]', options: str = '') -> str:
+        """Create a key of the tree, which depends on its structure and on the library version.
+
+        Options that change the code created from the same tree, if any, must be given as well.
+        """
+        if self._version is None:
+            import astunparse
+            from ._version import VERSION
+            self._version = 'typed_astunparse {} astunparse {}'.format(
+                VERSION, astunparse.__version__)
+        from .printer import compact_dump
+        digest = hashlib.sha1()
+        digest.update('{}\n{}\n'.format(self._version, options).encode())
+        digest.update(compact_dump(tree, False, False).encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory.joinpath(key[:2], key[2:])
+
+    def get(self, key: str) -> t.Optional[str]:
+        """Get code cached for given key, or None if not available."""
+        path = self._path(key)
+        try:
+            code = path.read_bytes().decode('utf-8', 'surrogatepass')
+            os.utime(str(path))  # modification time is used to find least-recently-used entries
+        except OSError:  # missing, or evicted by another process in the meantime
+            self.misses += 1
+            return None
+        self.hits += 1
+        return code
+
+    def put(self, key: str, code: str) -> None:
+        """Store the code, evicting least-recently-used entries if the cache is too large."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        data = code.encode('utf-8', 'surrogatepass')
+        descriptor, temporary_path = tempfile.mkstemp(dir=str(path.parent), prefix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as temporary_file:
+                temporary_file.write(data)
+            os.replace(temporary_path, str(path))
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_size:
+            self.evict(int(self.max_size * _EVICTION_RATIO))
+
+    def _entries(self) -> t.Iterator[t.Tuple[str, int, float]]:
+        """Yield path, size and modification time of each entry."""
+        # scandir() iterators are context managers only since Python 3.6, so they are not closed
+        # explicitly, but they are always exhausted
+        for subdirectory in os.scandir(str(self.directory)):
+            if not subdirectory.is_dir():
+                continue
+            for entry in os.scandir(subdirectory.path):
+                if entry.name.startswith('.tmp'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def evict(self, max_size: int) -> None:
+        """Remove least-recently-used entries until their total size is at most max_size."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        for path, entry_size, _ in entries:
+            if size <= max_size:
+                break
+            try:
+                os.unlink(path)
+            except OSError:  # already removed by another process
+                pass
+            size -= entry_size
+        self._size = size
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        self.evict(0)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return sum(1 for _ in self._entries())
+
+    def __repr__(self):
+        return '{}({}, max_size={}, hits={}, misses={})'.format(
+            type(self).__name__, repr(str(self.directory)), self.max_size, self.hits, self.misses)
@@ -0,0 +1,123 @@
+"""Function: fingerprint."""
+
+import ast
+import hashlib
+import typing as t
+
+import typed_ast.ast3
+
+_AST = (ast.AST, typed_ast.ast3.AST)
+
+# name of the field holding the value of deprecated constant nodes
+_CONSTANT_FIELDS = {'Num': 'n', 'Str': 's', 'Bytes': 's', 'NameConstant': 'value'}
+
+# kind of strings is taken into account only if it is 'u', as other kinds are absent in ast
+_KIND_PREFIX = ',kind='
+
+_TYPE_COMMENT_FIELDS = frozenset(('type_comment', 'type_ignores'))
+
+# number of parts of the representation collected before they are fed to the hash
+_BUFFER_SIZE = 4096
+
+
+def _layout(class_: type, include_attributes: bool, include_type_comments: bool) -> tuple:
+    """Prepare representation of nodes of given class: (opening, fields, closing).
+
+    Fields are pairs of attribute name and prefix. Layout of Index is None.
+    """
+    name = class_.__name__
+    if name == 'Index':
+        return None
+    if name in _CONSTANT_FIELDS:
+        opening = 'Constant('
+        fields = [(_CONSTANT_FIELDS[name], ',value=')]
+        if 'kind' in class_._fields:
+            fields.append(('kind', _KIND_PREFIX))
+    elif name == 'Ellipsis':
+        opening = 'Constant(,value=Ellipsis'
+        fields = []
+    elif name == 'ExtSlice':
+        return 'Tuple(', (('dims', ',elts='),), ',ctx=Load())'
+    else:
+        opening = name + '('
+        fields = [
+            (field, _KIND_PREFIX if field == 'kind' else ',' + field + '=')
+            for field in class_._fields
+            if include_type_comments or field not in _TYPE_COMMENT_FIELDS]
+    if include_attributes:
+        fields += [(attribute, ',' + attribute + '=') for attribute in class_._attributes]
+    return opening, tuple(fields), ')'
+
+
+def fingerprint(
+        tree: t.Union[ast.AST, typed_ast.ast3.AST], include_attributes: bool = False,
+        include_type_comments: bool = True) -> str:
+    """Calculate a digest of the structure of the tree, as a hexadecimal str.
+
+    Structurally equal trees have equal fingerprints, no matter if they are ast-based,
+    typed_ast.ast3-based or mixed. To make trees of the same code equal, differences between
+    versions of the AST are evened out: Num, Str, Bytes, NameConstant and Ellipsis are treated
+    as Constant, Index as the value it holds, ExtSlice as Tuple, and fields that are None
+    or empty lists as absent.
+
+    Position attributes (lineno, col_offset, etc.) are taken into account only if
+    include_attributes is True, and type comments only if include_type_comments is True.
+
+    Each node is visited once, using an explicit stack, and its representation is fed
+    to the hash in portions, so the complete dump of the tree is never created.
+    """
+    digest = hashlib.sha1()
+    layouts = {}  # type: t.Dict[type, t.Optional[tuple]]
+    parts = []  # type: t.List[str]
+    append = parts.append
+    # values to represent, and ready parts of the representation (all strs on the stack)
+    stack = [tree]  # type: t.List[t.Any]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        value = pop()
+        class_ = value.__class__
+        if class_ is str:
+            append(value)
+            continue
+        if class_ is list:
+            append('[')
+            push(']')
+            for item in reversed(value):
+                if isinstance(item, _AST) or item.__class__ is list:
+                    push(item)
+                    push(',')
+                else:
+                    push(',' + repr(item))
+            continue
+        if not isinstance(value, _AST):
+            append(repr(value))
+            continue
+        try:
+            layout = layouts[class_]
+        except KeyError:
+            layout = layouts[class_] = _layout(class_, include_attributes, include_type_comments)
+        if layout is None:
+            push(value.value)
+            continue
+        opening, fields, closing = layout
+        append(opening)
+        push(closing)
+        for field, prefix in reversed(fields):
+            field_value = getattr(value, field, None)
+            if field_value is None:
+                continue
+            if field_value.__class__ is list:
+                if field_value:
+                    push(field_value)
+                    push(prefix)
+            elif isinstance(field_value, _AST):
+                push(field_value)
+                push(prefix)
+            elif prefix is not _KIND_PREFIX or field_value == 'u':
+                push(prefix + repr(field_value))
+        if len(parts) > _BUFFER_SIZE:
+            digest.update(''.join(parts).encode('utf-8'))
+            parts.clear()
+    digest.update(''.join(parts).encode('utf-8'))
+    return digest.hexdigest()
@@ -0,0 +1,97 @@
+"""Class: IncrementalUnparser."""
+
+import ast
+import typing as t
+
+import typed_ast.ast3
+
+from .cache import structural_key
+from .output import OutputBuffer
+from .unparser import Unparser
+from .iterative_unparser import IterativeUnparser
+
+_MODULES = (ast.Module, ast.Interactive, typed_ast.ast3.Module, typed_ast.ast3.Interactive)
+
+
+class IncrementalUnparser:
+    """Unparse successive versions of a module, re-rendering only top-level statements that changed.
+
+    The code of the latest version is kept together with a table of spans: (start, end) offsets
+    of each top-level statement in the code. When a new version of the module is unparsed,
+    code of unchanged statements is spliced in from the previous code, so the result is the same
+    as the result of unparse(), but only changed statements are actually unparsed.
+
+    By default, a top-level statement is considered unchanged if it is structurally equal
+    to a statement of the previous version, as decided by structural_key(), no matter if it was
+    modified in place, replaced or moved. This is always correct, but calculating the key visits
+    the whole statement, which costs about as much as unparsing it. Callers that track their edits
+    can instead list the modified statements in the changed argument of unparse(): then statements
+    that are the very same objects as in the previous version and are not listed are reused
+    without being visited at all.
+    """
+
+    def __init__(self, iterative: bool = False):
+        """Initialize incremental unparser, which can use IterativeUnparser if requested."""
+        self.iterative = iterative
+        self.code = ''
+        self.spans = []  # type: t.List[t.Tuple[int, int]]
+        self.rendered = 0
+        self.reused = 0
+        # statements of the previous version and their structural keys, if they were calculated
+        self._statements = []  # type: t.List[t.Tuple[t.Any, t.Optional[tuple]]]
+
+    def unparse(self, tree, changed: t.Optional[t.Iterable[t.Any]] = None) -> str:
+        """Unparse the tree, reusing the previous code of top-level statements that didn't change.
+
+        If changed is given, it must contain all top-level statements modified in place since
+        the previous call, and the remaining statements are reused if they are the same objects.
+        Otherwise, the statements are compared structurally.
+        """
+        if not isinstance(tree, _MODULES):
+            raise TypeError('expected a module, got {}'.format(type(tree).__name__))
+        if changed is None:
+            changed_ids = None
+            previous = {
+                key: index for index, (_, key) in enumerate(self._statements) if key is not None}
+        else:
+            changed_ids = {id(statement) for statement in changed}
+            previous = {
+                id(statement): index for index, (statement, _) in enumerate(self._statements)}
+        stream = OutputBuffer()
+        unparser = None
+        chunks = []
+        spans = []
+        statements = []
+        offset = 0
+        self.rendered = 0
+        self.reused = 0
+        for statement in tree.body:
+            if changed_ids is None:
+                key = structural_key(statement)
+                index = previous.get(key)
+            elif id(statement) in changed_ids:
+                key, index = None, None
+            else:
+                index = previous.get(id(statement))
+                key = None if index is None else self._statements[index][1]
+            if index is not None:
+                start, end = self.spans[index]
+                chunk = self.code[start:end]
+                self.reused += 1
+            else:
+                if unparser is None:
+                    unparser = (IterativeUnparser if self.iterative else Unparser)([], file=stream)
+                    stream.clear()
+                unparser.dispatch(statement)
+                chunk = stream.getvalue()
+                stream.clear()
+                self.rendered += 1
+            chunks.append(chunk)
+            spans.append((offset, offset + len(chunk)))
+            statements.append((statement, key))
+            offset += len(chunk)
+        chunks.append('\n')
+        self.code = ''.join(chunks)
+        self.spans = spans
+        self._statements = statements
+        return self.code
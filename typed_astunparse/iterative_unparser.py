@@ -0,0 +1,583 @@
+"""Class: IterativeUnparser."""
+
+import ast
+import typing as t
+
+import typed_ast.ast3
+
+from .unparser import Unparser
+
+
+class IterativeUnparser(Unparser):
+    """Unparser that walks the tree using an explicit work stack instead of recursion.
+
+    Output is exactly the same as the output of Unparser, but unparsing depth is not bound by
+    the recursion limit, and there is no Python frame setup for each visited node.
+
+    Every handler of a node that has children is a generator: it writes its own tokens and
+    yields the children (or lists of children) in the order they must be unparsed. The yielded
+    child is completely unparsed before the handler resumes.
+
+    Handlers of leaf nodes (names, literals, etc.) are inherited from Unparser as they are.
+    Any inherited handler that does dispatch children still works correctly, it just uses
+    a separate work stack for its own subtree.
+    """
+
+    def dispatch(self, tree):
+        """Unparse the tree without recursion."""
+        for _ in self._dispatch_steps(tree, 0):
+            pass
+
+    def _dispatch_steps(self, tree, nodes: int) -> t.Iterator[None]:
+        """Unparse the tree, pausing (i.e. yielding None) after every few nodes, or never if 0."""
+        handlers = self._handlers
+        stack = []
+        node = tree
+        count = 0
+        while True:
+            count += 1
+            if count == nodes:
+                count = 0
+                yield
+            try:
+                handler = handlers[node.__class__]
+            except KeyError:
+                handler = self._resolve_handler(node.__class__)
+            children = handler(self, node)
+            if children is not None:
+                stack.append(children.__next__)
+            while stack:
+                try:
+                    node = stack[-1]()
+                    break
+                except StopIteration:
+                    stack.pop()
+            else:
+                return
+
+    def _dispatch_list(self, trees):
+        yield from trees
+
+    def _interleave(self, separator: str, trees):
+        """Yield trees one by one, writing the separator in between."""
+        first = True
+        for tree in trees:
+            if first:
+                first = False
+            else:
+                self.write(separator)
+            yield tree
+
+    def _block(self, body):
+        self.enter()
+        yield body
+        self.leave()
+
+    def _string_or_tree(self, value):
+        if isinstance(value, str):
+            self.write(value)
+        else:
+            yield value
+
+    def _comma_separated_type_comment(self, type_comment):
+        """Write ', ', or rather ',  # type: ...' followed by a newline if there's a comment."""
+        self.write(',')
+        if type_comment is not None:
+            self.write('  # type: ')
+            yield from self._string_or_tree(type_comment)
+            self.fill('        ')
+        else:
+            self.write(' ')
+
+    # mod
+
+    def _Module(self, tree):
+        yield tree.body
+
+    def _Interactive(self, tree):
+        yield tree.body
+
+    def _Expression(self, tree):
+        yield tree.body
+
+    # stmt
+
+    def _Expr(self, tree):
+        self.fill()
+        yield tree.value
+
+    def _Import(self, t):
+        self.fill("import ")
+        yield from self._interleave(", ", t.names)
+
+    def _ImportFrom(self, t):
+        if t.module and t.module == '__future__':
+            self.future_imports.extend(n.name for n in t.names)
+
+        self.fill("from ")
+        self.write("." * t.level)
+        if t.module:
+            self.write(t.module)
+        self.write(" import ")
+        yield from self._interleave(", ", t.names)
+
+    def _Assign(self, t):
+        self.fill()
+        for target in t.targets:
+            yield target
+            self.write(" = ")
+        yield t.value
+        if hasattr(t, 'type_comment') and t.type_comment is not None:
+            self.write('  # type: ')
+            yield from self._string_or_tree(t.type_comment)
+
+    def _AugAssign(self, t):
+        self.fill()
+        yield t.target
+        self.write(" " + self.binop[t.op.__class__.__name__] + "= ")
+        yield t.value
+
+    def _AnnAssign(self, t):
+        self.fill()
+        if not t.simple:
+            self.write("(")
+        yield t.target
+        if not t.simple:
+            self.write(")")
+        self.write(": ")
+        yield t.annotation
+        if t.value:
+            self.write(" = ")
+            yield t.value
+
+    def _Return(self, t):
+        self.fill("return")
+        if t.value:
+            self.write(" ")
+            yield t.value
+
+    def _Delete(self, t):
+        self.fill("del ")
+        yield from self._interleave(", ", t.targets)
+
+    def _Assert(self, t):
+        self.fill("assert ")
+        yield t.test
+        if t.msg:
+            self.write(", ")
+            yield t.msg
+
+    def _Raise(self, t):
+        self.fill("raise")
+        if not t.exc:
+            assert not t.cause
+            return
+        self.write(" ")
+        yield t.exc
+        if t.cause:
+            self.write(" from ")
+            yield t.cause
+
+    def _Try(self, t):
+        self.fill("try")
+        yield from self._block(t.body)
+        yield t.handlers
+        if t.orelse:
+            self.fill("else")
+            yield from self._block(t.orelse)
+        if t.finalbody:
+            self.fill("finally")
+            yield from self._block(t.finalbody)
+
+    def _ExceptHandler(self, t):
+        self.fill("except")
+        if t.type:
+            self.write(" ")
+            yield t.type
+        if t.name:
+            self.write(" as ")
+            self.write(t.name)
+        yield from self._block(t.body)
+
+    def _ClassDef(self, t):
+        self.write("\n")
+        for deco in t.decorator_list:
+            self.fill("@")
+            yield deco
+        self.fill("class " + t.name)
+        self.write("(")
+        yield from self._interleave(", ", t.bases + t.keywords)
+        self.write(")")
+        yield from self._block(t.body)
+
+    def _generic_FunctionDef(self, t, async_=False):
+        self.write("\n")
+        for deco in t.decorator_list:
+            self.fill("@")
+            yield deco
+        self.fill(("async " if async_ else "") + "def " + t.name + "(")
+        yield t.args
+        self.write(")")
+        if getattr(t, "returns", False):
+            self.write(" -> ")
+            yield t.returns
+        self.enter()
+        if getattr(t, 'type_comment', None) is not None:
+            self.fill('# type: ')
+            yield from self._string_or_tree(t.type_comment)
+        yield t.body
+        self.leave()
+
+    def _FunctionDef(self, t):
+        return self._generic_FunctionDef(t)
+
+    def _AsyncFunctionDef(self, t):
+        return self._generic_FunctionDef(t, async_=True)
+
+    def _generic_For(self, t, async_=False):
+        self.fill("async for " if async_ else "for ")
+        yield t.target
+        self.write(" in ")
+        yield t.iter
+        self.enter()
+        if getattr(t, 'type_comment', None) is not None:
+            self.write('  # type: ')
+            yield from self._string_or_tree(t.type_comment)
+        yield t.body
+        self.leave()
+        if t.orelse:
+            self.fill("else")
+            yield from self._block(t.orelse)
+
+    def _For(self, t):
+        return self._generic_For(t)
+
+    def _AsyncFor(self, t):
+        return self._generic_For(t, async_=True)
+
+    def _If(self, t):
+        self.fill("if ")
+        yield t.test
+        yield from self._block(t.body)
+        # collapse nested ifs into equivalent elifs.
+        while t.orelse and len(t.orelse) == 1 \
+                and isinstance(t.orelse[0], (ast.If, typed_ast.ast3.If)):
+            t = t.orelse[0]
+            self.fill("elif ")
+            yield t.test
+            yield from self._block(t.body)
+        # final else
+        if t.orelse:
+            self.fill("else")
+            yield from self._block(t.orelse)
+
+    def _While(self, t):
+        self.fill("while ")
+        yield t.test
+        yield from self._block(t.body)
+        if t.orelse:
+            self.fill("else")
+            yield from self._block(t.orelse)
+
+    def _generic_With(self, t, async_=False):
+        self.fill("async with " if async_ else "with ")
+        yield from self._interleave(", ", t.items)
+        self.enter()
+        if getattr(t, 'type_comment', None) is not None:
+            self.write('  # type: ')
+            yield from self._string_or_tree(t.type_comment)
+        yield t.body
+        self.leave()
+
+    def _With(self, t):
+        return self._generic_With(t)
+
+    def _AsyncWith(self, t):
+        return self._generic_With(t, async_=True)
+
+    # expr
+
+    def _Await(self, t):
+        self.write("(")
+        self.write("await")
+        if t.value:
+            self.write(" ")
+            yield t.value
+        self.write(")")
+
+    def _Yield(self, t):
+        self.write("(")
+        self.write("yield")
+        if t.value:
+            self.write(" ")
+            yield t.value
+        self.write(")")
+
+    def _YieldFrom(self, t):
+        self.write("(")
+        self.write("yield from")
+        if t.value:
+            self.write(" ")
+            yield t.value
+        self.write(")")
+
+    def _List(self, t):
+        self.write("[")
+        yield from self._interleave(", ", t.elts)
+        self.write("]")
+
+    def _ListComp(self, t):
+        self.write("[")
+        yield t.elt
+        yield t.generators
+        self.write("]")
+
+    def _GeneratorExp(self, t):
+        self.write("(")
+        yield t.elt
+        yield t.generators
+        self.write(")")
+
+    def _SetComp(self, t):
+        self.write("{")
+        yield t.elt
+        yield t.generators
+        self.write("}")
+
+    def _DictComp(self, t):
+        self.write("{")
+        yield t.key
+        self.write(": ")
+        yield t.value
+        yield t.generators
+        self.write("}")
+
+    def _comprehension(self, t):
+        if getattr(t, 'is_async', False):
+            self.write(" async")
+        self.write(" for ")
+        yield t.target
+        self.write(" in ")
+        yield t.iter
+        for if_clause in t.ifs:
+            self.write(" if ")
+            yield if_clause
+
+    def _IfExp(self, t):
+        self.write("(")
+        yield t.body
+        self.write(" if ")
+        yield t.test
+        self.write(" else ")
+        yield t.orelse
+        self.write(")")
+
+    def _Set(self, t):
+        assert t.elts  # should be at least one element
+        self.write("{")
+        yield from self._interleave(", ", t.elts)
+        self.write("}")
+
+    def _Dict(self, t):
+        self.write("{")
+        self._indent += 1
+        self.fill("")
+        first = True
+        for key, value in zip(t.keys, t.values):
+            if first:
+                first = False
+            else:
+                self.fill("")
+            if key is None:
+                self.write('**')
+                yield value
+            else:
+                yield key
+                self.write(": ")
+                yield value
+            self.write(",")
+        self._indent -= 1
+        self.fill("}")
+
+    def _Tuple(self, t):
+        self.write("(")
+        if len(t.elts) == 1:
+            yield t.elts[0]
+            self.write(",")
+        else:
+            yield from self._interleave(", ", t.elts)
+        self.write(")")
+
+    def _UnaryOp(self, t):
+        self.write("(")
+        self.write(self.unop[t.op.__class__.__name__])
+        self.write(" ")
+        yield t.operand
+        self.write(")")
+
+    def _BinOp(self, t):
+        self.write("(")
+        yield t.left
+        self.write(" " + self.binop[t.op.__class__.__name__] + " ")
+        yield t.right
+        self.write(")")
+
+    def _Compare(self, t):
+        self.write("(")
+        yield t.left
+        for operator, comparator in zip(t.ops, t.comparators):
+            self.write(" " + self.cmpops[operator.__class__.__name__] + " ")
+            yield comparator
+        self.write(")")
+
+    def _BoolOp(self, syntax):
+        self.write('(')
+        yield from self._interleave(
+            ' {} '.format(self.boolops[syntax.op.__class__.__name__]), syntax.values)
+        self.write(')')
+
+    def _Attribute(self, t):
+        yield t.value
+        # Special case: 3.__abs__() is a syntax error, so if t.value
+        # is an integer literal then we need to either parenthesize
+        # it or add an extra space to get 3 .__abs__().
+        if isinstance(t.value, (ast.Num, typed_ast.ast3.Num)) and isinstance(t.value.n, int):
+            self.write(" ")
+        self.write(".")
+        self.write(t.attr)
+
+    def _Call(self, t):
+        yield t.func
+        self.write("(")
+        yield from self._interleave(", ", t.args + t.keywords)
+        self.write(")")
+
+    def _Subscript(self, t):
+        yield t.value
+        self.write("[")
+        # since Python 3.9, "a[1:2, 3]" is stored as a Tuple that cannot be parenthesized
+        if t.slice.__class__ is ast.Tuple and t.slice.elts:
+            yield from self._interleave(", ", t.slice.elts)
+            if len(t.slice.elts) == 1:
+                self.write(",")
+        else:
+            yield t.slice
+        self.write("]")
+
+    def _Starred(self, t):
+        self.write("*")
+        yield t.value
+
+    # slice
+
+    def _Index(self, t):
+        yield t.value
+
+    def _Slice(self, t):
+        if t.lower:
+            yield t.lower
+        self.write(":")
+        if t.upper:
+            yield t.upper
+        if t.step:
+            self.write(":")
+            yield t.step
+
+    def _ExtSlice(self, t):
+        yield from self._interleave(', ', t.dims)
+
+    # argument
+
+    def _arg(self, t):
+        self.write(t.arg)
+        if t.annotation:
+            self.write(": ")
+            yield t.annotation
+
+    # others
+
+    def _arguments(self, t):
+        first = True
+        latest_comment = None
+        # positional-only and normal arguments, which share defaults
+        posonlyargs = getattr(t, 'posonlyargs', [])
+        args = posonlyargs + t.args
+        defaults = [None] * (len(args) - len(t.defaults)) + t.defaults
+        for index, (arg, default) in enumerate(zip(args, defaults)):
+            if first:
+                first = False
+            else:
+                yield from self._comma_separated_type_comment(latest_comment)
+            yield arg
+            if default:
+                self.write("=")
+                yield default
+            latest_comment = getattr(arg, 'type_comment', None)
+            if index + 1 == len(posonlyargs):
+                yield from self._comma_separated_type_comment(latest_comment)
+                self.write('/')
+                latest_comment = None
+
+        # varargs, or bare '*' if no varargs but keyword-only arguments present
+        if t.vararg or getattr(t, "kwonlyargs", False):
+            if first:
+                first = False
+            else:
+                yield from self._comma_separated_type_comment(latest_comment)
+            latest_comment = None
+            self.write("*")
+            if t.vararg:
+                self.write(t.vararg.arg)
+                if t.vararg.annotation:
+                    self.write(": ")
+                    yield t.vararg.annotation
+                latest_comment = getattr(t.vararg, 'type_comment', None)
+
+        # keyword-only arguments
+        if getattr(t, "kwonlyargs", False):
+            for kwarg, default in zip(t.kwonlyargs, t.kw_defaults):
+                yield from self._comma_separated_type_comment(latest_comment)
+                yield kwarg
+                if default:
+                    self.write("=")
+                    yield default
+                latest_comment = getattr(kwarg, 'type_comment', None)
+
+        # kwargs
+        if t.kwarg:
+            if first:
+                first = False
+            else:
+                yield from self._comma_separated_type_comment(latest_comment)
+            self.write("**" + t.kwarg.arg)
+            if t.kwarg.annotation:
+                self.write(": ")
+                yield t.kwarg.annotation
+            latest_comment = getattr(t.kwarg, 'type_comment', None)
+
+        if latest_comment is not None:
+            self.write('  # type: ')
+            yield from self._string_or_tree(latest_comment)
+            self.fill('        ')
+
+    def _keyword(self, t):
+        if t.arg is None:
+            self.write("**")
+        else:
+            self.write(t.arg)
+            self.write("=")
+        yield t.value
+
+    def _Lambda(self, t):
+        self.write("(")
+        self.write("lambda ")
+        yield t.args
+        self.write(": ")
+        yield t.body
+        self.write(")")
+
+    def _withitem(self, t):
+        yield t.context_expr
+        if t.optional_vars:
+            self.write(" as ")
+            yield t.optional_vars
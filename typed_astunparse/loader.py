@@ -0,0 +1,114 @@
+"""Function: load."""
+
+import ast
+import re
+import typing as t
+
+import typed_ast.ast3
+
+# tokens, except whitespace and commas, which are only separators;
+# any other unexpected character becomes a token by itself
+_TOKENS = re.compile(r"""
+    [A-Za-z_]\w*(?!['"])[(=]?
+  | [\[\])]
+  | [bB]?(?:'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")
+  | -?(?:(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|inf|nan)j?
+  | \([^()]*\)
+  | [^\s,]
+""", re.VERBOSE)
+
+_NAMES = {
+    'None': None, 'True': True, 'False': False, 'Ellipsis': Ellipsis,
+    'inf': float('inf'), 'nan': float('nan'), 'infj': complex('infj'), 'nanj': complex('nanj')}
+
+
+def load(text: str, module=typed_ast.ast3) -> t.Union[ast.AST, typed_ast.ast3.AST]:
+    """Reconstruct a tree from the result of dump(), without using eval().
+
+    Both indented and compact dumps are accepted, with or without field names and attributes.
+    Nodes are created using classes from the given module, typed_ast.ast3 by default.
+
+    The text is tokenized and parsed in one pass, using an explicit stack, so it takes time
+    linear in its length. Equal str values (e.g. names of variables) are shared among nodes.
+    """
+    classes = {}  # type: t.Dict[str, type]
+    strings = {}  # type: t.Dict[str, str]
+    # each frame holds field name of the node or list in the parent, node class or list,
+    # values of annotated fields (or None for a list), and then other values
+    stack = [[None, None, None]]  # type: t.List[list]
+    frame = stack[0]
+    field = None  # type: t.Optional[str]
+    for token in _TOKENS.findall(text):
+        first = token[0]
+        last = token[-1]
+        if last == '(' and first != '(':
+            name = token[:-1]
+            class_ = classes.get(name)
+            if class_ is None:
+                class_ = getattr(module, name, None)
+                if not isinstance(class_, type) or not issubclass(class_, module.AST):
+                    raise ValueError('unknown node type "{}"'.format(name))
+                classes[name] = class_
+            frame = [field, class_, {}]
+            stack.append(frame)
+            field = None
+            continue
+        if last == '=' and len(token) > 1:
+            field = token[:-1]
+            continue
+        if first == '[':
+            frame = [field, list, None]
+            stack.append(frame)
+            field = None
+            continue
+        if first == ')' or first == ']':
+            if len(stack) == 1 or (first == ']') != (frame[1] is list):
+                raise ValueError('unexpected "{}"'.format(first))
+            stack.pop()
+            field = frame[0]
+            value = frame[3:] if frame[1] is list else _build(frame[1], frame[2], frame[3:])
+            frame = stack[-1]
+        elif first == "'" or first == '"' or last == "'" or last == '"':
+            if first == 'b' or first == 'B' or '\\' in token:
+                value = ast.literal_eval(token)
+            else:
+                value = token[1:-1]
+            if value.__class__ is str:
+                value = strings.setdefault(value, value)
+        elif first.isdigit() or first == '-' or first == '.':
+            if last == 'j':
+                value = complex(token)
+            elif '.' in token or 'e' in token or 'E' in token or 'n' in token:
+                value = float(token)
+            else:
+                value = int(token)
+        elif first == '(':
+            value = complex(token[1:-1])
+        elif token in _NAMES:
+            value = _NAMES[token]
+        else:
+            raise ValueError('unexpected "{}"'.format(token))
+        if field is None:
+            frame.append(value)
+        elif frame[2] is None:
+            raise ValueError('unexpected "{}=" in a list or outside of a node'.format(field))
+        else:
+            frame[2][field] = value
+            field = None
+    if len(stack) != 1:
+        raise ValueError('incomplete dump')
+    if len(frame) != 4:
+        raise ValueError('expected exactly one value, got {}'.format(len(frame) - 3))
+    return frame[3]
+
+
+def _build(class_: type, kwargs: dict, values: list):
+    """Create a node of given class from values of its fields, annotated or not."""
+    fields_count = len(class_._fields)
+    if len(values) > fields_count:
+        names = class_._attributes
+        if len(values) > fields_count + len(names):
+            raise ValueError('too many values for {}'.format(class_.__name__))
+        kwargs.update(zip(names, values[fields_count:]))
+        del values[fields_count:]
+    return class_(*values, **kwargs)
@@ -0,0 +1,392 @@
+"""Class: NativeUnparser."""
+
+import ast
+import sys
+import typing as t
+
+import astunparse
+from astunparse.unparser import interleave
+
+# classes of nodes of number literals, and their fields holding the number
+if sys.version_info >= (3, 8):
+    _NUMBER_FIELDS = {ast.Constant: 'value'}
+else:  # ast.parse() creates Num, and ast.Constant exists only since Python 3.6
+    _NUMBER_FIELDS = {getattr(ast, 'Constant', ast.Num): 'value', ast.Num: 'n'}
+
+
+class NativeUnparser(astunparse.Unparser):
+    """Unparser of trees created by built-in ast module, which does not need typed_ast.
+
+    Since Python 3.8, ast.parse(code, type_comments=True) stores type comments in the tree,
+    and they are unparsed just like by Unparser. Additionally, syntax missing from astunparse
+    is supported: assignment expressions (NamedExpr), positional-only arguments, u'' strings
+    and tuples in subscripts as stored by Python 3.9 and later.
+
+    Nodes are not checked against typed_ast.ast3 classes, which makes unparsing faster.
+    Unparser extends this class to handle typed_ast.ast3-based and mixed trees.
+    """
+
+    _dispatch_tables = {}  # type: t.Dict[type, t.Dict[type, t.Callable]]
+
+    def __init__(self, tree, file=sys.stdout):
+        """Unparse the tree into the file."""
+        self._handlers = self._dispatch_tables.setdefault(type(self), {})
+        super().__init__(tree, file=file)
+
+    @property
+    def f(self):
+        """File into which the code is written."""
+        return self._file
+
+    @f.setter
+    def f(self, file):
+        self._file = file
+        self._write = file.write  # looked up once, instead of once per written token
+
+    def write(self, text):
+        """Append a piece of text to the current line.
+
+        All code, including line breaks and indentation written by fill(), goes through this
+        method, so subclasses can override it to track or transform the output.
+        """
+        self._write(text if text.__class__ is str else str(text))
+
+    def fill(self, text=""):
+        """Indent a piece of text, according to the current indentation level."""
+        self.write("\n" + "    " * self._indent + text)
+
+    @classmethod
+    def _resolve_handler(cls, node_class: type) -> t.Callable:
+        """Find method handling given node class and store it in the dispatch table of cls."""
+        if issubclass(node_class, list):
+            handler = cls._dispatch_list
+        else:
+            handler = getattr(cls, '_' + node_class.__name__)
+        cls._dispatch_tables.setdefault(cls, {})[node_class] = handler
+        return handler
+
+    def dispatch(self, tree):
+        """Dispatch tree of type T to method _T.
+
+        Unlike astunparse.Unparser.dispatch(), the method is looked up only once per node class,
+        and then reused from a dispatch table.
+        """
+        try:
+            handler = self._handlers[tree.__class__]
+        except KeyError:
+            handler = self._resolve_handler(tree.__class__)
+        handler(self, tree)
+
+    def _dispatch_list(self, trees):
+        for tree in trees:
+            self.dispatch(tree)
+
+    def _write_string_or_dispatch(self, value):
+        """If value is str, write it. Otherwise, dispatch it."""
+        if isinstance(value, str):
+            self.write(value)
+        else:
+            self.dispatch(value)
+
+    def _fill_type_comment(self, type_comment):
+        """Unparse type comment, adding it on the next line."""
+        self.fill('# type: ')
+        self._write_string_or_dispatch(type_comment)
+
+    def _write_type_comment(self, type_comment):
+        """Unparse type comment, appending it to the end of the current line."""
+        self.write('  # type: ')
+        self._write_string_or_dispatch(type_comment)
+
+    def _write_arguments_separator(self, latest_comment):
+        """Separate arguments by a comma, and put type comment of the previous one after it."""
+        self.write(',')
+        if latest_comment is None:
+            self.write(' ')
+        else:
+            self._write_type_comment(latest_comment)
+            self.fill('        ')
+
+    def _generic_FunctionDef(self, t, async_=False):
+        """Unparse FunctionDef or AsyncFunctionDef node.
+
+        Rather than handling:
+
+        FunctionDef/AsyncFunctionDef(
+            identifier name, arguments args, stmt* body, expr* decorator_list, expr? returns)
+
+        handle:
+
+        FunctionDef/AsyncFunctionDef(
+            identifier name, arguments args, stmt* body, expr* decorator_list, expr? returns,
+            string? type_comment)
+        """
+        if not hasattr(t, 'type_comment') or t.type_comment is None:
+            super()._generic_FunctionDef(t, async_)
+            return
+
+        self.write("\n")
+        for deco in t.decorator_list:
+            self.fill("@")
+            self.dispatch(deco)
+        self.fill(("async " if async_ else "") + "def " + t.name + "(")
+        self.dispatch(t.args)
+        self.write(")")
+        if getattr(t, "returns", False):
+            self.write(" -> ")
+            self.dispatch(t.returns)
+        self.enter()
+        self._fill_type_comment(t.type_comment)
+        self.dispatch(t.body)
+        self.leave()
+
+    def _Assign(self, t):
+        """Unparse Assign node.
+
+        Rather than handling just:
+
+        Assign(expr* targets, expr value)
+
+        handle:
+
+        Assign(expr* targets, expr value, string? type_comment)
+        """
+        super()._Assign(t)
+        if hasattr(t, 'type_comment') and t.type_comment is not None:
+            self._write_type_comment(t.type_comment)
+
+    def _generic_For(self, t, async_=False):
+        """Unparse For or AsyncFor node.
+
+        Rather than handling just:
+
+        For/AsyncFor(expr target, expr iter, stmt* body, stmt* orelse)
+
+        handle:
+
+        For/AsyncFor(expr target, expr iter, stmt* body, stmt* orelse, string? type_comment)
+        """
+        if not hasattr(t, 'type_comment') or t.type_comment is None:
+            super()._generic_For(t, async_)
+            return
+
+        self.fill("async for " if async_ else "for ")
+        self.dispatch(t.target)
+        self.write(" in ")
+        self.dispatch(t.iter)
+        self.enter()
+        self._write_type_comment(t.type_comment)
+        self.dispatch(t.body)
+        self.leave()
+        if t.orelse:
+            self.fill("else")
+            self.enter()
+            self.dispatch(t.orelse)
+            self.leave()
+
+    def _generic_With(self, t, async_=False):
+        """Unparse With or AsyncWith node.
+
+        Rather than handling just:
+
+        With/AsyncWith(withitem* items, stmt* body)
+
+        handle:
+
+        With/AsyncWith(withitem* items, stmt* body, string? type_comment)
+        """
+        if not hasattr(t, 'type_comment') or t.type_comment is None:
+            super()._generic_With(t, async_)
+            return
+
+        self.fill("async with " if async_ else "with ")
+        interleave(lambda: self.write(", "), self.dispatch, t.items)
+        self.enter()
+        self._write_type_comment(t.type_comment)
+        self.dispatch(t.body)
+        self.leave()
+
+    def _Match(self, t):
+        self.fill("match ")
+        self.dispatch(t.subject)
+        self.enter()
+        self.dispatch(t.cases)
+        self.leave()
+
+    def _match_case(self, t):
+        self.fill("case ")
+        self.dispatch(t.pattern)
+        if t.guard:
+            self.write(" if ")
+            self.dispatch(t.guard)
+        self.enter()
+        self.dispatch(t.body)
+        self.leave()
+
+    def _MatchValue(self, t):
+        self.dispatch(t.value)
+
+    def _MatchSingleton(self, t):
+        self._write_constant(t.value)
+
+    def _MatchSequence(self, t):
+        self.write("[")
+        interleave(lambda: self.write(", "), self.dispatch, t.patterns)
+        self.write("]")
+
+    def _MatchStar(self, t):
+        self.write("*" + ("_" if t.name is None else t.name))
+
+    def _MatchMapping(self, t):
+        def write_key_pattern(pair):
+            key, pattern = pair
+            self.dispatch(key)
+            self.write(": ")
+            self.dispatch(pattern)
+        self.write("{")
+        interleave(lambda: self.write(", "), write_key_pattern, zip(t.keys, t.patterns))
+        if t.rest is not None:
+            if t.keys:
+                self.write(", ")
+            self.write("**" + t.rest)
+        self.write("}")
+
+    def _MatchClass(self, t):
+        def write_attribute_pattern(pair):
+            attribute, pattern = pair
+            self.write(attribute + "=")
+            self.dispatch(pattern)
+        self.dispatch(t.cls)
+        self.write("(")
+        interleave(lambda: self.write(", "), self.dispatch, t.patterns)
+        if t.kwd_attrs:
+            if t.patterns:
+                self.write(", ")
+            interleave(lambda: self.write(", "), write_attribute_pattern,
+                       zip(t.kwd_attrs, t.kwd_patterns))
+        self.write(")")
+
+    def _MatchAs(self, t):
+        if t.name is None:
+            self.write("_")
+        elif t.pattern is None:
+            self.write(t.name)
+        else:
+            self.write("(")
+            self.dispatch(t.pattern)
+            self.write(" as " + t.name + ")")
+
+    def _MatchOr(self, t):
+        self.write("(")
+        interleave(lambda: self.write(" | "), self.dispatch, t.patterns)
+        self.write(")")
+
+    def _NamedExpr(self, t):
+        self.write("(")
+        self.dispatch(t.target)
+        self.write(" := ")
+        self.dispatch(t.value)
+        self.write(")")
+
+    def _Constant(self, t):
+        if getattr(t, 'kind', None) == 'u':
+            self.write('u')
+        super()._Constant(t)
+
+    boolops = {'And': 'and', 'Or': 'or'}
+
+    def _BoolOp(self, syntax):
+        # TODO: push this to astunparse (upstream)
+        self.write('(')
+        op_ = ' {} '.format(self.boolops[syntax.op.__class__.__name__])
+        interleave(lambda: self.write(op_), self.dispatch, syntax.values)
+        self.write(')')
+
+    def _Attribute(self, t):
+        self.dispatch(t.value)
+        # Special case: 3.__abs__() is a syntax error, so if t.value
+        # is an integer literal then we need to either parenthesize
+        # it or add an extra space to get 3 .__abs__().
+        field = _NUMBER_FIELDS.get(t.value.__class__)
+        if field is not None and getattr(t.value, field).__class__ is int:
+            self.write(" ")
+        self.write(".")
+        self.write(t.attr)
+
+    def _Subscript(self, t):
+        self.dispatch(t.value)
+        self.write("[")
+        # since Python 3.9, "a[1:2, 3]" is stored as a Tuple that cannot be parenthesized
+        if t.slice.__class__ is ast.Tuple and t.slice.elts:
+            interleave(lambda: self.write(", "), self.dispatch, t.slice.elts)
+            if len(t.slice.elts) == 1:
+                self.write(",")
+        else:
+            self.dispatch(t.slice)
+        self.write("]")
+
+    def _arguments(self, t):
+        first = True
+        latest_comment = None
+        # positional-only and normal arguments, which share defaults
+        posonlyargs = getattr(t, 'posonlyargs', [])
+        args = posonlyargs + t.args
+        defaults = [None] * (len(args) - len(t.defaults)) + t.defaults
+        for index, (arg, default) in enumerate(zip(args, defaults)):
+            if first:
+                first = False
+            else:
+                self._write_arguments_separator(latest_comment)
+                latest_comment = None
+            self.dispatch(arg)
+            if default:
+                self.write("=")
+                self.dispatch(default)
+            latest_comment = getattr(arg, 'type_comment', None)
+            if index + 1 == len(posonlyargs):
+                self._write_arguments_separator(latest_comment)
+                self.write('/')
+                latest_comment = None
+
+        # varargs, or bare '*' if no varargs but keyword-only arguments present
+        if t.vararg or getattr(t, "kwonlyargs", False):
+            if first:
+                first = False
+            else:
+                self._write_arguments_separator(latest_comment)
+                latest_comment = None
+            self.write("*")
+            if t.vararg:
+                self.write(t.vararg.arg)
+                if t.vararg.annotation:
+                    self.write(": ")
+                    self.dispatch(t.vararg.annotation)
+                latest_comment = getattr(t.vararg, 'type_comment', None)
+
+        # keyword-only arguments
+        if getattr(t, "kwonlyargs", False):
+            for kwarg, default in zip(t.kwonlyargs, t.kw_defaults):
+                self._write_arguments_separator(latest_comment)
+                latest_comment = None
+                self.dispatch(kwarg)
+                if default:
+                    self.write("=")
+                    self.dispatch(default)
+                latest_comment = getattr(kwarg, 'type_comment', None)
+
+        # kwargs
+        if t.kwarg:
+            if first:
+                first = False
+            else:
+                self._write_arguments_separator(latest_comment)
+                latest_comment = None
+            self.write("**"+t.kwarg.arg)
+            if t.kwarg.annotation:
+                self.write(": ")
+                self.dispatch(t.kwarg.annotation)
+            latest_comment = getattr(t.kwarg, 'type_comment', None)
+
+        if latest_comment is not None:
+            self._write_type_comment(latest_comment)
+            self.fill('        ')
@@ -0,0 +1,39 @@
+"""Class: OutputBuffer."""
+
+import typing as t
+
+
+class OutputBuffer:
+    """Text file-like object that collects written fragments in a list and joins them once.
+
+    Unparser and Printer write every token separately, which makes millions of tiny writes
+    on large trees. Here, write is the bound append method of the list, so each of them is just
+    one C call, and the code is built only when getvalue() is called.
+
+    Can be given as the file to Unparser, Printer and their subclasses instead of a StringIO.
+    """
+
+    __slots__ = ('_parts', 'write')
+
+    def __init__(self):
+        """Create an empty buffer."""
+        self._parts = []  # type: t.List[str]
+        self.write = self._parts.append  # type: t.Callable[[str], None]
+
+    def writelines(self, lines: t.Iterable[str]) -> None:
+        """Write all given fragments."""
+        self._parts.extend(lines)
+
+    def getvalue(self) -> str:
+        """Return everything written so far as one str."""
+        parts = self._parts
+        if len(parts) > 1:
+            parts[:] = [''.join(parts)]  # do not join the same fragments again on the next call
+        return parts[0] if parts else ''
+
+    def clear(self) -> None:
+        """Discard everything written so far."""
+        self._parts.clear()
+
+    def flush(self) -> None:
+        """Do nothing, since nothing is written anywhere."""
@@ -0,0 +1,266 @@
+"""Class: PrecedenceUnparser."""
+
+import sys
+import typing as t
+
+from astunparse.unparser import interleave
+
+from .unparser import Unparser
+
+# operator precedence, from the lowest to the highest, like in Python's grammar
+(_NAMED_EXPR, _TUPLE, _YIELD, _TEST, _OR, _AND, _NOT, _CMP, _EXPR, _BXOR, _BAND, _SHIFT, _ARITH,
+ _TERM, _FACTOR, _POWER, _AWAIT, _ATOM) = range(18)
+
+_BINARY_PRECEDENCES = {
+    'BitOr': _EXPR, 'BitXor': _BXOR, 'BitAnd': _BAND, 'LShift': _SHIFT, 'RShift': _SHIFT,
+    'Add': _ARITH, 'Sub': _ARITH, 'Mult': _TERM, 'MatMult': _TERM, 'Div': _TERM,
+    'FloorDiv': _TERM, 'Mod': _TERM, 'Pow': _POWER}
+
+_UNARY_PRECEDENCES = {'Not': _NOT, 'UAdd': _FACTOR, 'USub': _FACTOR, 'Invert': _FACTOR}
+
+_BOOLEAN_PRECEDENCES = {'And': _AND, 'Or': _OR}
+
+
+class PrecedenceUnparser(Unparser):
+    """Unparser that tracks operator precedence and writes only parentheses that are needed.
+
+    Unparser parenthesizes every operation, conditional expression, lambda, tuple, etc.
+    Here, each node passes to each of its children the precedence required by the child's
+    position, and a child is parenthesized only if its own precedence is lower, for example
+    "(a + b) * c ** - d" instead of "((a + b) * (c ** (- d)))". Parsing the code gives
+    the same tree as parsing the code created by Unparser.
+
+    Generator expressions, assignment expressions, and tuples in most positions other than
+    assignment and loop targets, are still parenthesized. Code inside f-strings is unparsed
+    by astunparse, as usual.
+    """
+
+    def __init__(self, tree, file=sys.stdout):
+        """Unparse the tree into the file."""
+        # lowest precedence that the next dispatched node can have without parentheses
+        self._required = _TEST
+        # the same, for the node that is being unparsed, until it dispatches its children
+        self._position = _TEST
+        super().__init__(tree, file=file)
+
+    def dispatch(self, tree):
+        """Unparse the tree, letting its handler know which precedence its position requires.
+
+        The requirement applies only to the very next dispatched node, not to its descendants,
+        therefore the same node object can appear at several positions in the tree.
+        """
+        self._position = self._required
+        self._required = _TEST
+        super().dispatch(tree)
+
+    def _dispatch_at(self, precedence: int, tree) -> None:
+        """Unparse the tree at a position that requires given precedence."""
+        self._required = precedence
+        self.dispatch(tree)
+
+    def _open_parentheses(self, precedence: int) -> bool:
+        """Write "(" if the current node has lower precedence than required at its position.
+
+        It must be called before any children of the node are dispatched.
+        """
+        if self._position > precedence:
+            self.write('(')
+            return True
+        return False
+
+    def _close_parentheses(self, opened: bool) -> None:
+        if opened:
+            self.write(')')
+
+    # statements and expressions whose children need other than the default precedence
+    # (if it is the first child that Unparser dispatches, the requirement is set before that)
+
+    def _Expr(self, tree):
+        self._required = _YIELD
+        super()._Expr(tree)
+
+    def _Assign(self, t):
+        self.fill()
+        for target in t.targets:
+            self._dispatch_at(_TUPLE, target)
+            self.write(" = ")
+        self._dispatch_at(_YIELD, t.value)
+        if getattr(t, 'type_comment', None) is not None:
+            self._write_type_comment(t.type_comment)
+
+    def _generic_For(self, t, async_=False):
+        self._required = _TUPLE
+        super()._generic_For(t, async_)
+
+    def _comprehension(self, t):
+        if getattr(t, 'is_async', False):
+            self.write(" async")
+        self.write(" for ")
+        self._dispatch_at(_TUPLE, t.target)
+        self.write(" in ")
+        self._dispatch_at(_OR, t.iter)
+        for if_clause in t.ifs:
+            self.write(" if ")
+            self._dispatch_at(_OR, if_clause)
+
+    def _Attribute(self, t):
+        self._required = _ATOM
+        super()._Attribute(t)
+
+    def _Call(self, t):
+        self._required = _ATOM
+        super()._Call(t)
+
+    def _Subscript(self, t):
+        self._required = _ATOM
+        super()._Subscript(t)
+
+    def _Slice(self, t):
+        # a lambda in a slice would take the colon after it
+        if t.lower:
+            self._dispatch_at(_OR, t.lower)
+        self.write(":")
+        if t.upper:
+            self._dispatch_at(_OR, t.upper)
+        if t.step:
+            self.write(":")
+            self._dispatch_at(_OR, t.step)
+
+    def _Starred(self, t):
+        self._required = _EXPR
+        super()._Starred(t)
+
+    def _write_dict_item(self, key, value, separator: str) -> None:
+        if key is None:
+            self.write('**')
+            self._dispatch_at(_EXPR, value)
+        else:
+            self._dispatch_at(_OR, key)
+            self.write(separator)
+            self.dispatch(value)
+
+    def _Dict(self, t):
+        self.write("{")
+        self._indent += 1
+        self.fill("")
+        first = True
+        for key, value in zip(t.keys, t.values):
+            if first:
+                first = False
+            else:
+                self.fill("")
+            self._write_dict_item(key, value, ": ")
+            self.write(",")
+        self._indent -= 1
+        self.fill("}")
+
+    # expressions that are parenthesized only if needed
+
+    def _write_number(self, t, value, write: t.Callable) -> None:
+        """Parenthesize a negative number if its position requires more than a unary minus."""
+        opened = value.__class__ in (int, float) and repr(value).startswith('-') \
+            and self._open_parentheses(_FACTOR)
+        write(t)
+        self._close_parentheses(opened)
+
+    def _Num(self, t):
+        self._write_number(t, t.n, super()._Num)
+
+    def _Constant(self, t):
+        self._write_number(t, t.value, super()._Constant)
+
+    def _Tuple(self, t):
+        opened = self._open_parentheses(_TUPLE)
+        if not opened and not t.elts:  # empty tuple is always parenthesized
+            self.write('(')
+            opened = True
+        if len(t.elts) == 1:
+            self.dispatch(t.elts[0])
+            self.write(",")
+        else:
+            interleave(lambda: self.write(", "), self.dispatch, t.elts)
+        self._close_parentheses(opened)
+
+    def _BinOp(self, t):
+        operator = t.op.__class__.__name__
+        precedence = _BINARY_PRECEDENCES[operator]
+        opened = self._open_parentheses(precedence)
+        if operator == 'Pow':  # right-associative, and "a ** -b" is valid
+            left, right = _AWAIT, _FACTOR
+        else:
+            left, right = precedence, precedence + 1
+        self._dispatch_at(left, t.left)
+        self.write(" " + self.binop[operator] + " ")
+        self._dispatch_at(right, t.right)
+        self._close_parentheses(opened)
+
+    def _UnaryOp(self, t):
+        operator = t.op.__class__.__name__
+        precedence = _UNARY_PRECEDENCES[operator]
+        opened = self._open_parentheses(precedence)
+        self.write(self.unop[operator] + " ")
+        self._dispatch_at(precedence, t.operand)
+        self._close_parentheses(opened)
+
+    def _Compare(self, t):
+        opened = self._open_parentheses(_CMP)
+        self._dispatch_at(_EXPR, t.left)
+        for operator, comparator in zip(t.ops, t.comparators):
+            self.write(" " + self.cmpops[operator.__class__.__name__] + " ")
+            self._dispatch_at(_EXPR, comparator)
+        self._close_parentheses(opened)
+
+    def _BoolOp(self, syntax):
+        operator = syntax.op.__class__.__name__
+        precedence = _BOOLEAN_PRECEDENCES[operator]
+        opened = self._open_parentheses(precedence)
+        op_ = ' {} '.format(self.boolops[operator])
+        first = True
+        for value in syntax.values:
+            if first:
+                first = False
+            else:
+                self.write(op_)
+            self._dispatch_at(precedence + 1, value)  # nested operations of the same kind
+        self._close_parentheses(opened)
+
+    def _IfExp(self, t):
+        opened = self._open_parentheses(_TEST)
+        self._dispatch_at(_OR, t.body)
+        self.write(" if ")
+        self._dispatch_at(_OR, t.test)
+        self.write(" else ")
+        self.dispatch(t.orelse)
+        self._close_parentheses(opened)
+
+    def _Lambda(self, t):
+        opened = self._open_parentheses(_TEST)
+        self.write("lambda ")
+        self.dispatch(t.args)
+        self.write(": ")
+        self.dispatch(t.body)
+        self._close_parentheses(opened)
+
+    def _Yield(self, t):
+        opened = self._open_parentheses(_YIELD)
+        self.write("yield")
+        if t.value:
+            self.write(" ")
+            self.dispatch(t.value)
+        self._close_parentheses(opened)
+
+    def _YieldFrom(self, t):
+        opened = self._open_parentheses(_YIELD)
+        self.write("yield from")
+        if t.value:
+            self.write(" ")
+            self.dispatch(t.value)
+        self._close_parentheses(opened)
+
+    def _Await(self, t):
+        opened = self._open_parentheses(_AWAIT)
+        self.write("await")
+        if t.value:
+            self.write(" ")
+            self._dispatch_at(_ATOM, t.value)
+        self._close_parentheses(opened)
@@ -1,7 +1,8 @@
-"""Class: Printer."""
+"""Class: Printer. Function: compact_dump."""
 
 import ast
 import sys
+import typing as t
 
 import astunparse
 import typed_ast.ast3
@@ -18,6 +19,20 @@ class Printer(astunparse.Printer):
         self._annotate_fields = annotate_fields
         self._include_attributes = include_attributes
 
+    @property
+    def f(self):
+        """File into which the tree is printed."""
+        return self._file
+
+    @f.setter
+    def f(self, file):
+        self._file = file
+        self._write = file.write  # looked up once, instead of once per written token
+
+    def write(self, text):
+        """Append a piece of text to the output."""
+        self._write(text if text.__class__ is str else str(text))
+
     def _prepare_for_print(self, node):
         if isinstance(node, list):
             nodestart = "["
@@ -63,3 +78,77 @@ class Printer(astunparse.Printer):
 
         if len(children) > 1:
             self.indentation -= 1
+
+
+_AST = (ast.AST, typed_ast.ast3.AST)
+
+_MISSING = object()
+
+
+def compact_dump(
+        tree: t.Union[ast.AST, typed_ast.ast3.AST], annotate_fields: bool = True,
+        include_attributes: bool = False) -> str:
+    """Print the syntax tree in one line, like typed_ast.ast3.dump(), but faster than Printer.
+
+    The result is the same as the result of Printer, only without newlines and indentation,
+    e.g. "Name(id='spam', ctx=Load())". Parts of the result are collected in one list,
+    and for each node class the prefixes of its fields are prepared only once.
+    """
+    parts = []  # type: t.List[str]
+    append = parts.append
+    # node class -> (opening, ((field name, prefix if first, prefix otherwise), ...))
+    layouts = {}  # type: t.Dict[type, t.Tuple[str, t.Tuple[t.Tuple[str, str, str], ...]]]
+
+    def layout(class_):
+        names = class_._fields
+        if include_attributes:
+            names += class_._attributes
+        layouts[class_] = class_.__name__ + '(', tuple(
+            (name, name + '=', ', ' + name + '=') if annotate_fields else (name, '', ', ')
+            for name in names)
+        return layouts[class_]
+
+    def visit_list(values):
+        append('[')
+        separator = ''
+        for value in values:
+            append(separator)
+            separator = ', '
+            if isinstance(value, _AST):
+                visit(value)
+            elif value.__class__ is list:
+                visit_list(value)
+            else:
+                append(repr(value))
+        append(']')
+
+    def visit(node):
+        try:
+            opening, fields = layouts[node.__class__]
+        except KeyError:
+            opening, fields = layout(node.__class__)
+        append(opening)
+        printed = False
+        for name, first_prefix, prefix in fields:
+            value = getattr(node, name, _MISSING)
+            if value is _MISSING:
+                continue
+            append(prefix if printed else first_prefix)
+            printed = True
+            if value is None:
+                append('None')
+            elif value.__class__ is list:
+                visit_list(value)
+            elif isinstance(value, _AST):
+                visit(value)
+            else:
+                append(repr(value))
+        append(')')
+
+    if isinstance(tree, _AST):
+        visit(tree)
+    elif tree.__class__ is list:
+        visit_list(tree)
+    else:
+        append(repr(tree))
+    return ''.join(parts)
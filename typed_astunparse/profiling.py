@@ -0,0 +1,146 @@
+"""Classes: Profile, ProfilingUnparser, ProfilingPrinter."""
+
+import functools
+import inspect
+import logging
+import sys
+import time
+import types
+import typing as t
+
+from .unparser import Unparser
+from .printer import Printer
+
+_LOG = logging.getLogger(__name__)
+
+
+class Profile:
+    """Number of calls and time spent per node type and per handler.
+
+    Time of a node type or a handler is measured both including the time spent in nested
+    node types or handlers (time) and excluding it (self_time). Like in cProfile, time
+    of recursive calls is counted only once, in the outermost call.
+    """
+
+    def __init__(self):
+        """Initialize empty profile."""
+        # name -> [calls, time, self time]
+        self.node_types = {}  # type: t.Dict[str, t.List]
+        self.handlers = {}  # type: t.Dict[str, t.List]
+        self._nested_time = {id(self.node_types): 0.0, id(self.handlers): 0.0}
+        self._active = {}  # type: t.Dict[t.Tuple[int, str], int]
+
+    def call(self, table: t.Dict[str, t.List], name: str, function, *args, **kwargs):
+        """Call the function, and record the call and its duration under the name in the table."""
+        nested_time = self._nested_time
+        outer_nested_time = nested_time[id(table)]
+        nested_time[id(table)] = 0.0
+        active_key = (id(table), name)
+        active = self._active.get(active_key, 0)
+        self._active[active_key] = active + 1
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            self._active[active_key] = active
+            stats = table.get(name)
+            if stats is None:
+                stats = table[name] = [0, 0.0, 0.0]
+            stats[0] += 1
+            if not active:
+                stats[1] += duration
+            stats[2] += duration - nested_time[id(table)]
+            nested_time[id(table)] = outer_nested_time + duration
+
+    def as_dict(self) -> t.Dict[str, t.Dict[str, t.Dict[str, t.Any]]]:
+        """Get the profile as a dict of node types and handlers, each with calls and times."""
+        return {
+            table_name: {
+                name: {'calls': calls, 'time': time_, 'self_time': self_time}
+                for name, (calls, time_, self_time) in table.items()}
+            for table_name, table in (
+                ('node_types', self.node_types), ('handlers', self.handlers))}
+
+    def log(self, logger: logging.Logger = _LOG, level: int = logging.INFO,
+            limit: t.Optional[int] = None) -> None:
+        """Log the node types and handlers, most expensive (by self time) first."""
+        for table_name, table in (('node type', self.node_types), ('handler', self.handlers)):
+            entries = sorted(table.items(), key=lambda entry: entry[1][2], reverse=True)
+            for name, (calls, time_, self_time) in entries[:limit]:
+                logger.log(
+                    level, '%s %s: %i calls, %.6fs, self %.6fs',
+                    table_name, name, calls, time_, self_time)
+
+    def clear(self) -> None:
+        """Remove all recorded calls."""
+        self.node_types.clear()
+        self.handlers.clear()
+
+
+def _instrument(class_: type, handler_names: t.Iterable[str]) -> type:
+    """Replace given methods of the class with ones that record their calls in self.profile."""
+    for name in handler_names:
+        function = getattr(class_, name)
+
+        @functools.wraps(function)
+        def handler(self, *args, __name=name, __function=function, **kwargs):
+            profile = self.profile
+            return profile.call(profile.handlers, __name, __function, self, *args, **kwargs)
+
+        setattr(class_, name, handler)
+    return class_
+
+
+def _handler_names(class_: type, *names: str) -> t.List[str]:
+    """Find names of handlers in the class: single-underscore methods, and given names."""
+    return [
+        name for name, _ in inspect.getmembers(class_)
+        if (name in names or name.startswith('_') and not name.startswith('__'))
+        and isinstance(inspect.getattr_static(class_, name), types.FunctionType)
+        and name != '_dispatch_list']
+
+
+class ProfilingUnparser(Unparser):
+    """Unparser that records calls and time spent per node type and per handler in a Profile.
+
+    Instrumentation is limited to this class, therefore Unparser itself is not slowed down.
+    The overhead of measurement is included in the times, so they are useful for comparing
+    node types and handlers with each other, rather than as absolute values.
+    """
+
+    def __init__(self, tree, file=sys.stdout, profile: t.Optional[Profile] = None):
+        """Unparse the tree into the file, recording the calls in given or new profile."""
+        self.profile = Profile() if profile is None else profile
+        super().__init__(tree, file=file)
+
+    def dispatch(self, tree):
+        """Dispatch the tree, and record the call under its node type."""
+        if isinstance(tree, list):
+            super().dispatch(tree)
+            return
+        profile = self.profile
+        profile.call(profile.node_types, tree.__class__.__name__, super().dispatch, tree)
+
+
+_instrument(ProfilingUnparser, _handler_names(Unparser, 'write', 'fill'))
+
+
+class ProfilingPrinter(Printer):
+    """Printer that records calls and time spent per node type and per handler in a Profile."""
+
+    def __init__(self, file=sys.stdout, indent="  ", annotate_fields: bool = True,
+                 include_attributes: bool = False, profile: t.Optional[Profile] = None):
+        """Initialize Printer instance that will record calls in given or new profile."""
+        self.profile = Profile() if profile is None else profile
+        super().__init__(
+            file=file, indent=indent, annotate_fields=annotate_fields,
+            include_attributes=include_attributes)
+
+    def visit(self, node):
+        """Visit the node, and record the call under its node type."""
+        profile = self.profile
+        profile.call(profile.node_types, node.__class__.__name__, super().visit, node)
+
+
+_instrument(ProfilingPrinter, _handler_names(Printer, 'generic_visit', 'write'))
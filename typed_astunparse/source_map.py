@@ -0,0 +1,141 @@
+"""Classes: SourceMap, SourceMapUnparser. Function: unparse_with_source_map."""
+
+import array
+import ast
+import collections
+import sys
+import typing as t
+
+import typed_ast.ast3
+
+from .output import OutputBuffer
+from .unparser import Unparser
+
+SourceMapEntry = collections.namedtuple(
+    'SourceMapEntry', ['node', 'start', 'end', 'start_line', 'start_col', 'end_line', 'end_col'])
+
+
+class SourceMap:
+    """Table mapping nodes to ranges of code created from them.
+
+    Each entry holds a node, offsets of the start and the end of its code, as well as line
+    and column of the start and the end. Lines are counted from 1 and columns from 0, like in ast.
+    The start of the code of a node is its first non-whitespace character.
+
+    Entries are in the order in which the nodes were unparsed, i.e. every node precedes its
+    descendants. The ranges are kept in array columns, so there is no per-entry object.
+    """
+
+    _columns = ('start', 'end', 'start_line', 'start_col', 'end_line', 'end_col')
+
+    def __init__(self):
+        """Initialize empty source map."""
+        self.nodes = []  # type: t.List[t.Any]
+        for column in self._columns:
+            setattr(self, column, array.array('q'))
+        self._indices = {}  # type: t.Dict[int, int]
+        self._indexed = 0  # number of nodes in _indices
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __getitem__(self, index: int) -> SourceMapEntry:
+        return SourceMapEntry(
+            self.nodes[index], *[getattr(self, column)[index] for column in self._columns])
+
+    def __iter__(self) -> t.Iterator[SourceMapEntry]:
+        return (self[index] for index in range(len(self)))
+
+    def entry(self, node) -> SourceMapEntry:
+        """Get entry of given node."""
+        if self._indexed < len(self.nodes):
+            # index nodes appended since the last call, e.g. when the map was extended
+            self._indices.update(
+                (id(self.nodes[index]), index) for index in range(self._indexed, len(self.nodes)))
+            self._indexed = len(self.nodes)
+        return self[self._indices[id(node)]]
+
+    def node_at(self, line: int, col: int):
+        """Find the innermost node whose code contains given position, or None if there's none."""
+        position = (line, col)
+        found = None
+        for index, node in enumerate(self.nodes):
+            if (self.start_line[index], self.start_col[index]) <= position \
+                    < (self.end_line[index], self.end_col[index]):
+                found = node  # descendants come later, so the last match is the innermost
+        return found
+
+
+class SourceMapUnparser(Unparser):
+    """Unparser that records in a SourceMap where the code of each unparsed node is."""
+
+    def __init__(self, tree, file=sys.stdout, source_map: t.Optional[SourceMap] = None):
+        """Unparse the tree into the file, recording the ranges in given or new source map."""
+        self.source_map = SourceMap() if source_map is None else source_map
+        self._offset = 0
+        self._line = 1
+        self._col = 0
+        self._pending = []  # type: t.List[int]
+        self._columns = [getattr(self.source_map, column) for column in SourceMap._columns]
+        super().__init__(tree, file=file)
+
+    def write(self, text):
+        """Append a piece of text to the current line, keeping track of the position."""
+        text = str(text)
+        self._write(text)
+        if self._pending:
+            code_start = len(text) - len(text.lstrip())
+            if code_start < len(text):
+                self._advance(text[:code_start])
+                self._start_pending()
+                text = text[code_start:]
+        self._advance(text)
+
+    def _advance(self, text: str) -> None:
+        self._offset += len(text)
+        newlines = text.count('\n')
+        if newlines:
+            self._line += newlines
+            self._col = len(text) - text.rfind('\n') - 1
+        else:
+            self._col += len(text)
+
+    def _start_pending(self) -> None:
+        source_map = self.source_map
+        for index in self._pending:
+            source_map.start[index] = self._offset
+            source_map.start_line[index] = self._line
+            source_map.start_col[index] = self._col
+        self._pending.clear()
+
+    def dispatch(self, tree):
+        """Unparse the tree, and record the range of its code if it is a node."""
+        if isinstance(tree, list):
+            super().dispatch(tree)
+            return
+        source_map = self.source_map
+        index = len(source_map.nodes)
+        source_map.nodes.append(tree)
+        for column in self._columns:
+            column.append(0)
+        self._pending.append(index)
+        super().dispatch(tree)
+        if self._pending and self._pending[-1] == index:
+            self._pending.pop()
+            source_map.start[index] = self._offset
+            source_map.start_line[index] = self._line
+            source_map.start_col[index] = self._col
+        source_map.end[index] = self._offset
+        source_map.end_line[index] = self._line
+        source_map.end_col[index] = self._col
+
+
+def unparse_with_source_map(
+        tree: t.Union[ast.AST, typed_ast.ast3.AST]) -> t.Tuple[str, SourceMap]:
+    """Unparse the abstract syntax tree into a str, and create a source map of the result.
+
+    The code is the same as the result of unparse(tree).
+    """
+    stream = OutputBuffer()
+    unparser = SourceMapUnparser(tree, file=stream)
+    return stream.getvalue(), unparser.source_map
@@ -2,12 +2,12 @@
 
 import ast
 
-import astunparse
-from astunparse.unparser import interleave
 import typed_ast.ast3
 
+from .native_unparser import NativeUnparser
 
-class Unparser(astunparse.Unparser):
+
+class Unparser(NativeUnparser):
     """Partial rewrite of Unparser from astunparse to handle typed_ast.ast3-based trees.
 
     The unparser aims at compatibility with native AST, as well as typed AST.
@@ -183,23 +183,6 @@ class Unparser(astunparse.Unparser):
     [2]: https://github.com/python/typed_ast/blob/master/typed_ast/ast3.py#L5
     """
 
-    def _write_string_or_dispatch(self, value):
-        """If value is str, write it. Otherwise, dispatch it."""
-        if isinstance(value, str):
-            self.write(value)
-        else:
-            self.dispatch(value)
-
-    def _fill_type_comment(self, type_comment):
-        """Unparse type comment, adding it on the next line."""
-        self.fill('# type: ')
-        self._write_string_or_dispatch(type_comment)
-
-    def _write_type_comment(self, type_comment):
-        """Unparse type comment, appending it to the end of the current line."""
-        self.write('  # type: ')
-        self._write_string_or_dispatch(type_comment)
-
     def _write_raw_literal(self, text: str):
         delimiter = None
         for _ in ("'", '"', "'''", '"""'):
@@ -214,9 +197,7 @@ class Unparser(astunparse.Unparser):
         if delimiter in text:
             escaped_delimiter = ''.join(['\\{}'.format(_) for _ in delimiter])
             text = text.replace(delimiter, escaped_delimiter)
-        self.write(delimiter)
-        self.write(text)
-        self.write(delimiter)
+        self.write(delimiter + text + delimiter)
 
     def _ClassDef(self, t):
         if isinstance(t, ast.ClassDef):
@@ -247,83 +228,6 @@ class Unparser(astunparse.Unparser):
         self.dispatch(t.body)
         self.leave()
 
-    def _generic_FunctionDef(self, t, async_=False):
-        """Unparse FunctionDef or AsyncFunctionDef node.
-
-        Rather than handling:
-
-        FunctionDef/AsyncFunctionDef(
-            identifier name, arguments args, stmt* body, expr* decorator_list, expr? returns)
-
-        handle:
-
-        FunctionDef/AsyncFunctionDef(
-            identifier name, arguments args, stmt* body, expr* decorator_list, expr? returns,
-            string? type_comment)
-        """
-        if not hasattr(t, 'type_comment') or t.type_comment is None:
-            super()._generic_FunctionDef(t, async_)
-            return
-
-        self.write("\n")
-        for deco in t.decorator_list:
-            self.fill("@")
-            self.dispatch(deco)
-        self.fill(("async " if async_ else "") + "def " + t.name + "(")
-        self.dispatch(t.args)
-        self.write(")")
-        if getattr(t, "returns", False):
-            self.write(" -> ")
-            self.dispatch(t.returns)
-        self.enter()
-        self._fill_type_comment(t.type_comment)
-        self.dispatch(t.body)
-        self.leave()
-
-    def _Assign(self, t):
-        """Unparse Assign node.
-
-        Rather than handling just:
-
-        Assign(expr* targets, expr value)
-
-        handle:
-
-        Assign(expr* targets, expr value, string? type_comment)
-        """
-        super()._Assign(t)
-        if hasattr(t, 'type_comment') and t.type_comment is not None:
-            self._write_type_comment(t.type_comment)
-
-    def _generic_For(self, t, async_=False):
-        """Unparse For or AsyncFor node.
-
-        Rather than handling just:
-
-        For/AsyncFor(expr target, expr iter, stmt* body, stmt* orelse)
-
-        handle:
-
-        For/AsyncFor(expr target, expr iter, stmt* body, stmt* orelse, string? type_comment)
-        """
-        if not hasattr(t, 'type_comment') or t.type_comment is None:
-            super()._generic_For(t, async_)
-            return
-
-        self.fill("async for " if async_ else "for ")
-        self.dispatch(t.target)
-        self.write(" in ")
-        self.dispatch(t.iter)
-        self.enter()
-        self._write_type_comment(t.type_comment)
-        self.dispatch(t.body)
-        self.leave()
-        if t.orelse:
-            self.fill("else")
-            self.enter()
-            self.dispatch(t.orelse)
-            self.leave()
-
     def _If(self, t):
         self.fill("if ")
         self.dispatch(t.test)
@@ -346,28 +250,6 @@ class Unparser(astunparse.Unparser):
             self.dispatch(t.orelse)
             self.leave()
 
-    def _generic_With(self, t, async_=False):
-        """Unparse With or AsyncWith node.
-
-        Rather than handling just:
-
-        With/AsyncWith(withitem* items, stmt* body)
-
-        handle:
-
-        With/AsyncWith(withitem* items, stmt* body, string? type_comment)
-        """
-        if not hasattr(t, 'type_comment') or t.type_comment is None:
-            super()._generic_With(t, async_)
-            return
-
-        self.fill("async with " if async_ else "with ")
-        interleave(lambda: self.write(", "), self.dispatch, t.items)
-        self.enter()
-        self._write_type_comment(t.type_comment)
-        self.dispatch(t.body)
-        self.leave()
-
     def _Bytes(self, tree):
         if hasattr(tree, 'kind') and tree.kind:
             self.write(tree.kind)
@@ -386,15 +268,6 @@ class Unparser(astunparse.Unparser):
                 return
         super()._Str(tree)
 
-    boolops = {'And': 'and', 'Or': 'or'}
-
-    def _BoolOp(self, syntax):
-        # TODO: push this to astunparse (upstream)
-        self.write('(')
-        op_ = ' {} '.format(self.boolops[syntax.op.__class__.__name__])
-        interleave(lambda: self.write(op_), self.dispatch, syntax.values)
-        self.write(')')
-
     def _Attribute(self, t):
         self.dispatch(t.value)
         # Special case: 3.__abs__() is a syntax error, so if t.value
@@ -426,83 +299,3 @@ class Unparser(astunparse.Unparser):
                 comma = True
             self.dispatch(keyword)
         self.write(")")
-
-    def _arguments(self, t):
-        first = True
-        latest_comment = None
-        # normal arguments
-        defaults = [None] * (len(t.args) - len(t.defaults)) + t.defaults
-        for arg, default in zip(t.args, defaults):
-            if first:
-                first = False
-            else:
-                self.write(',')
-                if latest_comment is not None:
-                    self._write_type_comment(latest_comment)
-                    self.fill('        ')
-                    latest_comment = None
-                else:
-                    self.write(' ')
-            self.dispatch(arg)
-            if default:
-                self.write("=")
-                self.dispatch(default)
-            latest_comment = getattr(arg, 'type_comment', None)
-
-        # varargs, or bare '*' if no varargs but keyword-only arguments present
-        if t.vararg or getattr(t, "kwonlyargs", False):
-            if first:
-                first = False
-            else:
-                self.write(',')
-                if latest_comment is not None:
-                    self._write_type_comment(latest_comment)
-                    self.fill('        ')
-                    latest_comment = None
-                else:
-                    self.write(' ')
-            self.write("*")
-            if t.vararg:
-                self.write(t.vararg.arg)
-                if t.vararg.annotation:
-                    self.write(": ")
-                    self.dispatch(t.vararg.annotation)
-                latest_comment = getattr(t.vararg, 'type_comment', None)
-
-        # keyword-only arguments
-        if getattr(t, "kwonlyargs", False):
-            for kwarg, default in zip(t.kwonlyargs, t.kw_defaults):
-                self.write(',')
-                if latest_comment is not None:
-                    self._write_type_comment(latest_comment)
-                    self.fill('        ')
-                    latest_comment = None
-                else:
-                    self.write(' ')
-                self.dispatch(kwarg)
-                if default:
-                    self.write("=")
-                    self.dispatch(default)
-                latest_comment = getattr(kwarg, 'type_comment', None)
-
-        # kwargs
-        if t.kwarg:
-            if first:
-                first = False
-            else:
-                self.write(',')
-                if latest_comment is not None:
-                    self._write_type_comment(latest_comment)
-                    self.fill('        ')
-                    latest_comment = None
-                else:
-                    self.write(' ')
-            self.write("**"+t.kwarg.arg)
-            if t.kwarg.annotation:
-                self.write(": ")
-                self.dispatch(t.kwarg.annotation)
-            latest_comment = getattr(t.kwarg, 'type_comment', None)
-
-        if latest_comment is not None:
-            self._write_type_comment(latest_comment)
-            self.fill('        ')
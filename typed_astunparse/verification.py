@@ -0,0 +1,155 @@
+"""Functions: verify_code, verify_files."""
+
+import concurrent.futures
+import hashlib
+import io
+import itertools
+import os
+import pathlib
+import platform
+import sqlite3
+import tokenize
+import typing as t
+
+import typed_ast
+import typed_ast.ast3
+
+# number of files after which new results are committed to the cache
+_COMMIT_INTERVAL = 256
+
+# result of verification of one file: (status, message), where status is one of:
+# 'passed' -- tree is the same after the roundtrip;
+# 'failed' -- unparsing failed, unparsed code is invalid, or the tree changed;
+# 'error' -- the original file could not be read or parsed, so it was not verified
+Result = t.Tuple[str, t.Optional[str]]
+
+
+def verify_code(data: bytes, filename: str = '<unknown>', iterative: bool = False) -> Result:
+    """Check if parse(unparse(parse(code))) is the same as parse(code), using typed_ast.ast3.
+
+    The code is given as bytes, and decoded like Python would decode a source file.
+    """
+    from . import unparse
+    from .comparison import find_difference
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+        tree = typed_ast.ast3.parse(source=data.decode(encoding), filename=filename)
+    except (SyntaxError, UnicodeDecodeError, RecursionError, ValueError) as err:
+        return 'error', '{}: {}'.format(type(err).__name__, err)
+    try:
+        code = unparse(tree, iterative=iterative)
+    except Exception as err:  # pylint: disable=broad-except
+        return 'failed', 'unparsing failed: {}: {}'.format(type(err).__name__, err)
+    try:
+        roundtrip_tree = typed_ast.ast3.parse(source=code, filename=filename)
+    except (SyntaxError, RecursionError, ValueError) as err:
+        return 'failed', 'unparsed code is invalid: {}: {}'.format(type(err).__name__, err)
+    difference = find_difference(tree, roundtrip_tree)
+    if difference is not None:
+        return 'failed', 'tree changed at {}'.format(difference)
+    return 'passed', None
+
+
+def _verify_file(path: pathlib.Path, iterative: bool) -> t.Tuple[t.Optional[str], Result]:
+    """Verify one file, and return digest of its contents (or None if unreadable) and result."""
+    try:
+        data = path.read_bytes()
+    except OSError as err:
+        return None, ('error', '{}: {}'.format(type(err).__name__, err))
+    return _digest(data), verify_code(data, str(path), iterative)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class _ResultCache:
+    """Results of verification stored in an SQLite database, keyed by content of the files.
+
+    Results are valid only for the same versions of typed_astunparse, typed_ast and Python,
+    and the same unparser, so they are all part of the key.
+    """
+
+    def __init__(self, path: t.Union[str, pathlib.Path], iterative: bool = False):
+        from ._version import VERSION
+        self.environment = 'typed_astunparse {} typed_ast {} {} {}{}'.format(
+            VERSION, typed_ast.__version__, platform.python_implementation(),
+            platform.python_version(), ' iterative' if iterative else '')
+        self._connection = sqlite3.connect(str(path))
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS results (digest TEXT, environment TEXT, status TEXT,'
+            ' message TEXT, PRIMARY KEY (digest, environment))')
+
+    def get(self, digest: str) -> t.Optional[Result]:
+        row = self._connection.execute(
+            'SELECT status, message FROM results WHERE digest = ? AND environment = ?',
+            (digest, self.environment)).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def put(self, digest: str, result: Result) -> None:
+        self._connection.execute(
+            'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+            (digest, self.environment) + tuple(result))
+
+    def commit(self) -> None:
+        self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.commit()
+        self._connection.close()
+
+
+def verify_files(
+        paths: t.Iterable[pathlib.Path], workers: t.Optional[int] = None, chunksize: int = 4,
+        iterative: bool = False, cache: t.Optional[t.Union[str, pathlib.Path]] = None
+        ) -> t.Iterator[t.Tuple[pathlib.Path, str, t.Optional[str], bool]]:
+    """Verify the roundtrip of many files using a pool of processes, see verify_code().
+
+    If cache is given, it is a path of a database file, where results are stored and looked up
+    by hash of the file contents, so that unchanged files are not verified again.
+
+    Yield (path, status, message, cached) tuples in input order, where status is 'passed',
+    'failed' or 'error', and cached is True if the result was taken from the cache.
+    """
+    paths = list(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or chunksize < 1:
+        raise ValueError('workers={} and chunksize={} must be positive'.format(workers, chunksize))
+    verification_cache = None if cache is None else _ResultCache(cache, iterative)
+    try:
+        # files are hashed here to look them up in the cache, and again where they are verified
+        results = []  # type: t.List[t.Optional[Result]]
+        for path in paths:
+            result = None
+            if verification_cache is not None:
+                try:
+                    result = verification_cache.get(_digest(path.read_bytes()))
+                except OSError:
+                    pass
+            results.append(result)
+        pending = [path for path, result in zip(paths, results) if result is None]
+        if workers == 1 or len(pending) <= chunksize:
+            new_results = map(_verify_file, pending, itertools.repeat(iterative))
+            executor = None
+        else:
+            executor = concurrent.futures.ProcessPoolExecutor(workers)
+            new_results = executor.map(
+                _verify_file, pending, itertools.repeat(iterative), chunksize=chunksize)
+        try:
+            new_results = iter(new_results)
+            for count, (path, result) in enumerate(zip(paths, results), 1):
+                cached = result is not None
+                if not cached:
+                    digest, result = next(new_results)
+                    if verification_cache is not None and digest is not None:
+                        verification_cache.put(digest, result)
+                if verification_cache is not None and count % _COMMIT_INTERVAL == 0:
+                    verification_cache.commit()
+                yield (path,) + tuple(result) + (cached,)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    finally:
+        if verification_cache is not None:
+            verification_cache.close()